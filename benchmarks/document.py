@@ -0,0 +1,75 @@
+"""Compare per-keystroke document work: Textual's documents vs Prosaic's.
+
+For generated manuscripts of several sizes, types characters in the middle
+of the document and reads its text after each one, as the editor's change
+consumers do, for Textual's plain and syntax-aware documents and for the
+Prosaic documents the editor upgrades them to. Also times taking a snapshot.
+
+    python benchmarks/document.py [size_kb ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from textual._tree_sitter import get_language
+from textual.document._document import Document
+from textual.document._syntax_aware_document import SyntaxAwareDocument
+
+from prosaic.widgets.document import ProsaicDocument, ProsaicSyntaxAwareDocument
+
+sys.path.insert(0, str(Path(__file__).parent))
+from large_file import make_document  # noqa: E402
+
+_KEYSTROKES = 50
+_TEXT_READS = 3
+"""Times the text is read per keystroke (highlighting, outline, stats)."""
+
+
+def type_in_middle(document: Document) -> float:
+    """Mean milliseconds to insert a character and read the text back."""
+    row = document.line_count // 2
+    start = time.perf_counter()
+    for column in range(_KEYSTROKES):
+        document.replace_range((row, column), (row, column), "x")
+        for _ in range(_TEXT_READS):
+            document.text
+    return (time.perf_counter() - start) / _KEYSTROKES * 1000
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 4000]
+    markdown = get_language("markdown")
+    for size_kb in sizes:
+        text = make_document(size_kb)
+        plain = Document(text)
+        prosaic = Document(text)
+        prosaic.__class__ = ProsaicDocument
+        print(
+            f"{size_kb:>6,} KiB plain   textual {type_in_middle(plain):>7.2f} ms"
+            f"  prosaic {type_in_middle(prosaic):>7.2f} ms"
+        )
+
+        syntax = SyntaxAwareDocument(text, markdown)
+        prosaic_syntax = SyntaxAwareDocument(text, markdown)
+        prosaic_syntax.__class__ = ProsaicSyntaxAwareDocument
+        print(
+            f"{size_kb:>6,} KiB syntax  textual {type_in_middle(syntax):>7.2f} ms"
+            f"  prosaic {type_in_middle(prosaic_syntax):>7.2f} ms"
+        )
+
+        start = time.perf_counter()
+        snapshot = prosaic.snapshot()
+        taken = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        prosaic.replace_range((0, 0), (0, 0), "x")
+        first_edit = (time.perf_counter() - start) * 1000
+        assert not snapshot.text.startswith("x")
+        print(
+            f"{size_kb:>6,} KiB snapshot {taken:.3f} ms, "
+            f"first edit after it {first_edit:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
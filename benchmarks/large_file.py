@@ -0,0 +1,99 @@
+"""Benchmark opening and typing in large documents with the Textual pilot.
+
+Generates markdown documents of several sizes in a temporary workspace,
+opens each in an EditorScreen and reports whether large-file mode engaged,
+how long the open took, and the mean latency of a keystroke (key press
+until the screen has processed it).
+
+    python benchmarks/large_file.py [size_kb ...]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_PARAGRAPH = (
+    "The quiet harbour light fell across **wet stones** and drifting nets, "
+    "while lanterns swung above sleepng gulls and the _morning_ tide.\n\n"
+)
+_KEYSTROKES = 20
+
+
+def make_document(size_kb: int) -> str:
+    chunks = ["# Manuscript\n\n"]
+    size = 0
+    chapter = 0
+    while size < size_kb * 1024:
+        chapter += 1
+        chunk = f"## Chapter {chapter}\n\n" + _PARAGRAPH * 40
+        chunks.append(chunk)
+        size += len(chunk)
+    return "".join(chunks)
+
+
+def setup_workspace() -> Path:
+    root = Path(tempfile.mkdtemp(prefix="prosaic-bench-"))
+    workspace = root / "workspace"
+    workspace.mkdir()
+    config_dir = root / "config"
+    config_dir.mkdir()
+    settings = {
+        "app_version": "bench",
+        "setup_complete": True,
+        "active_profile": "default",
+        "profiles": {"default": {"archive_dir": str(workspace), "init_git": False}},
+    }
+    (config_dir / "settings.json").write_text(json.dumps(settings))
+    os.environ["PROSAIC_CONFIG_DIR"] = str(config_dir)
+    return workspace
+
+
+async def bench(workspace: Path, size_kb: int) -> None:
+    from textual.app import App
+
+    from prosaic.core.metrics import MetricsTracker
+    from prosaic.screens import EditorScreen
+
+    path = workspace / f"doc-{size_kb}.md"
+    path.write_text(make_document(size_kb), encoding="utf-8")
+
+    class BenchApp(App):
+        def on_mount(self) -> None:
+            self.started = time.perf_counter()
+            self.push_screen(EditorScreen(MetricsTracker(workspace), initial_file=path))
+
+    app = BenchApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        screen = app.screen
+        while screen.current_file != path:
+            await pilot.pause()
+        opened = time.perf_counter() - app.started
+        screen.query_one("#editor").move_cursor((len(screen._editor_text().split("\n")) // 2, 0))
+        await pilot.pause()
+
+        start = time.perf_counter()
+        for _ in range(_KEYSTROKES):
+            await pilot.press("x")
+        keystroke = (time.perf_counter() - start) / _KEYSTROKES
+
+        mode = "large" if screen.large_file else "normal"
+        lines = screen.query_one("#editor").document.line_count
+        print(
+            f"{size_kb:>7,} KiB {lines:>9,} lines  {mode:<6}  "
+            f"open {opened * 1000:>8,.0f} ms  keystroke {keystroke * 1000:>7,.1f} ms"
+        )
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 500, 2000, 8000]
+    workspace = setup_workspace()
+    for size_kb in sizes:
+        asyncio.run(bench(workspace, size_kb))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare highlight span memory: dict of tuples vs SpanStore.
+
+Scans a generated 100k-word markdown document with SpellCheckTextArea and
+measures, with tracemalloc, the spans held in the packed SpanStore layout
+against the same spans held as the previous ``dict[int, list[tuple]]``.
+
+    python benchmarks/span_memory.py
+"""
+
+import random
+import tracemalloc
+
+from prosaic.core.spans import SpanStore
+from prosaic.widgets.spell_text_area import SpellCheckTextArea
+
+WORDS = 100_000
+
+_VOCAB = (
+    "the quiet harbour light fell across **wet stones** and _drifting_ nets "
+    "while `lanterns` swung above sleepng gulls and the mornnig tide"
+).split()
+
+
+def make_document(words: int, seed: int = 7) -> str:
+    """Build a markdown document of roughly ``words`` words."""
+    rng = random.Random(seed)
+    lines = []
+    count = 0
+    chapter = 0
+    while count < words:
+        if count % 5000 == 0:
+            chapter += 1
+            lines.append(f"## Chapter {chapter}")
+            lines.append("")
+        sentence = [rng.choice(_VOCAB) for _ in range(rng.randint(8, 24))]
+        lines.append(" ".join(sentence))
+        lines.append("")
+        count += len(sentence)
+    return "\n".join(lines)
+
+
+def as_tuples(store: SpanStore) -> dict[int, list[tuple[int, int | None, str]]]:
+    """Copy a store into the legacy tuple layout."""
+    return {row: [(s, e, name) for s, e, name in store.spans(row)] for row in store}
+
+
+def measure(build) -> tuple[object, int]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+
+def main() -> None:
+    text = make_document(WORDS)
+    area = SpellCheckTextArea()
+    rows = list(enumerate(text.split("\n")))
+    area._scan_spelling(rows)
+    area._scan_inline_markdown(rows)
+
+    def build_store() -> SpanStore:
+        store = SpanStore()
+        store.merge(area._misspelled)
+        store.merge(area._md_highlights)
+        return store
+
+    store, store_bytes = measure(build_store)
+    spans = sum(len(store[row]) for row in store)
+
+    def build_tuples() -> dict:
+        legacy = as_tuples(area._misspelled)
+        for row, row_spans in as_tuples(area._md_highlights).items():
+            legacy.setdefault(row, []).extend(row_spans)
+        return legacy
+
+    _, tuple_bytes = measure(build_tuples)
+
+    print(f"document   {len(text.split()):,} words, {text.count(chr(10)) + 1:,} lines")
+    print(f"spans      {spans:,} on {len(store):,} rows")
+    print(f"tuples     {tuple_bytes / 1024:,.0f} KiB")
+    print(f"span store {store_bytes / 1024:,.0f} KiB ({tuple_bytes / store_bytes:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare per-keystroke rewrapping: Textual's wrapped document vs Prosaic's.
+
+Types characters at the end, and then in the middle, of a single paragraph
+of the given length, soft-wrapped at a typical editor width, and times the
+rewrap after each one for Textual's WrappedDocument and for the
+ProsaicWrappedDocument the editor upgrades it to.
+
+    python benchmarks/wrap.py [characters ...]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+from textual.document._document import Document
+from textual.document._wrapped_document import WrappedDocument
+
+from prosaic.widgets.wrapping import ProsaicWrappedDocument
+
+sys.path.insert(0, str(Path(__file__).parent))
+from large_file import make_document  # noqa: E402
+
+_KEYSTROKES = 200
+_WIDTH = 80
+
+
+def make_paragraph(characters: int) -> str:
+    """One line of prose of the given number of characters.
+
+    The words are shuffled: repeating the same sentence would line up every
+    line break with the last, which real prose never does.
+    """
+    words = make_document(characters // 1000 + 1).split()
+    random.Random(0).shuffle(words)
+    return " ".join(words)[:characters]
+
+
+def type_at(wrapped: WrappedDocument, column: int) -> float:
+    """Mean milliseconds to insert a character at a column and rewrap."""
+    document = wrapped.document
+    start = time.perf_counter()
+    for i in range(_KEYSTROKES):
+        location = (0, column + i)
+        text = " " if i % 6 == 5 else "x"
+        result = document.replace_range(location, location, text)
+        wrapped.wrap_range(location, location, result.end_location)
+    return (time.perf_counter() - start) / _KEYSTROKES * 1000
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [50_000]
+    for characters in sizes:
+        paragraph = make_paragraph(characters)
+        for name, column in (("end", len(paragraph)), ("middle", len(paragraph) // 2)):
+            textual = WrappedDocument(Document(paragraph), width=_WIDTH)
+            prosaic = ProsaicWrappedDocument(Document(paragraph), width=_WIDTH)
+            textual_ms = type_at(textual, column)
+            prosaic_ms = type_at(prosaic, column)
+            assert prosaic._wrap_offsets == textual._wrap_offsets
+            print(
+                f"{characters:>8,} chars {name:<6}  textual {textual_ms:>7.3f} ms"
+                f"  prosaic {prosaic_ms:>7.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,7 @@ from prosaic.core.metrics import MetricsTracker
 from prosaic.screens import DashboardScreen, EditorScreen
 from prosaic.themes import PROSAIC_DARK_CSS, PROSAIC_LIGHT_CSS
 from prosaic.utils import read_text
-from prosaic.widgets import LowercaseKeyPanel, SpellCheckTextArea
+from prosaic.widgets import LowercaseKeyPanel
 from prosaic.wizard import needs_setup, run_setup, setup_workspace
 
 
@@ -86,37 +86,49 @@ class ProsaicApp(App):
         ensure_workspace()
         self.metrics = MetricsTracker(get_workspace_dir())
         self.install_screen(DashboardScreen(self.metrics), name="dashboard")
+        self.install_screen(
+            EditorScreen(self.metrics, light_mode=self.light_mode), name="editor"
+        )
         self.push_screen("dashboard")
 
         if self.initial_file:
             self._open_editor(self.initial_file)
 
-    def _open_editor(self, file_path: Path | None = None, show_all_panes: bool = False) -> None:
-        if file_path:
+    def _open_editor(
+        self,
+        file_path: Path | None = None,
+        show_all_panes: bool = False,
+        add_note: bool = False,
+        reader_mode: bool = False,
+    ) -> None:
+        if file_path and not (add_note or reader_mode):
             set_last_file(file_path)
 
-        self.push_screen(
-            EditorScreen(
-                self.metrics,
-                initial_file=file_path,
-                light_mode=self.light_mode,
-                show_all_panes=show_all_panes,
-            )
+        screen = self._editor_screen()
+        screen.configure(
+            file_path,
+            add_note=add_note,
+            reader_mode_initial=reader_mode,
+            show_all_panes=show_all_panes,
         )
+        self.push_screen(screen)
+
+    def _editor_screen(self) -> EditorScreen:
+        """Get the installed editor, replacing it if the workspace has changed."""
+        screen = self.get_screen("editor")
+        if screen.workspace != get_workspace_dir():
+            self.uninstall_screen("editor")
+            screen = EditorScreen(self.metrics, light_mode=self.light_mode)
+            self.install_screen(screen, name="editor")
+        return screen
 
     def toggle_theme(self) -> None:
         self.light_mode = not self.light_mode
         ProsaicApp.CSS = PROSAIC_LIGHT_CSS if self.light_mode else PROSAIC_DARK_CSS
         self.refresh_css(animate=False)
 
-        try:
-            screen = self.screen
-            if isinstance(screen, EditorScreen):
-                ta = screen.query_one("#editor", SpellCheckTextArea)
-                ta.theme = "prosaic_light" if self.light_mode else "prosaic_dark"
-                ta._build_highlight_map()
-        except Exception:
-            pass
+        if self.is_screen_installed("editor"):
+            self.get_screen("editor").set_light_mode(self.light_mode)
 
     async def action_quit(self) -> None:
         self.exit()
@@ -146,10 +158,12 @@ class ProsaicApp(App):
             self.action_show_help_panel()
 
     def action_close_keys(self) -> None:
-        """Handle escape key: close KeyPanel, modal, or go back."""
+        """Handle escape key: close KeyPanel, find bar, modal, or go back."""
         screen = self.screen
         if screen.query("KeyPanel"):
             self.action_hide_help_panel()
+        elif open_bars := [bar for bar in screen.query("FindBar") if bar.display]:
+            open_bars[0].close()
         elif isinstance(screen, ModalScreen):
             if hasattr(screen, "action_cancel"):
                 screen.action_cancel()
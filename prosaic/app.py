@@ -1,16 +1,30 @@
 """Prosaic modals and dialogs."""
 
+import re
 from datetime import datetime
 from pathlib import Path
 
+from rich.text import Text
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Vertical
 from textual.screen import ModalScreen
 from textual.widgets import Input, Label, ListItem, ListView, Static
+from textual.worker import get_current_worker
 
 from prosaic.config import get_books_dir, get_pieces_dir, get_workspace_dir
+from prosaic.core.fuzzy import HeadingIndex, HeadingMatch
+from prosaic.core.search import (
+    FileMatches,
+    SearchQuery,
+    WorkspaceReplace,
+    replace_in_text,
+    scan_files,
+    workspace_files,
+)
 from prosaic.utils import write_text
+from prosaic.widgets.file_tree import FilteredDirectoryTree
 
 HELP_TEXT = """
 shortcuts
@@ -33,12 +47,17 @@ dashboard
 editor
   ctrl+e    toggle file tree
   ctrl+o    toggle outline
+  f2        go to heading
   ctrl+s    save
   ctrl+q    go home
   ctrl+p    keys
   f1        help
   f5        focus mode
   f6        reader mode
+  ctrl+g    find (alt+c case, alt+r regex)
+  ctrl+r    find and replace all
+  f3        next match (shift: previous)
+  f4        replace in workspace
 
 editing
   ctrl+z    undo
@@ -48,6 +67,9 @@ editing
   ctrl+v    paste
   ctrl+a    select all
   ctrl+k    toggle comment
+  f7        fold / unfold section
+  shift+f7  fold other sections
+  right     accept word completion
 
 status
   ○ / ●     autosave (idle / saved)
@@ -248,6 +270,280 @@ class FileFindModal(ModalScreen[Path | None]):
         self.dismiss(None)
 
 
+class _HeadingItem(ListItem):
+    """List item for a heading, with the characters matching the query in bold."""
+
+    def __init__(self, match: HeadingMatch) -> None:
+        heading = match.heading
+        label = Text("  " * (heading.level - 1))
+        text = Text(heading.text)
+        # Lowercasing can change a text's length, and so the positions.
+        if len(heading.text.lower()) == len(heading.text):
+            for position in match.positions:
+                text.stylize("bold", position, position + 1)
+        label.append_text(text)
+        label.append(f"  {heading.line}", style="dim")
+        super().__init__(Label(label))
+        self.line = heading.line
+
+
+class HeadingJumpModal(ModalScreen[int | None]):
+    """Modal for jumping to a heading, fuzzily matched as the query is typed.
+
+    Dismisses with the heading's line, numbered from 1.
+    """
+
+    BINDINGS = [
+        Binding("escape", "cancel", "cancel"),
+        Binding("ctrl+q", "cancel", "cancel", show=False, priority=True),
+        Binding("up", "cursor_up", "up", show=False),
+        Binding("down", "cursor_down", "down", show=False),
+    ]
+
+    RESULT_LIMIT = 50
+    """Headings listed at once; typing more narrows the rest down."""
+
+    def __init__(self, index: HeadingIndex, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.index = index
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="find-dialog"):
+            yield Static("go to heading", id="dialog-title")
+            yield Input(placeholder="type to filter...", id="find-input")
+            yield ListView(id="find-list")
+            yield Static("↑↓ choose • enter go to", id="find-legend")
+
+    def on_mount(self) -> None:
+        self.query_one("#find-input", Input).focus()
+        self._refresh_list("")
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self._refresh_list(event.value.strip())
+
+    def _refresh_list(self, query: str) -> None:
+        find_list = self.query_one("#find-list", ListView)
+        find_list.clear()
+        matches = self.index.search(query, self.RESULT_LIMIT)
+        find_list.extend(_HeadingItem(match) for match in matches)
+        if matches:
+            find_list.index = 0
+
+    def on_list_view_selected(self, event: ListView.Selected) -> None:
+        if isinstance(event.item, _HeadingItem):
+            self.dismiss(event.item.line)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        find_list = self.query_one("#find-list", ListView)
+        if isinstance(find_list.highlighted_child, _HeadingItem):
+            self.dismiss(find_list.highlighted_child.line)
+        else:
+            self.dismiss(None)
+
+    def action_cursor_up(self) -> None:
+        self.query_one("#find-list", ListView).action_cursor_up()
+
+    def action_cursor_down(self) -> None:
+        self.query_one("#find-list", ListView).action_cursor_down()
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
+
+
+class WorkspaceReplaceModal(ModalScreen[WorkspaceReplace | None]):
+    """Modal previewing a find and replace across every file in the workspace.
+
+    Files are scanned in parallel in a worker a moment after typing stops.
+    Nothing is changed until the replacement is confirmed; the modal then
+    dismisses with what to replace, and the editor applies it.
+    """
+
+    BINDINGS = [
+        Binding("escape", "cancel", "cancel"),
+        Binding("ctrl+q", "cancel", "cancel", show=False, priority=True),
+        Binding("ctrl+r", "apply", "replace all"),
+        Binding("alt+c", "toggle_case", "match case"),
+        Binding("alt+r", "toggle_regex", "regex"),
+    ]
+
+    PREVIEW_LIMIT = 500
+    """Hits listed in the preview; all of them are replaced."""
+
+    def __init__(self, workspace: Path, open_texts: dict[Path, str], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.workspace = workspace
+        self.open_texts = open_texts
+        self.search_query = SearchQuery("")
+        self._results: list[FileMatches] = []
+        self._scanned: SearchQuery | None = None
+        self._scan_timer = None
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="find-dialog"):
+            yield Static("replace in workspace", id="dialog-title")
+            yield Input(placeholder="find", id="workspace-find")
+            yield Input(placeholder="replace with", id="workspace-replace")
+            yield Static("", id="workspace-status")
+            yield ListView(id="find-list")
+            yield Static(
+                "ctrl+r replace all • alt+c match case • alt+r regex", id="find-legend"
+            )
+
+    def on_mount(self) -> None:
+        self.query_one("#workspace-find", Input).focus()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "workspace-find":
+            self.search_query = SearchQuery(
+                event.value, self.search_query.ignore_case, self.search_query.regex
+            )
+            self._schedule_scan()
+        else:
+            self._show_preview()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        if event.input.id == "workspace-find":
+            self.query_one("#workspace-replace", Input).focus()
+
+    def _schedule_scan(self) -> None:
+        if self._scan_timer is not None:
+            self._scan_timer.stop()
+        self._scan_timer = self.set_timer(0.3, self._start_scan)
+
+    def _start_scan(self) -> None:
+        self._scan_timer = None
+        query = self.search_query
+        if not query.text:
+            self._show_results(query, [])
+            return
+        try:
+            pattern = query.compile()
+        except re.error as error:
+            self._set_status(f"invalid pattern: {error.msg}")
+            return
+        self._set_status("searching…")
+        self._scan(query, pattern)
+
+    @work(thread=True, exclusive=True, group="scan")
+    def _scan(self, query: SearchQuery, pattern: re.Pattern[str]) -> None:
+        worker = get_current_worker()
+        paths = workspace_files(self.workspace, FilteredDirectoryTree.HIDDEN_FILES)
+        results = scan_files(pattern, paths, self.open_texts)
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self._show_results, query, results)
+
+    def _show_results(self, query: SearchQuery, results: list[FileMatches]) -> None:
+        if query != self.search_query:
+            return
+        self._scanned = query
+        self._results = results
+        self._show_preview()
+
+    def _show_preview(self) -> None:
+        """List every hit, with the replacement in place of the match."""
+        preview = self.query_one("#find-list", ListView)
+        preview.clear()
+        if self._scanned is None or not self._scanned.text:
+            self._set_status("")
+            return
+        replacement = self.query_one("#workspace-replace", Input).value
+        pattern = self._scanned.compile()
+        hits = sum(len(found.matches) for found in self._results)
+        self._set_status(
+            f"{hits:,} {'match' if hits == 1 else 'matches'} in "
+            f"{len(self._results):,} {'file' if len(self._results) == 1 else 'files'}"
+        )
+        items = []
+        for found in self._results:
+            lines = found.text.split("\n")
+            name = str(found.path.relative_to(self.workspace))
+            for row, start, end in found.matches:
+                if len(items) == self.PREVIEW_LIMIT:
+                    break
+                line = lines[row]
+                match = pattern.match(line, start)
+                try:
+                    new = self._scanned.expand(match, replacement) if match else replacement
+                except re.error:
+                    new = replacement
+                label = Text(f"{name}:{row + 1}  ", style="dim")
+                label.append(line[max(0, start - 24) : start].lstrip())
+                label.append(line[start:end], style="strike")
+                label.append("→", style="dim")
+                label.append(new, style="bold")
+                label.append(line[end : end + 24])
+                items.append(ListItem(Label(label)))
+        preview.extend(items)
+
+    def _set_status(self, status: str) -> None:
+        options = []
+        if not self.search_query.ignore_case:
+            options.append("match case")
+        if self.search_query.regex:
+            options.append("regex")
+        self.query_one("#workspace-status", Static).update(
+            " · ".join(part for part in [status, *options] if part)
+        )
+
+    def action_apply(self) -> None:
+        if self._scan_timer is not None or self._scanned != self.search_query:
+            self.notify("Still searching")
+            return
+        if not self._results:
+            return
+        replacement = self.query_one("#workspace-replace", Input).value
+        first = self._results[0]
+        try:
+            replace_in_text(self._scanned, self._scanned.compile(), first.text, replacement)
+        except re.error as error:
+            self.notify(f"Invalid replacement: {error}", severity="error")
+            return
+        self.dismiss(WorkspaceReplace(self._scanned, replacement, self._results))
+
+    def action_toggle_case(self) -> None:
+        query = self.search_query
+        self.search_query = SearchQuery(query.text, not query.ignore_case, query.regex)
+        self._schedule_scan()
+
+    def action_toggle_regex(self) -> None:
+        query = self.search_query
+        self.search_query = SearchQuery(query.text, query.ignore_case, not query.regex)
+        self._schedule_scan()
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
+
+
+class RecoverJournalModal(ModalScreen[bool]):
+    """Modal offering to replay unsaved edits found after a crash."""
+
+    BINDINGS = [
+        Binding("escape", "cancel", "cancel"),
+        Binding("y", "confirm", "yes"),
+        Binding("n", "cancel", "no"),
+    ]
+
+    def __init__(self, name: str, edit_count: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.file_name = name
+        self.edit_count = edit_count
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="dialog"):
+            yield Static("recover changes", id="dialog-title")
+            yield Static(
+                f"'{self.file_name}' has {self.edit_count:,} unsaved "
+                "edits from a previous session.\n\nrestore them?"
+            )
+            yield Static("(y) yes  (n) no", classes="dialog-hint")
+
+    def action_confirm(self) -> None:
+        self.dismiss(True)
+
+    def action_cancel(self) -> None:
+        self.dismiss(False)
+
+
 class HelpScreen(ModalScreen):
     """Help screen showing keybindings."""
 
@@ -265,4 +561,12 @@ class HelpScreen(ModalScreen):
         self.dismiss()
 
 
-__all__ = ["FileFindModal", "HelpScreen", "NewBookModal", "NewPieceModal", "StartWritingModal"]
+__all__ = [
+    "FileFindModal",
+    "HeadingJumpModal",
+    "HelpScreen",
+    "NewBookModal",
+    "NewPieceModal",
+    "StartWritingModal",
+    "WorkspaceReplaceModal",
+]
@@ -6,6 +6,7 @@ import shutil
 from importlib.metadata import version
 from pathlib import Path
 
+from prosaic.core.limits import LargeFileLimits
 from prosaic.utils import read_text, write_text
 
 try:
@@ -286,6 +287,34 @@ def get_notes_path() -> Path:
     return get_workspace_dir() / "notes.md"
 
 
+def get_cache_dir() -> Path:
+    """Get the workspace cache directory, kept out of git.
+
+    Creates the directory and its ``.gitignore`` on first use.
+    """
+    cache_dir = get_workspace_dir() / ".prosaic"
+    gitignore = cache_dir / ".gitignore"
+    if not gitignore.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_text(gitignore, "*\n")
+    return cache_dir
+
+
+def get_journal_dir() -> Path:
+    """Get the directory holding crash-recovery edit journals."""
+    return get_cache_dir() / "journal"
+
+
+def get_analysis_dir() -> Path:
+    """Get the directory holding cached per-file analysis and view state."""
+    return get_cache_dir() / "analysis"
+
+
+def get_undo_dir() -> Path:
+    """Get the directory holding saved undo history and spilled undo steps."""
+    return get_cache_dir() / "undo"
+
+
 def get_last_file() -> Path | None:
     """Get the last edited file path from active profile."""
     profile = get_profile_config()
@@ -306,6 +335,60 @@ def set_last_file(path: Path) -> None:
     save_profile_config(profile)
 
 
+def get_large_file_limits() -> LargeFileLimits:
+    """Get large-file mode thresholds from active profile or defaults."""
+    profile = get_profile_config()
+    defaults = LargeFileLimits()
+    try:
+        return LargeFileLimits(
+            max_chars=int(profile.get("large_file_chars", defaults.max_chars)),
+            max_lines=int(profile.get("large_file_lines", defaults.max_lines)),
+        )
+    except (TypeError, ValueError):
+        return defaults
+
+
+def get_buffer_cache_bytes() -> int:
+    """Get the memory budget for documents kept open in the background."""
+    try:
+        megabytes = float(get_profile_config().get("buffer_cache_mb", 64))
+    except (TypeError, ValueError):
+        megabytes = 64
+    return int(megabytes * 1024 * 1024)
+
+
+def get_analysis_cache_bytes() -> int:
+    """Get the disk budget for cached per-file analysis."""
+    try:
+        megabytes = float(get_profile_config().get("analysis_cache_mb", 32))
+    except (TypeError, ValueError):
+        megabytes = 32
+    return int(megabytes * 1024 * 1024)
+
+
+def get_undo_memory_bytes() -> int:
+    """Get the memory budget for each document's undo history."""
+    try:
+        megabytes = float(get_profile_config().get("undo_memory_mb", 4))
+    except (TypeError, ValueError):
+        megabytes = 4
+    return int(megabytes * 1024 * 1024)
+
+
+def get_undo_history_bytes() -> int:
+    """Get the disk budget for undo history saved between sessions."""
+    try:
+        megabytes = float(get_profile_config().get("undo_history_mb", 32))
+    except (TypeError, ValueError):
+        megabytes = 32
+    return int(megabytes * 1024 * 1024)
+
+
+def get_save_fsync() -> bool:
+    """Get whether saves are flushed to disk before replacing the file."""
+    return bool(get_profile_config().get("fsync_saves", True))
+
+
 def ensure_workspace() -> None:
     """Ensure the workspace structure exists."""
     dirs = [
@@ -7,9 +7,11 @@ from prosaic.core.markdown import (
     strip_markdown,
 )
 from prosaic.core.metrics import MetricsTracker
+from prosaic.core.spans import SpanStore
 
 __all__ = [
     "MetricsTracker",
+    "SpanStore",
     "count_characters",
     "count_words",
     "extract_headings",
@@ -0,0 +1,109 @@
+"""On-disk cache of per-file analysis and view state for fast reopening."""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from prosaic.core.markdown import HeadingArray
+from prosaic.core.spans import SpanStore
+from prosaic.core.writer import SaveQueue
+
+ANALYSIS_VERSION = 1
+
+
+@dataclass
+class Analysis:
+    """What was known about a document when it was last closed."""
+
+    content_hash: str
+    """Hash of the text the rest of the entry describes."""
+    cursor: tuple[tuple[int, int], tuple[int, int]] = ((0, 0), (0, 0))
+    """Selection start and end."""
+    scroll: tuple[float, float] = (0.0, 0.0)
+    highlights: SpanStore | None = None
+    headings: HeadingArray | None = None
+    counts: tuple[int, int] | None = None
+    """Word and character counts."""
+
+
+class AnalysisCache:
+    """Analysis entries keyed by file path, valid only for matching content.
+
+    Each file gets one JSON entry, written through the workspace save queue.
+    An entry whose content hash no longer matches the file is ignored and
+    overwritten the next time the file is closed. ``prune`` deletes the least
+    recently written entries once the directory exceeds its size budget.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        writer: SaveQueue,
+        max_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._writer = writer
+
+    def entry_path(self, source: Path) -> Path:
+        """Get the cache entry file for a document."""
+        digest = hashlib.blake2b(str(source).encode("utf-8"), digest_size=8).hexdigest()
+        return self.directory / f"{source.stem}-{digest}.json"
+
+    def get(self, source: Path, content_hash: str) -> Analysis | None:
+        """Read the cached analysis for a document.
+
+        Returns:
+            The analysis, or None if there is none for this exact content.
+        """
+        try:
+            data = json.loads(self.entry_path(source).read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get("version") != ANALYSIS_VERSION or data.get("hash") != content_hash:
+            return None
+        try:
+            (start_row, start_col), (end_row, end_col) = data["cursor"]
+            scroll_x, scroll_y = data["scroll"]
+            highlights = data.get("highlights")
+            headings = data.get("headings")
+            counts = data.get("counts")
+            return Analysis(
+                content_hash=content_hash,
+                cursor=((int(start_row), int(start_col)), (int(end_row), int(end_col))),
+                scroll=(float(scroll_x), float(scroll_y)),
+                highlights=SpanStore.from_dict(highlights) if highlights else None,
+                headings=HeadingArray.from_dict(headings) if headings else None,
+                counts=(int(counts[0]), int(counts[1])) if counts else None,
+            )
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return None
+
+    def put(self, source: Path, analysis: Analysis) -> None:
+        """Queue an analysis entry to be written, replacing any older one."""
+        data: dict = {
+            "version": ANALYSIS_VERSION,
+            "file": str(source),
+            "hash": analysis.content_hash,
+            "cursor": analysis.cursor,
+            "scroll": analysis.scroll,
+        }
+        if analysis.highlights is not None:
+            data["highlights"] = analysis.highlights.to_dict()
+        if analysis.headings is not None:
+            data["headings"] = analysis.headings.to_dict()
+        if analysis.counts is not None:
+            data["counts"] = analysis.counts
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writer.submit(self.entry_path(source), json.dumps(data, ensure_ascii=False))
+
+    def prune(self) -> int:
+        """Delete the oldest entries until the cache fits its size budget.
+
+        Returns:
+            The number of entries deleted.
+        """
+        return self._writer.prune(self.directory, "*.json", self.max_bytes)
@@ -0,0 +1,299 @@
+"""Incremental document analyzers, kept current from the editor's edit deltas."""
+
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TypeVar
+
+from textual.widgets.text_area import Location
+
+from prosaic.core.markdown import HeadingArray, count_line, parse_heading
+
+
+@dataclass(frozen=True, slots=True)
+class EditDelta:
+    """One replacement in a document: ``text`` replaced ``start`` up to ``end``."""
+
+    start: Location
+    end: Location
+    text: str
+
+    @property
+    def new_end(self) -> Location:
+        """Where the inserted text ends."""
+        newlines = self.text.count("\n")
+        if not newlines:
+            return self.start[0], self.start[1] + len(self.text)
+        return self.start[0] + newlines, len(self.text) - self.text.rfind("\n") - 1
+
+    @property
+    def line_shift(self) -> int:
+        """Rows added to the document by the edit, or removed if negative."""
+        return self.text.count("\n") - (self.end[0] - self.start[0])
+
+
+@dataclass(frozen=True, slots=True)
+class ChangedRows:
+    """Rows ``first`` up to ``old_end`` were replaced by ``first`` up to ``new_end``.
+
+    Rows before ``first`` are unchanged, and rows from ``old_end`` on moved
+    by ``shift``.
+    """
+
+    first: int
+    old_end: int
+    new_end: int
+
+    @property
+    def shift(self) -> int:
+        """Rows added by the change, or removed if negative."""
+        return self.new_end - self.old_end
+
+    @classmethod
+    def of(cls, delta: EditDelta) -> "ChangedRows":
+        """Get the rows changed by one edit."""
+        return cls(delta.start[0], delta.end[0] + 1, delta.start[0] + delta.text.count("\n") + 1)
+
+    def then(self, delta: EditDelta) -> "ChangedRows":
+        """Get the rows changed by these rows' edits followed by another."""
+        first = delta.start[0]
+        end = delta.end[0] + 1
+        top = max(self.new_end, end)
+        return ChangedRows(
+            min(self.first, first),
+            self.old_end + top - self.new_end,
+            top + delta.line_shift,
+        )
+
+
+class Analyzer(ABC):
+    """Derived state about a document, updated from the rows each edit changed.
+
+    Subclasses implement ``rebuild`` to analyze the whole document and
+    ``update`` to patch their state after rows change. Edits are merged
+    until the analyzer is synced, so a burst of keystrokes, or an undo of
+    many edits, is one update. A stale analyzer ignores edits and rebuilds
+    on its next sync; analyzers start stale, so one nobody syncs costs
+    nothing.
+    """
+
+    def __init__(self) -> None:
+        self._stale = True
+        self._pending: ChangedRows | None = None
+
+    @property
+    def stale(self) -> bool:
+        """Whether the next sync rebuilds from the whole document."""
+        return self._stale
+
+    def notify(self, delta: EditDelta) -> None:
+        """Record an edit, to apply on the next sync."""
+        if self._stale:
+            return
+        if self._pending is None:
+            self._pending = ChangedRows.of(delta)
+        else:
+            self._pending = self._pending.then(delta)
+
+    def invalidate(self) -> None:
+        """Forget the document, e.g. when another one is loaded."""
+        self._stale = True
+        self._pending = None
+
+    def sync(self, lines: Sequence[str]) -> None:
+        """Bring the state up to date with the document's current lines."""
+        if self._stale:
+            self.rebuild(lines)
+            self._stale = False
+        elif self._pending is not None:
+            self.update(self._pending, lines)
+        self._pending = None
+
+    @abstractmethod
+    def rebuild(self, lines: Sequence[str]) -> None:
+        """Analyze the whole document."""
+
+    @abstractmethod
+    def update(self, change: ChangedRows, lines: Sequence[str]) -> None:
+        """Patch the state after rows changed; lines are the document's current lines."""
+
+    def _mark_current(self) -> None:
+        """Treat state set from elsewhere, e.g. a cache, as current."""
+        self._stale = False
+        self._pending = None
+
+
+AnalyzerT = TypeVar("AnalyzerT", bound=Analyzer)
+
+
+class EditBus:
+    """Fan the edits made to one document out to its analyzers."""
+
+    def __init__(self) -> None:
+        self._analyzers: list[Analyzer] = []
+
+    def subscribe(self, analyzer: AnalyzerT) -> AnalyzerT:
+        """Add an analyzer, returning it."""
+        self._analyzers.append(analyzer)
+        return analyzer
+
+    def publish(self, delta: EditDelta) -> None:
+        """Pass an edit to every analyzer."""
+        for analyzer in self._analyzers:
+            analyzer.notify(delta)
+
+    def reset(self) -> None:
+        """Invalidate every analyzer, e.g. after a whole-document load."""
+        for analyzer in self._analyzers:
+            analyzer.invalidate()
+
+
+def _splice_rows(rows: list[int], change: ChangedRows, added: list[int]) -> list[int]:
+    """Replace the sorted rows within a change by those added, shifting later ones."""
+    start = bisect_left(rows, change.first)
+    end = bisect_left(rows, change.old_end)
+    shift = change.shift
+    return rows[:start] + added + [row + shift for row in rows[end:]]
+
+
+class HeadingAnalyzer(Analyzer):
+    """The document's headings, for the outline.
+
+    Edits that don't touch a heading or move one keep the same HeadingArray,
+    so callers can tell nothing changed by identity.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.headings = HeadingArray()
+
+    def load(self, headings: HeadingArray) -> None:
+        """Start from headings already extracted for the current text."""
+        self.headings = headings
+        self._mark_current()
+
+    def rebuild(self, lines: Sequence[str]) -> None:
+        headings = HeadingArray()
+        for row, line in enumerate(lines):
+            heading = parse_heading(line)
+            if heading is not None:
+                headings.append(*heading, row + 1)
+        self.headings = headings
+
+    def update(self, change: ChangedRows, lines: Sequence[str]) -> None:
+        old = self.headings
+        # Heading lines are numbered from 1.
+        start = bisect_left(old.lines, change.first + 1)
+        end = bisect_left(old.lines, change.old_end + 1)
+        added = HeadingArray()
+        for row in range(change.first, change.new_end):
+            heading = parse_heading(lines[row])
+            if heading is not None:
+                added.append(*heading, row + 1)
+        if start == end and not added and (not change.shift or end == len(old)):
+            return
+        shift = change.shift
+        headings = HeadingArray()
+        headings.levels = old.levels[:start] + added.levels + old.levels[end:]
+        headings.lines = (
+            old.lines[:start]
+            + added.lines
+            + array("I", [line + shift for line in old.lines[end:]])
+        )
+        headings.texts = old.texts[:start] + added.texts + old.texts[end:]
+        self.headings = headings
+
+
+class CountAnalyzer(Analyzer):
+    """Word and character counts, excluding markdown syntax.
+
+    Each row's counts are kept, so an edit recounts only the rows it
+    changed. Code blocks and frontmatter are left out of the totals, as
+    they are for spell checking.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._words = array("I")
+        self._characters = array("I")
+        self._all_words = 0
+        self._all_characters = 0
+        self._fences: list[int] = []
+        self._rules: list[int] = []
+        self.words = 0
+        self.characters = 0
+
+    def rebuild(self, lines: Sequence[str]) -> None:
+        self._words = array("I")
+        self._characters = array("I")
+        self._fences, self._rules = self._count_rows(
+            lines, 0, len(lines), self._words, self._characters
+        )
+        self._all_words = sum(self._words)
+        self._all_characters = sum(self._characters)
+        self._total()
+
+    def update(self, change: ChangedRows, lines: Sequence[str]) -> None:
+        first, old_end = change.first, change.old_end
+        words = array("I")
+        characters = array("I")
+        fences, rules = self._count_rows(lines, first, change.new_end, words, characters)
+        self._all_words += sum(words) - sum(self._words[first:old_end])
+        self._all_characters += sum(characters) - sum(self._characters[first:old_end])
+        self._words[first:old_end] = words
+        self._characters[first:old_end] = characters
+        self._fences = _splice_rows(self._fences, change, fences)
+        self._rules = _splice_rows(self._rules, change, rules)
+        self._total()
+
+    @staticmethod
+    def _count_rows(
+        lines: Sequence[str],
+        first: int,
+        last: int,
+        words: array,
+        characters: array,
+    ) -> tuple[list[int], list[int]]:
+        """Append the counts of rows first up to last, and find their fences and rules."""
+        fences = []
+        rules = []
+        for row in range(first, last):
+            line = lines[row]
+            stripped = line.strip()
+            if stripped.startswith("```"):
+                fences.append(row)
+            elif stripped == "---":
+                rules.append(row)
+            row_words, row_characters = count_line(line) if stripped else (0, 0)
+            words.append(row_words)
+            characters.append(row_characters)
+        return fences, rules
+
+    def _total(self) -> None:
+        """Subtract the rows in code blocks and frontmatter from the totals."""
+        words = self._all_words
+        characters = self._all_characters
+        for start, end in self._excluded():
+            words -= sum(self._words[start:end])
+            characters -= sum(self._characters[start:end])
+        self.words = words
+        self.characters = characters
+
+    def _excluded(self) -> list[tuple[int, int]]:
+        """Row ranges of frontmatter and fenced code blocks, fences included."""
+        line_count = len(self._words)
+        ranges = []
+        start = 0
+        rules = self._rules
+        # Like strip_frontmatter, an opening rule without a closing one is
+        # just a rule.
+        if len(rules) > 1 and rules[0] == 0:
+            start = rules[1] + 1
+            ranges.append((0, start))
+        # Like strip_code_blocks, a final fence without a partner is text.
+        fences = self._fences[bisect_left(self._fences, start) :]
+        for index in range(0, len(fences) - 1, 2):
+            ranges.append((fences[index], fences[index + 1] + 1))
+        return ranges
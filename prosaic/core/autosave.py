@@ -0,0 +1,57 @@
+"""Idle-driven autosave scheduling."""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from textual.message_pump import MessagePump
+
+
+class AutosaveScheduler:
+    """Schedule a save once editing pauses, with a deadline under constant typing.
+
+    Each ``touch`` resets the idle countdown, reusing its timer; the first touch after a save
+    also starts a deadline so a long burst of typing is still saved at least
+    every ``max_delay`` seconds. No timers run while nothing is unsaved.
+    """
+
+    def __init__(
+        self,
+        scheduler: MessagePump,
+        save: Callable[[], Awaitable[None] | None],
+        idle_delay: float = 2.0,
+        max_delay: float = 10.0,
+    ) -> None:
+        self._scheduler = scheduler
+        self._save = save
+        self.idle_delay = idle_delay
+        self.max_delay = max_delay
+        self._idle_timer: Any = None
+        self._deadline_timer: Any = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether a save is scheduled."""
+        return self._idle_timer is not None
+
+    def touch(self) -> None:
+        """Note an unsaved change, pushing the idle save back."""
+        if self._idle_timer is not None:
+            self._idle_timer.reset()
+        else:
+            self._idle_timer = self._scheduler.set_timer(self.idle_delay, self._fire)
+        if self._deadline_timer is None:
+            self._deadline_timer = self._scheduler.set_timer(
+                self.max_delay, self._fire
+            )
+
+    def cancel(self) -> None:
+        """Drop any scheduled save, e.g. after saving some other way."""
+        for timer in (self._idle_timer, self._deadline_timer):
+            if timer is not None:
+                timer.stop()
+        self._idle_timer = None
+        self._deadline_timer = None
+
+    def _fire(self) -> Awaitable[None] | None:
+        self.cancel()
+        return self._save()
@@ -0,0 +1,85 @@
+"""In-memory cache of open documents for fast switching."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from prosaic.core.markdown import HeadingArray
+
+
+@dataclass
+class Buffer:
+    """A saved document kept in memory while another one is being edited."""
+
+    path: Path
+    editor_state: Any
+    """Document, undo history and highlights, as detached from the editor."""
+    saved_hash: str
+    signature: tuple[int, int] | None
+    """File mtime and size when last loaded or saved, to detect outside changes."""
+    size: int
+    """Approximate memory held, in bytes."""
+    headings: HeadingArray | None = None
+    counts: tuple[int, int] | None = None
+    """Word and character counts, if they were current when cached."""
+
+
+class BufferCache:
+    """Least-recently-used cache of buffers, bounded by count and memory.
+
+    Only saved buffers are cached, so evicting one never loses work; it just
+    means the next switch to that file reads it from disk again.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_buffers: int = 16) -> None:
+        self.max_bytes = max_bytes
+        self.max_buffers = max_buffers
+        self._buffers: OrderedDict[Path, Buffer] = OrderedDict()
+        self._total = 0
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._buffers
+
+    @property
+    def total_bytes(self) -> int:
+        """Approximate memory held by all cached buffers."""
+        return self._total
+
+    def put(self, buffer: Buffer) -> list[Buffer]:
+        """Cache a buffer as the most recently used, evicting old ones to fit.
+
+        Returns:
+            The buffers evicted to make room.
+        """
+        self.take(buffer.path)
+        self._buffers[buffer.path] = buffer
+        self._total += buffer.size
+        evicted = []
+        while len(self._buffers) > 1 and (
+            self._total > self.max_bytes or len(self._buffers) > self.max_buffers
+        ):
+            _, oldest = self._buffers.popitem(last=False)
+            self._total -= oldest.size
+            evicted.append(oldest)
+        if self._total > self.max_bytes:
+            evicted.append(self.take(buffer.path))
+        return evicted
+
+    def get(self, path: Path) -> Buffer | None:
+        """Look at a cached buffer without changing its recency."""
+        return self._buffers.get(path)
+
+    def take(self, path: Path) -> Buffer | None:
+        """Remove and return a cached buffer, e.g. to make it current again."""
+        buffer = self._buffers.pop(path, None)
+        if buffer is not None:
+            self._total -= buffer.size
+        return buffer
+
+    def clear(self) -> None:
+        self._buffers.clear()
+        self._total = 0
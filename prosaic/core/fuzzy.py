@@ -0,0 +1,102 @@
+"""Fuzzy matching of typed queries against the document's headings."""
+
+from dataclasses import dataclass
+
+from prosaic.core.markdown import Heading, HeadingArray
+
+
+@dataclass(frozen=True, slots=True)
+class HeadingMatch:
+    """A heading matching a query, with the matched characters' positions."""
+
+    heading: Heading
+    positions: tuple[int, ...]
+
+
+def fuzzy_match(query: str, text: str) -> tuple[int, ...] | None:
+    """Find query's characters in text, in order but not necessarily together.
+
+    Both are compared as given, so lowercase them first to ignore case. A
+    run of the query found as one piece is preferred to a scattered match.
+
+    Returns:
+        The positions in text of the query's characters, or None if text
+        doesn't contain them in order.
+    """
+    positions = []
+    start = 0
+    for char in query:
+        index = text.find(char, start)
+        if index < 0:
+            return None
+        positions.append(index)
+        start = index + 1
+    found = text.find(query)
+    if found >= 0:
+        together = tuple(range(found, found + len(query)))
+        if _score(text, together) >= _score(text, positions):
+            return together
+    return tuple(positions)
+
+
+def _score(text: str, positions: tuple[int, ...] | list[int]) -> int:
+    """Rate a match: characters that follow one another or start words count more."""
+    score = 0
+    previous = -2
+    for position in positions:
+        if position == previous + 1:
+            score += 3
+        elif position == 0 or not text[position - 1].isalnum():
+            score += 2
+        else:
+            score += 1
+        previous = position
+    return score
+
+
+class HeadingIndex:
+    """Lowercased heading texts, searched fuzzily as a query is typed.
+
+    The texts are lowercased once, when the index is made. Typing more of a
+    query only searches the headings the shorter query matched, so each
+    keystroke gets cheaper as the results narrow.
+    """
+
+    def __init__(self, headings: HeadingArray) -> None:
+        self.headings = headings
+        self._keys = [text.lower() for text in headings.texts]
+        self._query = ""
+        self._matched: list[int] = list(range(len(headings)))
+
+    def search(self, query: str, limit: int | None = None) -> list[HeadingMatch]:
+        """Find the headings matching query, best first.
+
+        Matches are ranked by how well the characters match, then by how
+        tightly they are grouped, then by document order. An empty query
+        matches every heading, in document order.
+        """
+        query = query.lower()
+        headings = self.headings
+        if not query:
+            count = len(headings) if limit is None else min(limit, len(headings))
+            return [HeadingMatch(headings[index], ()) for index in range(count)]
+
+        if self._query and query.startswith(self._query):
+            candidates = self._matched
+        else:
+            candidates = range(len(headings))
+        keys = self._keys
+        ranked = []
+        for index in candidates:
+            key = keys[index]
+            positions = fuzzy_match(query, key)
+            if positions is not None:
+                spread = positions[-1] - positions[0]
+                ranked.append((-_score(key, positions), spread, index, positions))
+        self._query = query
+        self._matched = [entry[2] for entry in ranked]
+        ranked.sort()
+        return [
+            HeadingMatch(headings[index], positions)
+            for _, _, index, positions in ranked[:limit]
+        ]
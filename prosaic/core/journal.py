@@ -0,0 +1,178 @@
+"""Append-only edit journal for crash recovery."""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TextIO
+
+from textual.widgets.text_area import Document, Location
+
+from prosaic.utils import write_text_atomic
+
+JOURNAL_VERSION = 1
+
+
+@dataclass
+class JournalContents:
+    """A journal read back from disk."""
+
+    source: Path | None
+    base_hash: str
+    base_text: str | None = None
+    edits: list[tuple[Location, Location, str]] = field(default_factory=list)
+
+
+def journal_path(journal_dir: Path, source: Path | None) -> Path:
+    """Get the journal file for a document, or for the untitled buffer."""
+    if source is None:
+        return journal_dir / "untitled.jsonl"
+    digest = hashlib.blake2b(str(source).encode("utf-8"), digest_size=8).hexdigest()
+    return journal_dir / f"{source.stem}-{digest}.jsonl"
+
+
+def read_journal(path: Path) -> JournalContents | None:
+    """Read a journal, ignoring a final line cut short by a crash.
+
+    Returns:
+        The journal contents, or None if there is no readable journal.
+    """
+    try:
+        lines = path.read_text(encoding="utf-8").split("\n")
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not lines[0]:
+        return None
+    try:
+        header = json.loads(lines[0])
+        if header.get("version") != JOURNAL_VERSION:
+            return None
+        source = header.get("file")
+        contents = JournalContents(
+            source=Path(source) if source else None,
+            base_hash=header["base"],
+            base_text=header.get("text"),
+        )
+    except (json.JSONDecodeError, KeyError, AttributeError):
+        return None
+    for line in lines[1:]:
+        if not line:
+            break
+        try:
+            start_row, start_col, end_row, end_col, text = json.loads(line)
+        except (json.JSONDecodeError, ValueError, TypeError):
+            break
+        contents.edits.append(((start_row, start_col), (end_row, end_col), text))
+    return contents
+
+
+def recoverable(path: Path, base_hash: str) -> JournalContents | None:
+    """Read a journal whose edits apply to the text with base_hash.
+
+    Returns:
+        The journal contents, or None if there is no journal, it holds no
+        edits, or they were recorded against other text.
+    """
+    contents = read_journal(path)
+    if contents is None or not contents.edits or contents.base_hash != base_hash:
+        return None
+    return contents
+
+
+def set_aside(path: Path) -> Path:
+    """Rename a journal whose file changed since its edits were recorded.
+
+    Starting a new journal would otherwise overwrite the edits; kept under
+    a timestamped name, they can still be recovered by hand.
+
+    Returns:
+        Where the journal now is.
+    """
+    stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    target = path.with_name(f"{path.stem}.{stamp}.stale.jsonl")
+    path.replace(target)
+    return target
+
+
+def replay(base: str, edits: list[tuple[Location, Location, str]]) -> str:
+    """Apply journalled edits to the text they were recorded against."""
+    document = Document(base)
+    for start, end, text in edits:
+        document.replace_range(start, end, text)
+    return document.text
+
+
+class EditJournal:
+    """Append-only log of the edits made to one document.
+
+    The first line records the saved text the edits apply to, by hash (and
+    in full for an untitled buffer); each further line is one replacement
+    as ``[start_row, start_col, end_row, end_col, text]``. Lines are flushed
+    as they are written, so a crash loses at most the edit in progress.
+    """
+
+    def __init__(self, path: Path, source: Path | None) -> None:
+        self.path = path
+        self.source = source
+        self._file: TextIO | None = None
+
+    def start(self, base_hash: str, base_text: str | None = None) -> None:
+        """Begin a fresh journal against saved text, dropping any old entries."""
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self._file.write(self._header(base_hash, base_text))
+        self._file.flush()
+
+    def resume(self) -> None:
+        """Keep appending to the journal already on disk."""
+        self.close()
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def record(self, start: Location, end: Location, text: str) -> None:
+        """Append one replacement of the range start..end with text."""
+        if self._file is None:
+            return
+        self._file.write(json.dumps([*start, *end, text], ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def mark(self) -> int:
+        """Get the current end of the journal, to compact up to after a save."""
+        return self._file.tell() if self._file is not None else 0
+
+    def compact(self, base_hash: str, mark: int) -> None:
+        """Drop the entries before mark, which are now saved to disk.
+
+        Entries recorded after the mark (while the save was in flight) are
+        kept, now relative to the newly saved text.
+        """
+        if self._file is None:
+            return
+        self._file.flush()
+        with self.path.open("r", encoding="utf-8") as f:
+            f.seek(mark)
+            tail = f.read()
+        self._file.close()
+        write_text_atomic(self.path, self._header(base_hash) + tail, fsync=False)
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Close the journal and delete it."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def _header(self, base_hash: str, base_text: str | None = None) -> str:
+        header: dict = {
+            "version": JOURNAL_VERSION,
+            "file": str(self.source) if self.source else None,
+            "base": base_hash,
+        }
+        if base_text is not None:
+            header["text"] = base_text
+        return json.dumps(header, ensure_ascii=False) + "\n"
@@ -0,0 +1,22 @@
+"""Thresholds for large-file mode."""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LargeFileLimits:
+    """Document size above which the editor switches to large-file mode."""
+
+    max_chars: int = 1_000_000
+    max_lines: int = 25_000
+    hysteresis: float = 0.8
+
+    def is_large(self, chars: int, lines: int, currently_large: bool = False) -> bool:
+        """Check whether a document of this size should use large-file mode.
+
+        A document already in large-file mode has to shrink below
+        ``hysteresis`` times both limits to leave it, so edits near a
+        limit don't flip the mode back and forth.
+        """
+        scale = self.hysteresis if currently_large else 1.0
+        return chars > self.max_chars * scale or lines > self.max_lines * scale
@@ -1,8 +1,11 @@
 """Markdown processing utilities."""
 
 import re
+from array import array
 from dataclasses import dataclass
 
+_HEADING = re.compile(r"^(#{1,6})\s+(.+)$")
+
 
 @dataclass
 class Heading:
@@ -13,6 +16,55 @@ class Heading:
     line: int
 
 
+class HeadingArray:
+    """Headings stored as parallel arrays of level, line and text."""
+
+    __slots__ = ("levels", "lines", "texts")
+
+    def __init__(self) -> None:
+        self.levels = array("B")
+        self.lines = array("I")
+        self.texts: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, index: int) -> Heading:
+        return Heading(
+            level=self.levels[index],
+            text=self.texts[index],
+            line=self.lines[index],
+        )
+
+    def append(self, level: int, text: str, line: int) -> None:
+        self.levels.append(level)
+        self.lines.append(line)
+        self.texts.append(text)
+
+    def to_dict(self) -> dict:
+        """Serialize to plain lists."""
+        return {
+            "levels": self.levels.tolist(),
+            "lines": self.lines.tolist(),
+            "texts": list(self.texts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HeadingArray":
+        """Rebuild headings serialized with to_dict.
+
+        Raises:
+            ValueError: If the arrays differ in length.
+        """
+        headings = cls()
+        headings.levels = array("B", data["levels"])
+        headings.lines = array("I", data["lines"])
+        headings.texts = list(data["texts"])
+        if not len(headings.levels) == len(headings.lines) == len(headings.texts):
+            raise ValueError("invalid heading data: lengths do not match")
+        return headings
+
+
 def strip_frontmatter(content: str) -> str:
     """Remove YAML frontmatter from content."""
     if content.startswith("---"):
@@ -66,13 +118,43 @@ def count_characters(content: str, include_spaces: bool = False) -> int:
     return len(stripped.replace(" ", "").replace("\n", "").replace("\t", ""))
 
 
+def count_line(line: str) -> tuple[int, int]:
+    """Count the words and characters in one line of markdown, excluding syntax.
+
+    The counts agree with count_words and count_characters for markdown that
+    doesn't span lines.
+    """
+    stripped = strip_markdown(line)
+    return len(stripped.split()), len(stripped) - stripped.count(" ") - stripped.count("\t")
+
+
+def parse_heading(line: str) -> tuple[int, str] | None:
+    """Get the level and text of a heading line, or None for any other line."""
+    if not line.lstrip().startswith("#"):
+        return None
+    match = _HEADING.match(line.strip())
+    if match is None:
+        return None
+    return len(match.group(1)), match.group(2).strip()
+
+
 def extract_headings(content: str) -> list[Heading]:
     """Extract all headings from markdown content."""
     headings = []
     for i, line in enumerate(content.split("\n")):
-        match = re.match(r"^(#{1,6})\s+(.+)$", line.strip())
+        match = _HEADING.match(line.strip())
         if match:
             level = len(match.group(1))
             text = match.group(2).strip()
             headings.append(Heading(level=level, text=text, line=i + 1))
     return headings
+
+
+def extract_heading_array(content: str) -> HeadingArray:
+    """Extract all headings from markdown content into a HeadingArray."""
+    headings = HeadingArray()
+    for i, line in enumerate(content.split("\n")):
+        heading = parse_heading(line)
+        if heading is not None:
+            headings.append(*heading, i + 1)
+    return headings
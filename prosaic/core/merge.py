@@ -0,0 +1,110 @@
+"""Line-level three-way merge, for files changed on disk while being edited."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+
+CONFLICT_START = "<<<<<<< unsaved"
+CONFLICT_SEPARATOR = "======="
+CONFLICT_END = ">>>>>>> on disk"
+
+
+@dataclass
+class MergeResult:
+    """Merged lines, with the rows where conflict markers start."""
+
+    lines: list[str]
+    conflicts: list[int] = field(default_factory=list)
+
+
+def changed_rows(old: Sequence[str], new: Sequence[str]) -> tuple[int, int, int] | None:
+    """Find the rows that differ between two versions of a text.
+
+    Returns:
+        ``(first, old_end, new_end)``: rows first up to old_end of old were
+        replaced by rows first up to new_end of new. None if the two match.
+    """
+    limit = min(len(old), len(new))
+    first = 0
+    while first < limit and old[first] == new[first]:
+        first += 1
+    if first == len(old) == len(new):
+        return None
+    old_end = len(old)
+    new_end = len(new)
+    while old_end > first and new_end > first and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    return first, old_end, new_end
+
+
+def _matched_lines(base: Sequence[str], other: Sequence[str]) -> dict[int, int]:
+    """Map each base row that survives unchanged in other to its row there.
+
+    Only the rows between the common head and tail are diffed, so the cost
+    follows the size of the edit rather than of the document.
+    """
+    change = changed_rows(base, other)
+    if change is None:
+        return {row: row for row in range(len(base))}
+    first, base_end, other_end = change
+    matched = {row: row for row in range(first)}
+    shift = other_end - base_end
+    for row in range(base_end, len(base)):
+        matched[row] = row + shift
+    matcher = SequenceMatcher(
+        None, base[first:base_end], other[first:other_end], autojunk=False
+    )
+    for base_row, other_row, size in matcher.get_matching_blocks():
+        for offset in range(size):
+            matched[first + base_row + offset] = first + other_row + offset
+    return matched
+
+
+def merge3(
+    base: Sequence[str],
+    ours: Sequence[str],
+    theirs: Sequence[str],
+) -> MergeResult:
+    """Merge two edited versions of the same lines, diff3 style.
+
+    Rows unchanged from base in both versions anchor the merge. Between
+    anchors, a change made on one side only is taken, as is the same change
+    made on both; different changes to the same rows are a conflict, and
+    both versions are kept between markers, ours first.
+
+    Args:
+        base: The lines both versions started from.
+        ours: The lines with unsaved edits.
+        theirs: The lines on disk.
+    """
+    ours_rows = _matched_lines(base, ours)
+    theirs_rows = _matched_lines(base, theirs)
+    anchors = sorted(ours_rows.keys() & theirs_rows.keys())
+
+    result = MergeResult([])
+    lines = result.lines
+    base_row = ours_row = theirs_row = 0
+    for anchor in [*anchors, len(base)]:
+        if anchor < len(base):
+            ours_end, theirs_end = ours_rows[anchor], theirs_rows[anchor]
+        else:
+            ours_end, theirs_end = len(ours), len(theirs)
+        original = base[base_row:anchor]
+        mine = ours[ours_row:ours_end]
+        other = theirs[theirs_row:theirs_end]
+        if mine == original or mine == other:
+            lines.extend(other)
+        elif other == original:
+            lines.extend(mine)
+        else:
+            result.conflicts.append(len(lines))
+            lines.append(CONFLICT_START)
+            lines.extend(mine)
+            lines.append(CONFLICT_SEPARATOR)
+            lines.extend(other)
+            lines.append(CONFLICT_END)
+        if anchor < len(base):
+            lines.append(base[anchor])
+        base_row, ours_row, theirs_row = anchor + 1, ours_end + 1, theirs_end + 1
+    return result
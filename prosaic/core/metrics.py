@@ -4,7 +4,8 @@ import json
 from datetime import datetime
 from pathlib import Path
 
-from prosaic.utils import read_text, write_text
+from prosaic.core.writer import get_save_queue
+from prosaic.utils import read_text
 
 
 class MetricsTracker:
@@ -17,6 +18,7 @@ class MetricsTracker:
         self.metrics = self._load()
         self._session_start = datetime.now().isoformat()
         self._baseline_words = 0
+        self._writer = get_save_queue(workspace)
 
     def _load(self) -> dict:
         """Load metrics from file."""
@@ -35,9 +37,9 @@ class MetricsTracker:
         return default
 
     def _save(self) -> None:
-        """Save metrics to file."""
+        """Save metrics to file in the background."""
         self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
-        write_text(self.metrics_file, json.dumps(self.metrics, indent=2))
+        self._writer.submit(self.metrics_file, json.dumps(self.metrics, indent=2))
 
     def set_baseline(self, word_count: int) -> None:
         """Set baseline word count for current session."""
@@ -0,0 +1,133 @@
+"""Coalesced change pipeline for editor consumers."""
+
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+from functools import partial
+from time import monotonic
+from typing import Any
+
+from textual.message_pump import MessagePump
+
+
+@dataclass
+class Consumer:
+    """A named consumer of document changes."""
+
+    name: str
+    callback: Callable[..., None]
+    interval: float = 0.0
+    is_active: Callable[[], bool] | None = None
+    needs_text: bool = True
+    dirty: bool = False
+    last_run: float = float("-inf")
+    timer: Any = None
+
+
+class ChangePipeline:
+    """Batch document changes and fan them out to consumers at their own rates.
+
+    Changes notified within one frame are coalesced into a single flush after
+    the next refresh. Each consumer runs at most once per ``interval`` seconds,
+    with a trailing run so the final state is always delivered. Consumers whose
+    ``is_active`` returns False stay dirty and run when woken. The document
+    text is only read if a consumer that needs it runs.
+    """
+
+    def __init__(self, scheduler: MessagePump, get_text: Callable[[], str]) -> None:
+        self._scheduler = scheduler
+        self._get_text = get_text
+        self._consumers: dict[str, Consumer] = {}
+        self._scheduled = False
+
+    def add_consumer(
+        self,
+        name: str,
+        callback: Callable[..., None],
+        interval: float = 0.0,
+        is_active: Callable[[], bool] | None = None,
+        needs_text: bool = True,
+    ) -> None:
+        """Register a consumer, called with the document text when it runs.
+
+        Consumers registered with ``needs_text=False`` are called with no
+        arguments, e.g. ones kept current by edit deltas.
+        """
+        self._consumers[name] = Consumer(name, callback, interval, is_active, needs_text)
+
+    def set_consumer_interval(self, name: str, interval: float) -> None:
+        """Change how often a consumer may run."""
+        self._consumers[name].interval = interval
+
+    def notify(self) -> None:
+        """Mark every consumer dirty and schedule a flush for this frame."""
+        for consumer in self._consumers.values():
+            consumer.dirty = True
+        if not self._scheduled:
+            self._scheduled = True
+            self._scheduler.call_after_refresh(self._flush)
+
+    def run(self, force: bool = False) -> None:
+        """Run dirty, active consumers whose interval has elapsed.
+
+        Args:
+            force: Ignore intervals and run every dirty, active consumer now.
+        """
+        now = monotonic()
+        text: str | None = None
+        for consumer in self._consumers.values():
+            if not consumer.dirty or not self._is_active(consumer):
+                continue
+            wait = consumer.last_run + consumer.interval - now
+            if wait > 0 and not force:
+                if consumer.timer is None:
+                    consumer.timer = self._scheduler.set_timer(
+                        wait, partial(self._on_timer, consumer)
+                    )
+                continue
+            if text is None and consumer.needs_text:
+                text = self._get_text()
+            self._run_consumer(consumer, text, now)
+
+    def wake(self, name: str) -> None:
+        """Run a consumer now if it has pending changes, e.g. when its pane is shown."""
+        consumer = self._consumers[name]
+        if consumer.dirty and self._is_active(consumer):
+            text = self._get_text() if consumer.needs_text else None
+            self._run_consumer(consumer, text, monotonic())
+
+    def reset(self, clean: Collection[str] = ()) -> None:
+        """Mark consumers dirty and run them immediately, e.g. after a load.
+
+        Args:
+            clean: Consumers whose output is already current for the new
+                document, e.g. restored from a cache; these are not run.
+        """
+        for consumer in self._consumers.values():
+            consumer.dirty = consumer.name not in clean
+        self.run(force=True)
+
+    def is_dirty(self, name: str) -> bool:
+        """Check whether a consumer has changes it hasn't processed yet."""
+        return self._consumers[name].dirty
+
+    def _is_active(self, consumer: Consumer) -> bool:
+        return consumer.is_active is None or consumer.is_active()
+
+    def _run_consumer(self, consumer: Consumer, text: str | None, now: float) -> None:
+        if consumer.timer is not None:
+            consumer.timer.stop()
+            consumer.timer = None
+        consumer.dirty = False
+        consumer.last_run = now
+        if consumer.needs_text:
+            consumer.callback(text)
+        else:
+            consumer.callback()
+
+    def _flush(self) -> None:
+        self._scheduled = False
+        self.run()
+
+    def _on_timer(self, consumer: Consumer) -> None:
+        consumer.timer = None
+        self.run()
@@ -0,0 +1,209 @@
+"""Find and replace within lines of text, and across workspace files."""
+
+import os
+import re
+from collections.abc import Collection, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from prosaic.utils import read_text
+
+Match = tuple[int, int, int]
+"""A match as ``(row, start, end)``, with columns in characters."""
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """What to search for, and how.
+
+    Text is matched literally unless ``regex`` is set. Matches never span
+    lines, and empty matches (e.g. from ``a*``) are ignored.
+    """
+
+    text: str
+    ignore_case: bool = True
+    regex: bool = False
+
+    def compile(self) -> re.Pattern[str]:
+        """Compile the query.
+
+        Raises:
+            re.error: If the query is an invalid regular expression.
+        """
+        flags = re.IGNORECASE if self.ignore_case else 0
+        return re.compile(self.text if self.regex else re.escape(self.text), flags)
+
+    def expand(self, match: re.Match[str], replacement: str) -> str:
+        """Get the replacement for a match; regex queries expand group references.
+
+        Raises:
+            re.error: If the replacement refers to a group that doesn't exist.
+        """
+        return match.expand(replacement) if self.regex else replacement
+
+
+@dataclass
+class Replacement:
+    """The rows from ``first_row`` to ``last_row`` with every match replaced."""
+
+    first_row: int
+    last_row: int
+    lines: list[str]
+    count: int
+
+
+@dataclass
+class FileMatches:
+    """Matches in one file, with the text they were found in."""
+
+    path: Path
+    text: str
+    matches: list[Match]
+
+
+@dataclass
+class WorkspaceReplace:
+    """A replacement previewed across the workspace, ready to apply."""
+
+    query: SearchQuery
+    replacement: str
+    files: list[FileMatches]
+
+
+def find_in_lines(
+    pattern: re.Pattern[str],
+    lines: Sequence[str],
+    first: int = 0,
+    last: int | None = None,
+) -> list[Match]:
+    """Find every match in the rows from first up to last, in document order."""
+    matches = []
+    append = matches.append
+    for row, line in enumerate(lines[first:last], first):
+        for match in pattern.finditer(line):
+            start, end = match.span()
+            if end > start:
+                append((row, start, end))
+    return matches
+
+
+def replace_in_lines(
+    query: SearchQuery,
+    pattern: re.Pattern[str],
+    lines: Sequence[str],
+    replacement: str,
+) -> Replacement | None:
+    """Replace every match in the lines.
+
+    Returns:
+        The replaced rows, from the first with a match to the last, or None
+        if nothing matched.
+
+    Raises:
+        re.error: If a regex replacement refers to a missing group.
+    """
+    count = 0
+
+    def substitute(match: re.Match[str]) -> str:
+        nonlocal count
+        if match.end() == match.start():
+            return ""
+        count += 1
+        return query.expand(match, replacement)
+
+    first_row = None
+    last_row = 0
+    replaced: dict[int, str] = {}
+    for row, line in enumerate(lines):
+        if pattern.search(line) is None:
+            continue
+        before = count
+        new_line = pattern.sub(substitute, line)
+        if count == before:
+            continue
+        replaced[row] = new_line
+        if first_row is None:
+            first_row = row
+        last_row = row
+
+    if first_row is None:
+        return None
+    return Replacement(
+        first_row,
+        last_row,
+        [replaced.get(row, lines[row]) for row in range(first_row, last_row + 1)],
+        count,
+    )
+
+
+def replace_in_text(
+    query: SearchQuery,
+    pattern: re.Pattern[str],
+    text: str,
+    replacement: str,
+) -> tuple[str, int]:
+    """Replace every match in a text, line by line.
+
+    Returns:
+        The new text and the number of matches replaced.
+
+    Raises:
+        re.error: If a regex replacement refers to a missing group.
+    """
+    lines = text.split("\n")
+    result = replace_in_lines(query, pattern, lines, replacement)
+    if result is None:
+        return text, 0
+    lines[result.first_row : result.last_row + 1] = result.lines
+    return "\n".join(lines), result.count
+
+
+def workspace_files(root: Path, hidden: Collection[str] = ()) -> list[Path]:
+    """List the markdown files under root, in path order.
+
+    Names in hidden, and names starting with a dot, are skipped at any
+    depth, directories included.
+    """
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            name for name in dirnames if name not in hidden and not name.startswith(".")
+        )
+        files.extend(
+            Path(directory) / name
+            for name in sorted(filenames)
+            if name.endswith(".md") and name not in hidden and not name.startswith(".")
+        )
+    return files
+
+
+def scan_files(
+    pattern: re.Pattern[str],
+    paths: Sequence[Path],
+    open_texts: Mapping[Path, str] | None = None,
+    max_workers: int = 8,
+) -> list[FileMatches]:
+    """Search files in parallel, returning those with matches in path order.
+
+    Args:
+        pattern: Compiled query.
+        paths: Files to search; unreadable ones are skipped.
+        open_texts: Text to search instead of the file on disk, e.g. for
+            documents with unsaved edits.
+        max_workers: Files read and searched at once.
+    """
+    open_texts = open_texts or {}
+
+    def scan(path: Path) -> FileMatches | None:
+        text = open_texts.get(path)
+        if text is None:
+            try:
+                text = read_text(path)
+            except (OSError, UnicodeDecodeError):
+                return None
+        matches = find_in_lines(pattern, text.split("\n"))
+        return FileMatches(path, text, matches) if matches else None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [found for found in executor.map(scan, paths) if found is not None]
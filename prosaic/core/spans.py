@@ -0,0 +1,185 @@
+"""Compact storage for per-row highlight spans."""
+
+import base64
+import binascii
+from array import array
+from collections.abc import Iterator
+
+_OPEN_END = 0xFFFFFFFF
+
+_style_ids: dict[str, int] = {}
+_style_names: list[str] = []
+
+
+def intern_style(name: str) -> int:
+    """Get the integer id for a highlight style name, registering it if new."""
+    style_id = _style_ids.get(name)
+    if style_id is None:
+        style_id = len(_style_names)
+        _style_ids[name] = style_id
+        _style_names.append(name)
+    return style_id
+
+
+def style_name(style_id: int) -> str:
+    """Get the highlight style name for an interned id."""
+    return _style_names[style_id]
+
+
+class SpanRow:
+    """View of one row in a SpanStore.
+
+    Iterates as ``(start, end, style_name)`` tuples and supports ``append``,
+    which is all Textual's TextArea needs from a row of ``_highlights``.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "SpanStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    def append(self, span: tuple[int, int | None, str]) -> None:
+        start, end, name = span
+        self._store.add(self._row, start, end, intern_style(name))
+
+    def __iter__(self) -> Iterator[tuple[int, int | None, str]]:
+        return self._store.spans(self._row)
+
+    def __len__(self) -> int:
+        packed = self._store._rows.get(self._row)
+        return len(packed) // 3 if packed is not None else 0
+
+
+class SpanStore:
+    """Highlight spans keyed by row, packed into one integer array per row.
+
+    Each row holds ``start, end, style_id`` triples. Style names are interned
+    to small integers, and an open end (highlight to end of line) is stored
+    as a sentinel and read back as ``None``.
+    """
+
+    __slots__ = ("_rows",)
+
+    def __init__(self) -> None:
+        self._rows: dict[int, array] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, row: int) -> bool:
+        return row in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._rows)
+
+    def __getitem__(self, row: int) -> SpanRow:
+        return SpanRow(self, row)
+
+    def add(self, row: int, start: int, end: int | None, style_id: int) -> None:
+        """Add a span to a row."""
+        packed = self._rows.get(row)
+        if packed is None:
+            packed = self._rows[row] = array("I")
+        packed.append(start)
+        packed.append(_OPEN_END if end is None else end)
+        packed.append(style_id)
+
+    def spans(self, row: int) -> Iterator[tuple[int, int | None, str]]:
+        """Iterate the spans of a row as ``(start, end, style_name)``."""
+        packed = self._rows.get(row)
+        if packed is None:
+            return
+        names = _style_names
+        for i in range(0, len(packed), 3):
+            end = packed[i + 1]
+            yield packed[i], None if end == _OPEN_END else end, names[packed[i + 2]]
+
+    def get_packed(self, row: int) -> array | None:
+        """Get the raw packed triples for a row."""
+        return self._rows.get(row)
+
+    def set_packed(self, row: int, packed: array) -> None:
+        """Replace a row with raw packed triples; an empty array removes it."""
+        if packed:
+            self._rows[row] = packed
+        else:
+            self._rows.pop(row, None)
+
+    def delete_row(self, row: int) -> None:
+        """Remove all spans on a row."""
+        self._rows.pop(row, None)
+
+    def merge(self, other: "SpanStore") -> None:
+        """Append every span from another store."""
+        rows = self._rows
+        for row, packed in other._rows.items():
+            existing = rows.get(row)
+            if existing is None:
+                rows[row] = array("I", packed)
+            else:
+                existing.extend(packed)
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+    def to_dict(self) -> dict:
+        """Serialize for storing on disk, as base64 of the packed arrays.
+
+        Style ids are only stable within one process, so the interned names
+        are stored alongside and mapped back to local ids on load.
+        """
+        data = array("I")
+        for packed in self._rows.values():
+            data.extend(packed)
+        return {
+            "styles": list(_style_names),
+            "rows": _encode(array("I", self._rows)),
+            "lengths": _encode(array("I", map(len, self._rows.values()))),
+            "spans": _encode(data),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SpanStore":
+        """Rebuild a store serialized with to_dict.
+
+        Raises:
+            ValueError: If the data is malformed.
+        """
+        try:
+            local = [intern_style(name) for name in data["styles"]]
+            rows = _decode(data["rows"])
+            lengths = _decode(data["lengths"])
+            spans = _decode(data["spans"])
+        except (KeyError, TypeError, binascii.Error) as error:
+            raise ValueError(f"invalid span data: {error}") from error
+        if len(rows) != len(lengths) or sum(lengths) != len(spans) or len(spans) % 3:
+            raise ValueError("invalid span data: lengths do not match")
+        if local != list(range(len(local))):
+            try:
+                spans[2::3] = array("I", map(local.__getitem__, spans[2::3]))
+            except IndexError as error:
+                raise ValueError("invalid span data: unknown style") from error
+
+        store = cls()
+        offset = 0
+        for row, length in zip(rows, lengths):
+            store._rows[row] = spans[offset : offset + length]
+            offset += length
+        return store
+
+
+def _encode(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(text: str) -> array:
+    values = array("I")
+    raw = base64.b64decode(text, validate=True)
+    if len(raw) % values.itemsize:
+        raise binascii.Error("truncated array")
+    values.frombytes(raw)
+    return values
@@ -0,0 +1,484 @@
+"""Undo history kept within a memory budget, and persisted between sessions."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from array import array
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from textual.document._document import EditResult
+from textual.document._edit import Edit
+from textual.document._history import EditHistory
+from textual.widgets.text_area import Selection
+
+from prosaic.core.writer import SaveQueue
+
+UNDO_VERSION = 1
+
+_EDIT_OVERHEAD = 600
+"""Approximate bytes held by an Edit besides its text: the object, its
+locations, selections and result."""
+
+
+def edit_size(edit: Edit) -> int:
+    """Approximate memory held by a recorded edit, in bytes."""
+    result = edit._edit_result
+    replaced = len(result.replaced_text) if result is not None else 0
+    return _EDIT_OVERHEAD + len(edit.text) + replaced
+
+
+def encode_batch(batch: list[Edit]) -> str:
+    """Serialize a batch of performed edits as one JSON line.
+
+    Each edit is ``[text, from_row, from_col, to_row, to_col, maintain,
+    selection, end_row, end_col, replaced_text]``, where selection is the
+    selection before the edit as ``[start_row, start_col, end_row, end_col]``
+    or None.
+    """
+    encoded = []
+    for edit in batch:
+        result = edit._edit_result
+        selection = edit._original_selection
+        encoded.append(
+            [
+                edit.text,
+                *edit.from_location,
+                *edit.to_location,
+                int(edit.maintain_selection_offset),
+                [*selection.start, *selection.end] if selection is not None else None,
+                *result.end_location,
+                result.replaced_text,
+            ]
+        )
+    return json.dumps(encoded, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def decode_batch(line: str) -> list[Edit]:
+    """Rebuild a batch serialized with encode_batch.
+
+    Raises:
+        ValueError: If the line is not a valid batch.
+    """
+    try:
+        batch = []
+        for (
+            text,
+            from_row,
+            from_col,
+            to_row,
+            to_col,
+            maintain,
+            selection,
+            end_row,
+            end_col,
+            replaced_text,
+        ) in json.loads(line):
+            edit = Edit(text, (from_row, from_col), (to_row, to_col), bool(maintain))
+            if selection is not None:
+                start_row, start_col, sel_end_row, sel_end_col = selection
+                edit._original_selection = Selection(
+                    (start_row, start_col), (sel_end_row, sel_end_col)
+                )
+            edit._edit_result = EditResult((end_row, end_col), replaced_text)
+            batch.append(edit)
+    except (json.JSONDecodeError, TypeError, ValueError) as error:
+        raise ValueError(f"invalid undo batch: {error}") from error
+    return batch
+
+
+def remove_stale_spills(directory: Path, max_age: float = 24 * 60 * 60) -> int:
+    """Delete spill files left behind by a crash.
+
+    Spill files are normally deleted with their history, so any not touched
+    for ``max_age`` seconds belong to a session that is no longer running.
+
+    Returns:
+        The number of files deleted.
+    """
+    cutoff = time.time() - max_age
+    deleted = 0
+    try:
+        for path in directory.glob("*.spill"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+            except OSError:
+                continue
+    except OSError:
+        pass
+    return deleted
+
+
+def _close_spill(file: BinaryIO, path: Path) -> None:
+    file.close()
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+@dataclass
+class SpillingEditHistory(EditHistory):
+    """EditHistory whose memory use stays within a budget.
+
+    When the batches in memory grow past ``max_bytes``, the oldest are
+    appended to a spill file in ``spill_dir`` (one JSON line per batch) and
+    dropped from memory. Undoing past the last batch in memory pages the
+    most recent spilled batches back in. Without a ``spill_dir`` the oldest
+    batches are discarded instead. ``max_checkpoints`` caps the total undo
+    depth, in memory and on disk.
+
+    History from an earlier session can be attached with ``set_older``; it
+    is only read once undo runs out of newer batches, or when the history is
+    exported.
+
+    The spill file is deleted when the history is cleared or collected.
+    """
+
+    max_bytes: int = 4 * 1024 * 1024
+    spill_dir: Path | None = None
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._undo_stack: deque[list[Edit]] = deque()
+        self._undo_sizes: deque[int] = deque()
+        self._redo_sizes: deque[int] = deque()
+        self._memory = 0
+        self._spill_file: BinaryIO | None = None
+        self._spill_offsets = array("Q")
+        """Start offset of each spilled batch, oldest first."""
+        self._spill_finalizer: weakref.finalize | None = None
+        self._older: Callable[[], list[str] | None] | None = None
+        self._changed = False
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the batches in memory."""
+        return self._memory
+
+    @property
+    def spilled(self) -> int:
+        """Number of batches spilled to disk."""
+        return len(self._spill_offsets)
+
+    @property
+    def changed(self) -> bool:
+        """Whether the history changed since it was cleared or last exported."""
+        return self._changed
+
+    def set_older(self, loader: Callable[[], list[str] | None]) -> None:
+        """Attach history from before the oldest batch, to be loaded on demand.
+
+        Args:
+            loader: Returns the older batches encoded with encode_batch,
+                oldest first, or None if there are none.
+        """
+        self._older = loader
+
+    def export(self) -> str:
+        """Encode the whole history as JSON lines, oldest batch first.
+
+        Loads any attached older history first, and resets ``changed``.
+        """
+        self._load_older()
+        self._changed = False
+        parts = []
+        file = self._spill_file
+        if file is not None and self._spill_offsets:
+            try:
+                file.seek(self._spill_offsets[0])
+                parts.append(file.read().decode("utf-8"))
+            except (OSError, UnicodeDecodeError):
+                # Only the newer batches in memory can still be undone in order.
+                pass
+        parts.extend(map(encode_batch, self._undo_stack))
+        return "".join(parts)
+
+    def record(self, edit: Edit) -> None:
+        undo_stack = self._undo_stack
+        depth = len(undo_stack)
+        batch_length = len(undo_stack[-1]) if undo_stack else 0
+        redo_memory = sum(self._redo_sizes)
+        super().record(edit)
+        if len(undo_stack) > depth:
+            size = edit_size(edit)
+            self._undo_sizes.append(size)
+        elif undo_stack and len(undo_stack[-1]) > batch_length:
+            size = edit_size(edit)
+            self._undo_sizes[-1] += size
+        else:
+            return
+        self._redo_sizes.clear()
+        self._memory += size - redo_memory
+        self._changed = True
+        self._enforce_limits()
+
+    def _pop_undo(self) -> list[Edit] | None:
+        if not self._undo_stack:
+            if not self._spill_offsets:
+                self._load_older()
+            if self._spill_offsets:
+                self._page_in()
+        batch = super()._pop_undo()
+        if batch is not None:
+            self._redo_sizes.append(self._undo_sizes.pop())
+            self._changed = True
+        return batch
+
+    def _pop_redo(self) -> list[Edit] | None:
+        batch = super()._pop_redo()
+        if batch is not None:
+            self._undo_sizes.append(self._redo_sizes.pop())
+            self._changed = True
+        return batch
+
+    def clear(self) -> None:
+        super().clear()
+        self._undo_sizes.clear()
+        self._redo_sizes.clear()
+        self._memory = 0
+        self._older = None
+        self._changed = False
+        self._drop_spill()
+
+    def _load_older(self) -> None:
+        """Put the attached older history beneath everything recorded since."""
+        loader, self._older = self._older, None
+        if loader is None:
+            return
+        room = self.max_checkpoints - len(self._undo_stack) - len(self._spill_offsets)
+        lines = loader() if room > 0 else None
+        if not lines:
+            return
+        lines = lines[-room:]
+        if self._prepend_spill(lines):
+            return
+
+        # Nowhere to spill: keep what fits in memory, newest first.
+        undo_stack = self._undo_stack
+        for line in reversed(lines):
+            try:
+                batch = decode_batch(line)
+            except ValueError:
+                break
+            size = sum(edit_size(edit) for edit in batch)
+            if self._memory + size > self.max_bytes:
+                break
+            undo_stack.appendleft(batch)
+            self._undo_sizes.appendleft(size)
+            self._memory += size
+
+    def _enforce_limits(self) -> None:
+        """Spill or discard the oldest batches until within budget."""
+        undo_stack = self._undo_stack
+        sizes = self._undo_sizes
+        if self._memory > self.max_bytes and len(undo_stack) > 1:
+            # Spill down to three quarters of the budget so that typing at
+            # the limit doesn't write on every keystroke.
+            target = self.max_bytes * 3 // 4
+            spill = []
+            while self._memory > target and len(undo_stack) > 1:
+                spill.append(undo_stack.popleft())
+                self._memory -= sizes.popleft()
+            self._spill(spill)
+
+        excess = len(undo_stack) + len(self._spill_offsets) - self.max_checkpoints
+        if excess > 0:
+            # Forget the oldest spilled batches; their bytes stay in the file
+            # until it is next truncated.
+            dropped = min(excess, len(self._spill_offsets))
+            del self._spill_offsets[:dropped]
+            for _ in range(excess - dropped):
+                undo_stack.popleft()
+                self._memory -= sizes.popleft()
+
+    def _spill(self, batches: list[list[Edit]]) -> None:
+        file = self._open_spill()
+        if file is None:
+            return
+        offsets = self._spill_offsets
+        file.seek(0, os.SEEK_END)
+        try:
+            for batch in batches:
+                offsets.append(file.tell())
+                file.write(encode_batch(batch).encode("utf-8"))
+            file.flush()
+        except OSError:
+            # Keep what was written; the rest of these batches are lost.
+            try:
+                file.truncate(offsets.pop())
+            except OSError:
+                pass
+
+    def _prepend_spill(self, lines: list[str]) -> bool:
+        """Write encoded batches to a new spill file, before any spilled ones.
+
+        Returns:
+            False if there is nowhere to spill to.
+        """
+        old_file, old_offsets = self._spill_file, self._spill_offsets
+        old_finalizer = self._spill_finalizer
+        self._spill_file = self._spill_finalizer = None
+        self._spill_offsets = offsets = array("Q")
+        file = self._open_spill()
+        try:
+            if file is None:
+                raise OSError("no spill directory")
+            for line in lines:
+                offsets.append(file.tell())
+                file.write(line.rstrip("\n").encode("utf-8") + b"\n")
+            if old_file is not None and old_offsets:
+                shift = file.tell() - old_offsets[0]
+                old_file.seek(old_offsets[0])
+                shutil.copyfileobj(old_file, file)
+                offsets.extend(offset + shift for offset in old_offsets)
+            file.flush()
+        except OSError:
+            if self._spill_finalizer is not None:
+                self._spill_finalizer()
+            self._spill_file, self._spill_offsets = old_file, old_offsets
+            self._spill_finalizer = old_finalizer
+            return False
+        if old_finalizer is not None:
+            old_finalizer()
+        return True
+
+    def _page_in(self) -> None:
+        """Load the most recent spilled batches back into memory."""
+        file = self._spill_file
+        offsets = self._spill_offsets
+        if file is None or not offsets:
+            return
+        target = self.max_bytes // 2
+        loaded: list[tuple[list[Edit], int]] = []
+        memory = 0
+        end = None
+        try:
+            file.seek(0, os.SEEK_END)
+            end = file.tell()
+            while offsets and (not loaded or memory < target):
+                start = offsets[-1]
+                file.seek(start)
+                batch = decode_batch(file.read(end - start).decode("utf-8"))
+                size = sum(edit_size(edit) for edit in batch)
+                loaded.append((batch, size))
+                memory += size
+                offsets.pop()
+                end = start
+        except (OSError, ValueError, UnicodeDecodeError):
+            # An unreadable spill can't be undone past; drop the rest of it.
+            offsets.clear()
+        for batch, size in reversed(loaded):
+            self._undo_stack.append(batch)
+            self._undo_sizes.append(size)
+        self._memory += memory
+        try:
+            if end is not None and offsets:
+                file.truncate(end)
+            else:
+                self._drop_spill()
+        except OSError:
+            pass
+
+    def _open_spill(self) -> BinaryIO | None:
+        if self._spill_file is not None:
+            return self._spill_file
+        if self.spill_dir is None:
+            return None
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            fd, name = tempfile.mkstemp(dir=self.spill_dir, suffix=".spill")
+        except OSError:
+            return None
+        file = os.fdopen(fd, "w+b")
+        self._spill_file = file
+        self._spill_finalizer = weakref.finalize(self, _close_spill, file, Path(name))
+        return file
+
+    def _drop_spill(self) -> None:
+        self._spill_offsets = array("Q")
+        if self._spill_finalizer is not None:
+            self._spill_finalizer()
+            self._spill_finalizer = None
+            self._spill_file = None
+
+
+class UndoStore:
+    """Undo histories keyed by file path, valid only for matching content.
+
+    Each file gets one log: a JSON header with the file path and the hash of
+    its text, then one encode_batch line per undo step, oldest first. A log
+    whose hash no longer matches the file is ignored and overwritten the
+    next time the file's history is stored. ``prune`` deletes the least
+    recently written logs once the directory exceeds its size budget.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        writer: SaveQueue,
+        max_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._writer = writer
+
+    def entry_path(self, source: Path) -> Path:
+        """Get the undo log file for a document."""
+        digest = hashlib.blake2b(str(source).encode("utf-8"), digest_size=8).hexdigest()
+        return self.directory / f"{source.stem}-{digest}.undo"
+
+    def read(self, source: Path, content_hash: str) -> list[str] | None:
+        """Read the undo steps stored for a document.
+
+        Returns:
+            The encoded batches, oldest first, or None if there are none for
+            this exact content.
+        """
+        try:
+            text = self.entry_path(source).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        header, _, body = text.partition("\n")
+        try:
+            data = json.loads(header)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get("version") != UNDO_VERSION or data.get("hash") != content_hash:
+            return None
+        # Not splitlines: JSON escapes newlines, but not other line breaks.
+        return body.split("\n")[:-1]
+
+    def put(self, source: Path, content_hash: str, history: str) -> None:
+        """Queue an undo log to be written, replacing any older one.
+
+        Args:
+            source: The document.
+            content_hash: Hash of the text the newest undo step leads to.
+            history: Batches as exported from SpillingEditHistory.
+        """
+        header = json.dumps(
+            {"version": UNDO_VERSION, "file": str(source), "hash": content_hash},
+            ensure_ascii=False,
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writer.submit(self.entry_path(source), f"{header}\n{history}")
+
+    def prune(self) -> int:
+        """Delete the oldest logs until the store fits its size budget.
+
+        Returns:
+            The number of logs deleted.
+        """
+        return self._writer.prune(self.directory, "*.undo", self.max_bytes)
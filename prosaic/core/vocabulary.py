@@ -0,0 +1,160 @@
+"""Workspace vocabulary, with word frequencies for prefix completion."""
+
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+
+from prosaic.core.analyzers import Analyzer, ChangedRows
+from prosaic.utils import read_text
+
+MIN_WORD_LENGTH = 6
+"""Shorter words are quicker to type than to complete, so they aren't kept."""
+
+MIN_PREFIX_LENGTH = 3
+"""Characters typed before a completion is offered."""
+
+_WORD = re.compile(r"[^\W\d_]+(?:['’-][^\W\d_]+)*")
+
+
+def completable_words(text: str) -> list[str]:
+    """Get the words long enough to complete in a text, in order."""
+    return [word for word in _WORD.findall(text) if len(word) >= MIN_WORD_LENGTH]
+
+
+def word_counts(text: str) -> Counter[str]:
+    """Count the words long enough to complete in a text."""
+    return Counter(completable_words(text))
+
+
+_BEST_CACHE_SIZE = 4096
+"""Prefixes whose best completion is remembered before the cache is cleared."""
+
+
+class Vocabulary:
+    """Word frequencies, with the words kept sorted for prefix lookups.
+
+    The words starting with a prefix are one run of the sorted list, found
+    by bisection, and the most frequent of them is cached per prefix until
+    a word with that prefix changes. Each word costs a string in the list
+    and an entry in the count dict, roughly 150 bytes. Matching is
+    case-sensitive, so names keep their capitals.
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[str, int] = {}
+        self._words: list[str] = []
+        self._best: dict[str, str | None] = {}
+
+    def count(self, word: str) -> int:
+        """Get how often a word occurs."""
+        return self._counts.get(word, 0)
+
+    def complete(self, prefix: str) -> str | None:
+        """Get the most frequent word that is longer than and starts with prefix.
+
+        Ties go to the word that sorts first.
+        """
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return None
+        try:
+            return self._best[prefix]
+        except KeyError:
+            pass
+        words = self._words
+        start = bisect_left(words, prefix)
+        if start < len(words) and words[start] == prefix:
+            start += 1
+        end = bisect_left(words, prefix + "\U0010ffff", start)
+        best = max(words[start:end], key=self._counts.__getitem__, default=None)
+        if len(self._best) >= _BEST_CACHE_SIZE:
+            self._best.clear()
+        self._best[prefix] = best
+        return best
+
+    def add(self, word: str, count: int = 1) -> None:
+        """Count more occurrences of a word."""
+        if word not in self._counts:
+            insort(self._words, word)
+            self._counts[word] = 0
+        self._counts[word] += count
+        self._forget(word)
+
+    def remove(self, word: str, count: int = 1) -> None:
+        """Count fewer occurrences of a word, e.g. after it was deleted."""
+        current = self._counts.get(word)
+        if current is None:
+            return
+        if current > count:
+            self._counts[word] = current - count
+        else:
+            del self._counts[word]
+            del self._words[bisect_left(self._words, word)]
+        self._forget(word)
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        """Apply count changes, positive or negative, from e.g. a Counter difference."""
+        added = []
+        for word, count in counts.items():
+            if count < 0:
+                self.remove(word, -count)
+            elif count > 0:
+                if word not in self._counts:
+                    added.append(word)
+                    self._counts[word] = 0
+                self._counts[word] += count
+                self._forget(word)
+        if added:
+            # Sorting once is cheaper than inserting each word, e.g. when
+            # building from the whole workspace.
+            self._words.extend(added)
+            self._words.sort()
+
+    def _forget(self, word: str) -> None:
+        """Drop the cached completions of the prefixes a word changed."""
+        best = self._best
+        if best:
+            for end in range(MIN_PREFIX_LENGTH, len(word)):
+                best.pop(word[:end], None)
+
+
+def build_vocabulary(paths: Iterable[Path]) -> Vocabulary:
+    """Count the words in files; unreadable ones are skipped."""
+    counts: Counter[str] = Counter()
+    for path in paths:
+        try:
+            counts.update(word_counts(read_text(path)))
+        except (OSError, UnicodeDecodeError):
+            continue
+    vocabulary = Vocabulary()
+    vocabulary.update(counts)
+    return vocabulary
+
+
+class VocabularyAnalyzer(Analyzer):
+    """Keep a vocabulary current with the words typed into and deleted from a document.
+
+    Rebuilding only records each row's words: a document opened from the
+    workspace is already counted, so only edits change the vocabulary.
+    """
+
+    def __init__(self, vocabulary: Vocabulary) -> None:
+        super().__init__()
+        self.vocabulary = vocabulary
+        self._rows: list[tuple[str, ...]] = []
+
+    def rebuild(self, lines: Sequence[str]) -> None:
+        self._rows = [tuple(completable_words(line)) for line in lines]
+
+    def update(self, change: ChangedRows, lines: Sequence[str]) -> None:
+        rows = [
+            tuple(completable_words(line)) for line in lines[change.first : change.new_end]
+        ]
+        counts: Counter[str] = Counter()
+        for row in rows:
+            counts.update(row)
+        for row in self._rows[change.first : change.old_end]:
+            counts.subtract(row)
+        self._rows[change.first : change.old_end] = rows
+        self.vocabulary.update(counts)
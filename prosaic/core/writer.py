@@ -0,0 +1,200 @@
+"""Serialized, atomic file writes on a background thread."""
+
+import atexit
+import threading
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from prosaic.utils import write_text_atomic
+
+SaveCallback = Callable[[Exception | None], None]
+BatchCallback = Callable[[dict[Path, Exception]], None]
+
+
+class SaveQueue:
+    """Write files one at a time on a background thread.
+
+    Each write goes to a temporary file which then replaces the target, so a
+    crash never leaves a half-written file. A save submitted while an earlier
+    one for the same path is still queued replaces it; both callbacks run
+    once the newer content is on disk.
+    """
+
+    def __init__(self, fsync: bool = True) -> None:
+        self.fsync = fsync
+        self._pending: dict[Path, tuple[str, list[SaveCallback]]] = {}
+        self._busy = False
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def submit(
+        self,
+        path: Path,
+        content: str,
+        on_done: SaveCallback | None = None,
+    ) -> None:
+        """Queue content to be written to path.
+
+        Args:
+            path: File to write.
+            content: Full file contents.
+            on_done: Called on the writer thread with None, or the error
+                if the write failed.
+        """
+        with self._condition:
+            _, callbacks = self._pending.get(path, ("", []))
+            if on_done is not None:
+                callbacks.append(on_done)
+            self._pending[path] = (content, callbacks)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="prosaic-writer", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def submit_batch(
+        self,
+        files: dict[Path, str],
+        on_done: BatchCallback | None = None,
+    ) -> None:
+        """Queue several files at once, with one callback for the whole batch.
+
+        Each file is still written atomically on its own.
+
+        Args:
+            files: Full contents to write, by path.
+            on_done: Called on the writer thread once every file is written,
+                with the errors by path; empty if all writes succeeded.
+        """
+        errors: dict[Path, Exception] = {}
+        remaining = len(files)
+
+        def done(path: Path, error: Exception | None) -> None:
+            nonlocal remaining
+            if error is not None:
+                errors[path] = error
+            remaining -= 1
+            if remaining == 0 and on_done is not None:
+                on_done(errors)
+
+        if not files:
+            if on_done is not None:
+                on_done(errors)
+            return
+        with self._condition:
+            for path, content in files.items():
+                self.submit(path, content, partial(done, path))
+
+    def pending(self, path: Path) -> bool:
+        """Check whether a write to path is queued."""
+        with self._condition:
+            return path in self._pending
+
+    def prune(self, directory: Path, pattern: str, max_bytes: int) -> int:
+        """Delete the oldest files in a directory until it fits a size budget.
+
+        Files matching pattern are deleted least recently written first;
+        files with a write still queued are kept.
+
+        Returns:
+            The number of files deleted.
+        """
+        entries = []
+        total = 0
+        try:
+            for path in directory.glob(pattern):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+        except OSError:
+            return 0
+
+        deleted = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            if self.pending(path):
+                continue
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            total -= size
+            deleted += 1
+        return deleted
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait for every queued write to finish.
+
+        Returns:
+            True if the queue drained, False on timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                path = next(iter(self._pending))
+                content, callbacks = self._pending.pop(path)
+                self._busy = True
+                fsync = self.fsync
+
+            # Any failure, e.g. text that can't be encoded, is reported to
+            # the callbacks; one bad write must not stop the queue.
+            error: Exception | None = None
+            try:
+                try:
+                    write_text_atomic(path, content, fsync=fsync)
+                except Exception as exc:
+                    error = exc
+                for callback in callbacks:
+                    try:
+                        callback(error)
+                    except Exception:
+                        pass
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+
+_queues: dict[Path, SaveQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_save_queue(workspace: Path, fsync: bool | None = None) -> SaveQueue:
+    """Get the save queue for a workspace, creating it on first use.
+
+    Args:
+        workspace: Workspace directory the queue serves.
+        fsync: If given, whether writes are flushed to disk before replacing.
+    """
+    key = workspace.expanduser().resolve()
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None:
+            queue = _queues[key] = SaveQueue()
+    if fsync is not None:
+        queue.fsync = fsync
+    return queue
+
+
+def flush_all(timeout: float | None = None) -> None:
+    """Wait for every workspace's queued writes, e.g. before exiting."""
+    with _queues_lock:
+        queues = list(_queues.values())
+    for queue in queues:
+        queue.flush(timeout)
+
+
+atexit.register(flush_all)
@@ -9,9 +9,8 @@ from textual.screen import Screen
 from textual.widgets import Static
 
 from prosaic.app import FileFindModal, HelpScreen, NewBookModal, NewPieceModal, StartWritingModal
-from prosaic.config import get_active_profile, get_last_file, set_last_file
+from prosaic.config import get_active_profile, get_last_file
 from prosaic.core.metrics import MetricsTracker
-from prosaic.screens.editor import EditorScreen
 from prosaic.screens.profiles import ProfilesScreen
 
 QUOTE = (
@@ -131,38 +130,17 @@ class DashboardScreen(Screen, inherit_bindings=False):
         self.app.push_screen(StartWritingModal(), callback=self._make_open_callback(show_all_panes=True))
 
     def action_add_note(self) -> None:
-        self.app.push_screen(
-            EditorScreen(
-                self.metrics,
-                initial_file=self.app.notes_path,
-                light_mode=self.app.light_mode,
-                add_note=True,
-            )
-        )
+        self.app._open_editor(self.app.notes_path, add_note=True)
 
     def action_read_notes(self) -> None:
-        self.app.push_screen(
-            EditorScreen(
-                self.metrics,
-                initial_file=self.app.notes_path,
-                light_mode=self.app.light_mode,
-                reader_mode_initial=True,
-            )
-        )
+        self.app._open_editor(self.app.notes_path, reader_mode=True)
 
     def action_find_piece(self) -> None:
         self.app.push_screen(FileFindModal(), callback=self._handle_find_result)
 
     def _handle_find_result(self, result: Path | None) -> None:
         if result:
-            set_last_file(result)
-            self.app.push_screen(
-                EditorScreen(
-                    self.metrics,
-                    initial_file=result,
-                    light_mode=self.app.light_mode,
-                )
-            )
+            self.app._open_editor(result)
 
     def action_manage_profiles(self) -> None:
         self.app.push_screen(ProfilesScreen())
@@ -1,22 +1,82 @@
 """Editor screen."""
 
 import asyncio
+from collections import Counter
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
+from textual import work
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
+from textual.message import Message
 from textual.reactive import reactive
 from textual.screen import Screen
 from textual.widgets import Static, TextArea
+from textual.widgets.text_area import Selection
+from textual.worker import get_current_worker
 
-from prosaic.app import HelpScreen
-from prosaic.config import get_books_dir, get_workspace_dir
+from prosaic.app import (
+    HeadingJumpModal,
+    HelpScreen,
+    RecoverJournalModal,
+    WorkspaceReplaceModal,
+)
+from prosaic.config import (
+    get_analysis_cache_bytes,
+    get_analysis_dir,
+    get_books_dir,
+    get_buffer_cache_bytes,
+    get_journal_dir,
+    get_large_file_limits,
+    get_save_fsync,
+    get_undo_dir,
+    get_undo_history_bytes,
+    get_undo_memory_bytes,
+    get_workspace_dir,
+)
 from prosaic.core import count_characters, count_words
+from prosaic.core.analysis import Analysis, AnalysisCache
+from prosaic.core.analyzers import CountAnalyzer, EditBus, EditDelta, HeadingAnalyzer
+from prosaic.core.autosave import AutosaveScheduler
+from prosaic.core.buffers import Buffer, BufferCache
+from prosaic.core.fuzzy import HeadingIndex
+from prosaic.core.markdown import HeadingArray
+from prosaic.core.journal import (
+    EditJournal,
+    journal_path,
+    read_journal,
+    recoverable,
+    replay,
+    set_aside,
+)
+from prosaic.core.merge import merge3
 from prosaic.core.metrics import MetricsTracker
-from prosaic.utils import read_text, write_text
-from prosaic.widgets import FileTree, OutlinePanel, SpellCheckTextArea, StatusBar
+from prosaic.core.pipeline import ChangePipeline
+from prosaic.core.search import (
+    FileMatches,
+    WorkspaceReplace,
+    replace_in_text,
+    workspace_files,
+)
+from prosaic.core.undo import SpillingEditHistory, UndoStore, remove_stale_spills
+from prosaic.core.vocabulary import (
+    Vocabulary,
+    VocabularyAnalyzer,
+    build_vocabulary,
+    word_counts,
+)
+from prosaic.core.writer import get_save_queue
+from prosaic.utils import content_hash, file_signature, iter_text, read_text
+from prosaic.widgets import FileTree, FindBar, OutlinePanel, SpellCheckTextArea, StatusBar
+from prosaic.widgets.file_tree import FilteredDirectoryTree
+
+_UNDO_CHECKPOINTS = 10_000
+"""Undo depth per document; memory is bounded separately by spilling."""
+
+_DISK_POLL_INTERVAL = 2.0
+"""Seconds between checks for changes made to the open file outside Prosaic."""
 
 
 class EditorScreen(Screen, inherit_bindings=False):
@@ -29,6 +89,12 @@ class EditorScreen(Screen, inherit_bindings=False):
         Binding("ctrl+e", "toggle_tree", "tree", priority=True),
         Binding("ctrl+s", "save", "save", priority=True),
         Binding("ctrl+o", "toggle_outline", "outline"),
+        Binding("f2", "jump_to_heading", "go to heading"),
+        Binding("ctrl+g", "find", "find"),
+        Binding("ctrl+r", "replace", "replace"),
+        Binding("f3", "find_next", "next match", show=False),
+        Binding("shift+f3", "find_previous", "previous match", show=False),
+        Binding("f4", "replace_in_workspace", "replace in workspace"),
         Binding("f5", "toggle_focus", "focus mode"),
         Binding("f6", "toggle_reader", "reader mode"),
         Binding("f1", "show_help", "help"),
@@ -40,6 +106,45 @@ class EditorScreen(Screen, inherit_bindings=False):
     reader_mode: reactive[bool] = reactive(False)
     current_file: reactive[Path | None] = reactive(None)
     modified: reactive[bool] = reactive(False)
+    large_file: reactive[bool] = reactive(False)
+
+    class Saved(Message):
+        """Posted from the writer thread when a queued save finishes."""
+
+        def __init__(
+            self,
+            path: Path,
+            error: Exception | None,
+            autosave: bool,
+            silent: bool,
+            digest: str,
+            journal_mark: int | None,
+        ) -> None:
+            self.path = path
+            self.error = error
+            self.autosave = autosave
+            self.silent = silent
+            self.digest = digest
+            self.journal_mark = journal_mark
+            super().__init__()
+
+    class ReplacedInWorkspace(Message):
+        """Posted from the writer thread when a workspace replace is written."""
+
+        def __init__(
+            self,
+            count: int,
+            files: int,
+            errors: dict[Path, Exception],
+            skipped: list[Path],
+            vocabulary: dict[Path, Counter[str]],
+        ) -> None:
+            self.count = count
+            self.files = files
+            self.errors = errors
+            self.skipped = skipped
+            self.vocabulary = vocabulary
+            super().__init__()
 
     def __init__(
         self,
@@ -53,126 +158,752 @@ class EditorScreen(Screen, inherit_bindings=False):
     ) -> None:
         super().__init__(**kwargs)
         self.metrics = metrics
-        self._initial_file = initial_file
+        self.workspace = get_workspace_dir()
         self._light_mode = light_mode
-        self._add_note = add_note
-        self._reader_mode_initial = reader_mode_initial
-        self._show_all_panes = show_all_panes
-        self._is_book = False
+        self.configure(
+            initial_file,
+            add_note=add_note,
+            reader_mode_initial=reader_mode_initial,
+            show_all_panes=show_all_panes,
+        )
+        self._edits = EditBus()
+        self._headings = self._edits.subscribe(HeadingAnalyzer())
+        self._word_counts = self._edits.subscribe(CountAnalyzer())
+        self._vocabulary = Vocabulary()
+        self._vocabulary_rows = self._edits.subscribe(VocabularyAnalyzer(self._vocabulary))
+        self._pipeline = ChangePipeline(self, self._editor_text)
+        self._pipeline.add_consumer(
+            "outline",
+            self._update_outline,
+            interval=0.3,
+            is_active=lambda: self.show_outline,
+            needs_text=False,
+        )
+        self._pipeline.add_consumer(
+            "stats",
+            self._update_counts,
+            interval=0.2,
+            is_active=lambda: not self.large_file,
+            needs_text=False,
+        )
+        self._pipeline.add_consumer("size", self._check_large_file, interval=1.0)
+        self._pipeline.add_consumer(
+            "find",
+            self._update_find,
+            interval=0.1,
+            is_active=lambda: self.query_one("#find-bar", FindBar).display,
+            needs_text=False,
+        )
+        self._pipeline.add_consumer(
+            "vocabulary",
+            self._update_vocabulary,
+            interval=1.0,
+            is_active=lambda: not self.large_file,
+            needs_text=False,
+        )
+        self._large_file_limits = get_large_file_limits()
+        self._loading_path: Path | None = None
+        self._saved_hash: str | None = None
+        self._writer = get_save_queue(self.workspace, fsync=get_save_fsync())
+        self._journal_dir = get_journal_dir()
+        self._journal: EditJournal | None = None
+        self._autosaver = AutosaveScheduler(self, self._autosave)
+        self._buffers = BufferCache(max_bytes=get_buffer_cache_bytes())
+        self._analysis = AnalysisCache(
+            get_analysis_dir(), self._writer, max_bytes=get_analysis_cache_bytes()
+        )
+        self._undo_logs = UndoStore(
+            get_undo_dir(), self._writer, max_bytes=get_undo_history_bytes()
+        )
+        self._file_signature: tuple[int, int] | None = None
+        self._base_text: str | None = None
+        self._conflicted = False
+        self._outline_headings: HeadingArray | None = None
+        self._heading_index: HeadingIndex | None = None
+        self._counts: tuple[int, int] | None = None
+        self._focus_after_load = False
 
     def compose(self) -> ComposeResult:
         ta_theme = "prosaic_light" if self._light_mode else "prosaic_dark"
         with Horizontal(id="editor-layout"):
-            yield FileTree(get_workspace_dir(), id="file-tree")
+            yield FileTree(self.workspace, id="file-tree")
             with Vertical(id="editor-container"):
-                yield SpellCheckTextArea(
+                editor = SpellCheckTextArea(
                     id="editor",
                     language="markdown",
                     soft_wrap=True,
                     theme=ta_theme,
                 )
+                yield editor
+                find_bar = FindBar(editor, id="find-bar")
+                find_bar.display = False
+                yield find_bar
             outline = OutlinePanel(id="outline")
             outline.display = False
             yield outline
         yield StatusBar(id="statusbar")
 
+    def configure(
+        self,
+        initial_file: Path | None = None,
+        add_note: bool = False,
+        reader_mode_initial: bool = False,
+        show_all_panes: bool = False,
+    ) -> None:
+        """Set what to open and how the next time the screen is shown.
+
+        The app installs one editor screen and reuses it, so each open calls
+        this instead of constructing a new screen.
+        """
+        self._initial_file = initial_file
+        self._add_note = add_note
+        self._reader_mode_initial = reader_mode_initial
+        self._show_all_panes = show_all_panes
+        self._is_book = initial_file is not None and initial_file.is_relative_to(
+            get_books_dir()
+        )
+        self._open_pending = True
+
+    def set_light_mode(self, light_mode: bool) -> None:
+        """Switch the editor between the light and dark themes."""
+        self._light_mode = light_mode
+        if self.is_mounted:
+            self._editor.theme = "prosaic_light" if light_mode else "prosaic_dark"
+
     def on_mount(self) -> None:
-        editor = self.query_one("#editor", TextArea)
-        editor.focus()
-        self.set_interval(10, self._autosave)
+        editor = self.query_one("#editor", SpellCheckTextArea)
+        editor.add_edit_listener(self._journal_edit)
+        editor.add_edit_listener(self._edits.publish)
+        editor.history = SpillingEditHistory(
+            max_checkpoints=_UNDO_CHECKPOINTS,
+            checkpoint_timer=editor.history.checkpoint_timer,
+            checkpoint_max_characters=editor.history.checkpoint_max_characters,
+            max_bytes=get_undo_memory_bytes(),
+            spill_dir=get_undo_dir(),
+        )
+        remove_stale_spills(get_undo_dir())
+        # Children are already unmounted by the time on_unmount runs, so keep
+        # a handle on the editor for the final save.
+        self._editor = editor
+        self.watch(self.app, "app_focus", self._on_app_focus_changed, init=False)
+        self.set_interval(_DISK_POLL_INTERVAL, self._poll_disk)
+        editor.vocabulary = self._vocabulary
+        self._build_vocabulary()
 
-        if self._initial_file and self._initial_file.exists():
-            self._load_file(self._initial_file)
-            books_dir = get_books_dir()
-            try:
-                self._initial_file.relative_to(books_dir)
-                self._is_book = True
-            except ValueError:
-                self._is_book = False
+    def on_screen_resume(self) -> None:
+        if self._open_pending:
+            self._open_pending = False
+            self._open_configured()
 
-        if self._reader_mode_initial:
-            self.reader_mode = True
-        elif self._add_note or self._is_book:
-            self.show_tree = False
-            self.show_outline = True
-        elif self._show_all_panes:
-            self.show_tree = True
-            self.show_outline = True
+    def _open_configured(self) -> None:
+        """Open the configured file and set up the panes for its mode."""
+        self._focus_after_load = True
+        if self._initial_file and self._initial_file.exists():
+            self._load_file(self._initial_file, add_note=self._add_note)
         else:
-            self.show_tree = True
-            self.show_outline = False
+            self._show_untitled()
+        if self._loading_path is None:
+            self._end_loading()
 
-    def _load_file(self, path: Path) -> None:
-        if not path.exists():
+        self.focus_mode = False
+        self.reader_mode = self._reader_mode_initial
+        self._restore_panes()
+
+    def _show_untitled(self) -> None:
+        """Switch to an empty, untitled document."""
+        if self.current_file is None and self._journal is not None:
             return
+        self._store_analysis()
+        self._store_undo()
+        self._close_saved_journal()
+        self._stash_buffer()
+        self.workers.cancel_group(self, "load")
+        self._loading_path = None
+        editor = self._editor
+        with editor.prevent(TextArea.Changed):
+            editor.load_text("")
+        self._end_loading()
 
-        content = read_text(path)
+        self.current_file = None
+        self.modified = False
+        self._autosaver.cancel()
+        self._saved_hash = None
+        self._file_signature = None
+        self._base_text = None
+        self._conflicted = False
+        self._edits.reset()
+        self._pipeline.reset()
+        self._open_journal(None, "")
+
+    def _load_file(self, path: Path, add_note: bool = False) -> None:
+        """Open a file, or with add_note, append a dated heading to it first."""
+        if not path.exists():
+            return
+        if path == self.current_file and self._loading_path is None and not add_note:
+            return
 
-        if self._add_note:
-            heading = datetime.now().strftime("## %Y-%m-%d %H:%M")
-            if content and not content.endswith("\n"):
-                content += "\n"
-            content += f"\n{heading}\n\n"
-            write_text(path, content)
+        self._store_analysis()
+        self._store_undo()
+        self._close_saved_journal()
+        self._stash_buffer()
+        buffer = self._buffers.take(path)
+        if (
+            buffer is not None
+            and not add_note
+            and buffer.signature == file_signature(path)
+        ):
+            self._restore_buffer(buffer)
+            return
 
+        self._loading_path = path
         editor = self.query_one("#editor", TextArea)
-        editor.load_text(content)
+        editor.loading = True
+        editor.read_only = True
+        self._read_file(path, add_note)
+
+    @work(thread=True, exclusive=True, group="load")
+    def _read_file(self, path: Path, add_note: bool) -> None:
+        """Read a file off the UI thread; a newer load cancels this one."""
+        worker = get_current_worker()
+        self._writer.flush()
+        signature = file_signature(path)
+        chunks = []
+        try:
+            for chunk in iter_text(path):
+                if worker.is_cancelled:
+                    return
+                chunks.append(chunk)
+            content = "".join(chunks)
+
+            # A crashed session's edits apply to the file as it is, so the
+            # new note heading waits until they have been offered.
+            if add_note and not worker.is_cancelled and not self._has_journal(path, content):
+                heading = datetime.now().strftime("## %Y-%m-%d %H:%M")
+                if content and not content.endswith("\n"):
+                    content += "\n"
+                content += f"\n{heading}\n\n"
+                self._writer.submit(path, content)
+        except (OSError, UnicodeDecodeError) as error:
+            if not worker.is_cancelled:
+                self.app.call_from_thread(self._load_failed, path, error)
+            return
+
+        digest = content_hash(content)
+        analysis = None if add_note else self._analysis.get(path, digest)
+        self._analysis.prune()
+        self._undo_logs.prune()
+        if not worker.is_cancelled:
+            self.app.call_from_thread(
+                self._show_file, path, content, digest, signature, analysis, add_note
+            )
+
+    def _load_failed(self, path: Path, error: Exception) -> None:
+        if path != self._loading_path:
+            return
+        self._loading_path = None
+        self._end_loading()
+        self.notify(f"Could not open {path.name}: {error}", severity="error")
+        if self.current_file is not None:
+            buffer = self._buffers.take(self.current_file)
+            if buffer is not None:
+                self._restore_buffer(buffer)
+
+    def _show_file(
+        self,
+        path: Path,
+        content: str,
+        digest: str,
+        signature: tuple[int, int] | None,
+        analysis: Analysis | None = None,
+        add_note: bool = False,
+    ) -> None:
+        if path != self._loading_path:
+            return
+        self._loading_path = None
+
+        self._check_large_file(content)
+        editor = self.query_one("#editor", SpellCheckTextArea)
+        highlights = None
+        if analysis is not None and not self.large_file:
+            highlights = analysis.highlights
+        with editor.prevent(TextArea.Changed):
+            editor.load_text(content, highlights=highlights)
+        if not add_note:
+            # Read on the first undo that reaches back past this session.
+            editor.history.set_older(partial(self._undo_logs.read, path, digest))
+        self._end_loading()
 
-        if self._add_note:
+        if add_note:
             lines = content.split("\n")
             editor.move_cursor((len(lines) - 1, 0))
+        elif analysis is not None:
+            editor.restore_view(Selection(*analysis.cursor), analysis.scroll)
+
+        self._saved_hash = digest
+        self._file_signature = signature
+        self._base_text = content
+        self._conflicted = False
+        self._edits.reset()
+        clean = set()
+        if analysis is not None and analysis.headings is not None:
+            self._headings.load(analysis.headings)
+            self._show_headings(analysis.headings)
+            clean.add("outline")
+        if analysis is not None and analysis.counts is not None:
+            self._show_counts(*analysis.counts)
+            clean.add("stats")
+        self._pipeline.reset(clean=clean)
+        if "stats" in clean:
+            words = self._counts[0]
+        else:
+            words = count_words(content)
+            if self.large_file:
+                self._update_stats(content, words)
+        self._activate(path, content, words)
+
+    def _store_analysis(self, digest: str | None = None) -> None:
+        """Cache the current document's analysis and view state on disk.
+
+        Args:
+            digest: Hash of the editor text; defaults to the saved hash, and
+                nothing is stored for unsaved changes without one.
+        """
+        if digest is None and not self.modified:
+            digest = self._saved_hash
+        if self.current_file is None or self._loading_path is not None or digest is None:
+            return
+        editor = self._editor
+        selection = editor.selection
+        self._analysis.put(
+            self.current_file,
+            Analysis(
+                content_hash=digest,
+                cursor=(selection.start, selection.end),
+                scroll=(editor.scroll_x, editor.scroll_y),
+                highlights=editor.document_highlights(),
+                headings=None if self._pipeline.is_dirty("outline") else self._outline_headings,
+                counts=None if self._pipeline.is_dirty("stats") else self._counts,
+            ),
+        )
+
+    def _store_undo(self, digest: str | None = None) -> None:
+        """Save the current document's undo history, if it changed, for next time.
+
+        Args:
+            digest: Hash of the editor text, as for _store_analysis.
+        """
+        if digest is None and not self.modified:
+            digest = self._saved_hash
+        if self.current_file is None or self._loading_path is not None or digest is None:
+            return
+        history = self._editor.history
+        if history.changed:
+            self._undo_logs.put(self.current_file, digest, history.export())
 
+    def _end_loading(self) -> None:
+        """Make the editor usable again, focusing it if an open asked for that.
+
+        A loading editor can't take focus, so opening the screen defers it.
+        """
+        editor = self._editor
+        editor.loading = False
+        editor.read_only = self.reader_mode
+        if self._focus_after_load:
+            self._focus_after_load = False
+            editor.focus()
+
+    def _stash_buffer(self) -> None:
+        """Keep the current, saved document in memory for switching back."""
+        if self.current_file is None or self._loading_path is not None or self.modified:
+            return
+        editor = self.query_one("#editor", SpellCheckTextArea)
+        size = len(editor.text) * 3 + editor.document.line_count * 100
+        size += editor.history.memory_bytes
+        headings = None if self._pipeline.is_dirty("outline") else self._outline_headings
+        counts = None if self._pipeline.is_dirty("stats") else self._counts
+        self._buffers.put(
+            Buffer(
+                path=self.current_file,
+                editor_state=editor.detach_state(),
+                saved_hash=self._saved_hash or "",
+                signature=self._file_signature,
+                size=size,
+                headings=headings,
+                counts=counts,
+            )
+        )
+
+    def _restore_buffer(self, buffer: Buffer) -> None:
+        """Switch to a cached document without reading or rescanning it."""
+        self.workers.cancel_group(self, "load")
+        self._loading_path = None
+        editor = self.query_one("#editor", SpellCheckTextArea)
+        editor.restore_state(buffer.editor_state)
+        self._end_loading()
+
+        self._saved_hash = buffer.saved_hash
+        self._file_signature = buffer.signature
+        self._base_text = editor.text
+        self._conflicted = False
+        self.large_file = buffer.editor_state.large_file
+        self._edits.reset()
+        clean = {"size"}
+        if buffer.headings is not None:
+            self._headings.load(buffer.headings)
+            self._show_headings(buffer.headings)
+            clean.add("outline")
+        if buffer.counts is not None:
+            self._show_counts(*buffer.counts)
+            clean.add("stats")
+        self._pipeline.reset(clean=clean)
+
+        content = editor.text
+        words = buffer.counts[0] if buffer.counts else count_words(content)
+        self._activate(buffer.path, content, words)
+
+    def _activate(self, path: Path, content: str, words: int) -> None:
+        """Finish switching to a document that is now in the editor."""
         self.current_file = path
         self.modified = False
-
-        outline = self.query_one("#outline", OutlinePanel)
-        outline.update_headings(content)
+        self._autosaver.cancel()
 
         statusbar = self.query_one("#statusbar", StatusBar)
         statusbar.filename = path.name
         statusbar.modified = False
         statusbar.update_git_for_file(path)
 
-        self._update_stats(content)
-        self.metrics.set_baseline(count_words(content))
+        self.metrics.set_baseline(words)
+        self._open_journal(path, content)
+
+    def _open_journal(self, path: Path | None, content: str) -> None:
+        """Start journalling edits, first offering to replay a crashed session's."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+        journal = EditJournal(journal_path(self._journal_dir, path), path)
+        base_hash = content_hash(content)
+        previous = recoverable(journal.path, base_hash)
+        if previous is None:
+            stale = read_journal(journal.path)
+            if stale is not None and stale.edits:
+                kept = set_aside(journal.path)
+                self.notify(
+                    f"Unsaved edits to {path.name if path else 'untitled'} from an "
+                    f"earlier session no longer match the file; kept in {kept.name}",
+                    severity="warning",
+                    timeout=10,
+                )
+            journal.start(base_hash, content if path is None else None)
+            self._journal = journal
+            return
+
+        def finish(restore: bool | None) -> None:
+            if restore:
+                editor = self.query_one("#editor", TextArea)
+                base = previous.base_text if path is None else content
+                editor.replace(
+                    replay(base or "", previous.edits),
+                    (0, 0),
+                    editor.document.end,
+                )
+                journal.resume()
+            else:
+                journal.start(base_hash, content if path is None else None)
+            self._journal = journal
+
+        name = path.name if path else "untitled"
+        self.app.push_screen(
+            RecoverJournalModal(name, len(previous.edits)), callback=finish
+        )
+
+    def _has_journal(self, path: Path, content: str) -> bool:
+        """Whether a crashed session left edits to the file as it is on disk."""
+        journal = journal_path(self._journal_dir, path)
+        return recoverable(journal, content_hash(content)) is not None
+
+    def _close_saved_journal(self) -> None:
+        """Delete the journal of a document being switched away from, once saved.
+
+        A journal with a save still in flight is only closed; the Saved
+        handler deletes it when the write succeeds.
+        """
+        journal = self._journal
+        if journal is None or journal.source is None or self.modified:
+            return
+        self._journal = None
+        if self._writer.pending(journal.source):
+            journal.close()
+        else:
+            journal.discard()
+
+    def _journal_edit(self, delta: EditDelta) -> None:
+        if self._journal is not None:
+            self._journal.record(delta.start, delta.end, delta.text)
+
+    def _poll_disk(self) -> None:
+        path = self.current_file
+        if (
+            path is None
+            or self._loading_path is not None
+            or not self.is_current
+            or self._writer.pending(path)
+        ):
+            return
+        self._read_if_changed(path, self._file_signature)
+
+    @work(thread=True, exclusive=True, group="disk")
+    def _read_if_changed(self, path: Path, signature: tuple[int, int] | None) -> None:
+        """Read a file off the UI thread if its mtime or size changed."""
+        current = file_signature(path)
+        if current is None or current == signature:
+            return
+        try:
+            text = read_text(path)
+        except (OSError, UnicodeDecodeError):
+            return
+        digest = content_hash(text)
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self._on_disk_changed, path, current, text, digest)
+
+    def _sync_with_disk(self) -> bool:
+        """Bring in changes made on disk to the current file before saving over it.
+
+        Returns:
+            False if merging them left conflicts to resolve.
+        """
+        path = self.current_file
+        if path is None or self._writer.pending(path):
+            return True
+        signature = file_signature(path)
+        if signature is None or signature == self._file_signature:
+            return True
+        try:
+            text = read_text(path)
+        except (OSError, UnicodeDecodeError):
+            return True
+        return self._on_disk_changed(path, signature, text, content_hash(text))
+
+    def _on_disk_changed(
+        self,
+        path: Path,
+        signature: tuple[int, int],
+        text: str,
+        digest: str,
+    ) -> bool:
+        """Take in a change made to the open file outside Prosaic.
+
+        Without unsaved edits the editor is reloaded. Otherwise the edits are
+        merged line by line with the disk text, against the text last loaded
+        or saved; rows both sides changed are kept between conflict markers.
+        Either way the change is one undoable edit.
+
+        Returns:
+            False if the merge left conflicts.
+        """
+        if (
+            path != self.current_file
+            or self._loading_path is not None
+            or self._writer.pending(path)
+        ):
+            return True
+        self._file_signature = signature
+        if digest == self._saved_hash:
+            return True
+        base = self._base_text if self._base_text is not None else text
+        self._saved_hash = digest
+        self._base_text = text
+
+        editor = self._editor
+        if self.modified:
+            merge = merge3(base.split("\n"), list(editor.document.lines), text.split("\n"))
+            merged = "\n".join(merge.lines)
+        else:
+            merge = None
+            merged = text
+        with editor.prevent(TextArea.Changed):
+            editor.update_text(merged)
+        self.modified = merged != text
+        self._pipeline.notify()
+        if self._journal is not None:
+            self._journal.start(digest)
+            if self.modified:
+                lines = text.split("\n")
+                self._journal.record((0, 0), (len(lines) - 1, len(lines[-1])), merged)
+
+        if merge is None:
+            self.notify(f"Reloaded {path.name}, which changed on disk")
+            return True
+        if merge.conflicts:
+            self._conflicted = True
+            editor.move_cursor((merge.conflicts[0], 0), center=True)
+            count = len(merge.conflicts)
+            self.notify(
+                f"{path.name} changed on disk: {count} "
+                f"{'conflict' if count == 1 else 'conflicts'} marked. "
+                "Autosave is paused until you save.",
+                severity="warning",
+                timeout=10,
+            )
+            return False
+        self.notify(f"Merged changes to {path.name} from disk")
+        if self.modified:
+            self._autosaver.touch()
+        return True
 
     def _save_file(self, silent: bool = False) -> None:
         if self.current_file is None:
             return
 
+        self._autosaver.cancel()
+        if silent:
+            # Unresolved conflict markers are only saved deliberately.
+            if self._conflicted or not self._sync_with_disk():
+                return
+        elif not self._sync_with_disk():
+            return
+        self._conflicted = False
         editor = self.query_one("#editor", TextArea)
         content = editor.text
-        write_text(self.current_file, content)
+        digest = content_hash(content)
         self.modified = False
-        self.metrics.record_save(count_words(content), self.current_file)
+        if digest == self._saved_hash:
+            if not silent:
+                self.notify(f"No changes to {self.current_file.name}")
+            return
 
-        if not silent:
-            self.notify(f"Saved {self.current_file.name}")
+        self._queue_save(self.current_file, content, digest, silent=silent)
+        self._record_save(content, self.current_file)
 
     async def _autosave(self) -> None:
         """Autosave current file in background."""
         if self.current_file is None or not self.modified:
             return
+        # Unresolved conflict markers are only saved deliberately.
+        if self._conflicted or not self._sync_with_disk():
+            return
 
-        try:
-            editor = self.query_one("#editor", TextArea)
-            content = editor.text
-            file_path = self.current_file
+        editor = self._editor
+        document = editor.document
+        snapshot = editor.snapshot()
+        file_path = self.current_file
+
+        # Join and hash the text on the worker thread, from a snapshot that
+        # later keystrokes can't change.
+        digest = await asyncio.to_thread(lambda: content_hash(snapshot.text))
+        if self.current_file != file_path:
+            return
+        self.modified = (
+            editor.document is not document or document.version != snapshot.version
+        )
+        if digest == self._saved_hash:
+            return
+        content = snapshot.text
+
+        self._queue_save(file_path, content, digest, autosave=True)
+        self._record_save(content, file_path)
+
+    def _queue_save(
+        self,
+        path: Path,
+        content: str,
+        digest: str,
+        autosave: bool = False,
+        silent: bool = False,
+    ) -> None:
+        """Hand a save to the workspace writer; the result arrives as Saved."""
+        self._saved_hash = digest
+        if path == self.current_file:
+            self._base_text = content
+        mark = self._journal.mark() if self._journal is not None else None
+        self._writer.submit(
+            path,
+            content,
+            on_done=lambda error: self.post_message(
+                self.Saved(path, error, autosave, silent, digest, mark)
+            ),
+        )
+
+    def on_editor_screen_saved(self, event: Saved) -> None:
+        if event.error is not None:
+            cached = self._buffers.take(event.path)
+            if cached is None and event.path == self.current_file:
+                self._saved_hash = None
+                self.modified = True
+            self.notify(
+                f"Could not save {event.path.name}: {event.error}", severity="error"
+            )
+            return
 
-            await asyncio.to_thread(write_text, file_path, content)
+        if buffer := self._buffers.get(event.path):
+            buffer.signature = file_signature(event.path)
+        elif event.path == self.current_file:
+            self._file_signature = file_signature(event.path)
 
-            self.modified = False
-            self.metrics.record_save(count_words(content), file_path)
+        if self._journal is not None and self._journal.source == event.path:
+            if event.journal_mark is not None:
+                self._journal.compact(event.digest, event.journal_mark)
+        else:
+            journal_path(self._journal_dir, event.path).unlink(missing_ok=True)
 
+        if event.autosave:
             statusbar = self.query_one("#statusbar", StatusBar)
             statusbar.flash_autosave()
-            self.call_later(lambda: statusbar.update_git_for_file(file_path))
-        except Exception:
-            pass
+            statusbar.update_git_for_file(event.path)
+        elif not event.silent:
+            self.notify(f"Saved {event.path.name}")
 
-    def _update_stats(self, content: str) -> None:
+    def _record_save(self, content: str, path: Path) -> None:
+        """Record a save in metrics; large files also refresh their counts here."""
         words = count_words(content)
-        chars = count_characters(content)
+        self.metrics.record_save(words, path)
+        if self.large_file:
+            self._update_stats(content, words)
+
+    def _editor_text(self) -> str:
+        return self.query_one("#editor", TextArea).text
+
+    def _update_outline(self) -> None:
+        analyzer = self._headings
+        analyzer.sync(self._editor.document.lines)
+        if analyzer.headings is not self._outline_headings:
+            self._show_headings(analyzer.headings)
+
+    def _show_headings(self, headings: HeadingArray) -> None:
+        self._outline_headings = headings
+        self.query_one("#outline", OutlinePanel).show_headings(headings)
+
+    def _update_find(self) -> None:
+        self.query_one("#find-bar", FindBar).refresh_matches()
+
+    def _update_counts(self) -> None:
+        counts = self._word_counts
+        counts.sync(self._editor.document.lines)
+        self._show_counts(counts.words, counts.characters)
+
+    def _update_vocabulary(self) -> None:
+        self._vocabulary_rows.sync(self._editor.document.lines)
+
+    @work(thread=True, exclusive=True, group="vocabulary")
+    def _build_vocabulary(self) -> None:
+        """Count the words in the workspace off the UI thread, for completion."""
+        paths = workspace_files(self.workspace, FilteredDirectoryTree.HIDDEN_FILES)
+        vocabulary = build_vocabulary(paths)
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self._set_vocabulary, vocabulary)
+
+    def _set_vocabulary(self, vocabulary: Vocabulary) -> None:
+        self._vocabulary = vocabulary
+        self._vocabulary_rows.vocabulary = vocabulary
+        self._editor.vocabulary = vocabulary
+
+    def _update_stats(self, content: str, words: int | None = None) -> None:
+        if words is None:
+            words = count_words(content)
+        self._show_counts(words, count_characters(content))
+
+    def _show_counts(self, words: int, chars: int) -> None:
+        self._counts = (words, chars)
         try:
             statusbar = self.query_one("#statusbar", StatusBar)
             statusbar.words = words
@@ -180,11 +911,29 @@ class EditorScreen(Screen, inherit_bindings=False):
         except Exception:
             pass
 
+    def _check_large_file(self, content: str) -> None:
+        self.large_file = self._large_file_limits.is_large(
+            len(content), content.count("\n") + 1, self.large_file
+        )
+
+    def watch_large_file(self, large: bool) -> None:
+        """Degrade per-keystroke work for large documents, and restore it."""
+        self.query_one("#editor", SpellCheckTextArea).large_file = large
+        self._pipeline.set_consumer_interval("outline", 3.0 if large else 0.3)
+        if not large:
+            self._pipeline.wake("stats")
+        try:
+            self.query_one("#statusbar", StatusBar).large_file = large
+        except Exception:
+            pass
+
     def watch_show_tree(self, show: bool) -> None:
         self.query_one("#file-tree", FileTree).display = show
 
     def watch_show_outline(self, show: bool) -> None:
         self.query_one("#outline", OutlinePanel).display = show
+        if show:
+            self._pipeline.wake("outline")
 
     def watch_focus_mode(self, focus: bool) -> None:
         if focus:
@@ -211,7 +960,7 @@ class EditorScreen(Screen, inherit_bindings=False):
             self.remove_class("reader-mode")
             if not self.focus_mode:
                 self._restore_panes()
-            editor.read_only = False
+            editor.read_only = self._loading_path is not None
 
     def _restore_panes(self) -> None:
         """Restore pane visibility based on context."""
@@ -241,12 +990,26 @@ class EditorScreen(Screen, inherit_bindings=False):
 
     def on_text_area_changed(self, event: TextArea.Changed) -> None:
         self.modified = True
-        content = event.text_area.text
-        self.query_one("#outline", OutlinePanel).update_headings(content)
-        self._update_stats(content)
+        self._pipeline.notify()
+        self._autosaver.touch()
+
+    def on_screen_suspend(self) -> None:
+        if self.modified:
+            self._save_file(silent=True)
+
+    def _on_app_focus_changed(self, focused: bool) -> None:
+        if not focused and self.modified:
+            self._save_file(silent=True)
 
     def on_file_tree_file_selected(self, event: FileTree.FileSelected) -> None:
         if event.path.suffix == ".md":
+            if self._conflicted and event.path != self.current_file:
+                self.notify(
+                    f"Resolve the conflicts in {self.current_file.name} and save "
+                    "with ctrl+s before opening another file",
+                    severity="warning",
+                )
+                return
             if self.modified:
                 self._save_file(silent=True)
             self._load_file(event.path)
@@ -255,8 +1018,14 @@ class EditorScreen(Screen, inherit_bindings=False):
         self,
         event: OutlinePanel.HeadingSelected,
     ) -> None:
+        self._go_to_heading(event.line)
+
+    def _go_to_heading(self, line: int | None) -> None:
+        """Move the cursor to the start of a heading's line, numbered from 1."""
+        if line is None:
+            return
         editor = self.query_one("#editor", TextArea)
-        editor.move_cursor((event.line - 1, 0))
+        editor.move_cursor((line - 1, 0))
         editor.focus()
 
     def action_toggle_tree(self) -> None:
@@ -265,6 +1034,21 @@ class EditorScreen(Screen, inherit_bindings=False):
     def action_toggle_outline(self) -> None:
         self.show_outline = not self.show_outline
 
+    def action_jump_to_heading(self) -> None:
+        if self._loading_path is not None:
+            return
+        self._headings.sync(self._editor.document.lines)
+        headings = self._headings.headings
+        if not headings:
+            self.notify("No headings")
+            return
+        # The analyzer keeps the same array until the headings change.
+        if self._heading_index is None or self._heading_index.headings is not headings:
+            self._heading_index = HeadingIndex(headings)
+        self.app.push_screen(
+            HeadingJumpModal(self._heading_index), callback=self._go_to_heading
+        )
+
     def action_toggle_focus(self) -> None:
         if self.focus_mode:
             self.focus_mode = False
@@ -286,18 +1070,136 @@ class EditorScreen(Screen, inherit_bindings=False):
     def action_save(self) -> None:
         self._save_file()
 
+    def action_find(self) -> None:
+        self.query_one("#find-bar", FindBar).open()
+
+    def action_replace(self) -> None:
+        self.query_one("#find-bar", FindBar).open(replace=True)
+
+    def action_find_next(self) -> None:
+        find_bar = self.query_one("#find-bar", FindBar)
+        if find_bar.display:
+            find_bar.find_next()
+        else:
+            find_bar.open()
+
+    def action_find_previous(self) -> None:
+        find_bar = self.query_one("#find-bar", FindBar)
+        if find_bar.display:
+            find_bar.find_next(backwards=True)
+        else:
+            find_bar.open()
+
+    def action_replace_in_workspace(self) -> None:
+        open_texts = {}
+        if self.current_file is not None and self._loading_path is None:
+            open_texts[self.current_file] = self._editor.text
+        self.app.push_screen(
+            WorkspaceReplaceModal(self.workspace, open_texts),
+            callback=self._replace_in_workspace,
+        )
+
+    def _replace_in_workspace(self, plan: WorkspaceReplace | None) -> None:
+        """Apply a confirmed workspace replace.
+
+        The open document is edited in place, as one undoable edit, and
+        saved. Every other file is rewritten in one batch of atomic writes;
+        documents cached for switching back are dropped so they are re-read,
+        which discards their undo history.
+        """
+        if plan is None:
+            return
+        count = 0
+        files = []
+        for found in plan.files:
+            if found.path == self.current_file and self._loading_path is None:
+                count += self._editor.replace_all(plan.query, plan.replacement)
+                self._save_file(silent=True)
+            else:
+                self._buffers.take(found.path)
+                files.append(found)
+        if files:
+            self._write_replacements(plan, files, count, len(plan.files) - len(files))
+        else:
+            self.post_message(self.ReplacedInWorkspace(count, len(plan.files), {}, [], {}))
+
+    @work(thread=True, group="replace")
+    def _write_replacements(
+        self,
+        plan: WorkspaceReplace,
+        files: list[FileMatches],
+        count: int,
+        done: int,
+    ) -> None:
+        """Rewrite files that still hold the previewed text, in one batch."""
+        pattern = plan.query.compile()
+        contents: dict[Path, str] = {}
+        vocabulary: dict[Path, Counter[str]] = {}
+        skipped = []
+        for found in files:
+            try:
+                text = read_text(found.path)
+            except (OSError, UnicodeDecodeError):
+                text = None
+            if text != found.text:
+                skipped.append(found.path)
+                continue
+            contents[found.path], replaced = replace_in_text(
+                plan.query, pattern, text, plan.replacement
+            )
+            counts = word_counts(contents[found.path])
+            counts.subtract(word_counts(text))
+            vocabulary[found.path] = counts
+            count += replaced
+        files_changed = done + len(contents)
+        self._writer.submit_batch(
+            contents,
+            on_done=lambda errors: self.post_message(
+                self.ReplacedInWorkspace(count, files_changed, errors, skipped, vocabulary)
+            ),
+        )
+
+    def on_editor_screen_replaced_in_workspace(self, event: ReplacedInWorkspace) -> None:
+        written = event.files - len(event.errors)
+        self.notify(
+            f"Replaced {event.count:,} {'match' if event.count == 1 else 'matches'} "
+            f"in {written:,} {'file' if written == 1 else 'files'}"
+        )
+        if event.skipped:
+            names = ", ".join(path.name for path in event.skipped)
+            self.notify(f"Skipped files changed since the preview: {names}", severity="warning")
+        for path, error in event.errors.items():
+            self.notify(f"Could not save {path.name}: {error}", severity="error")
+        for path, counts in event.vocabulary.items():
+            if path not in event.errors:
+                self._vocabulary.update(counts)
+
     def action_go_home(self) -> None:
         if self.modified:
             self._save_file(silent=True)
         self.app.pop_screen()
 
     def on_unmount(self) -> None:
-        if self.modified and self.current_file:
-            try:
-                editor = self.query_one("#editor", TextArea)
-                write_text(self.current_file, editor.text)
-            except Exception:
-                pass
+        journal, self._journal = self._journal, None
+        if journal is not None:
+            journal.close()
+        if self.current_file is None:
+            return
+
+        def discard_journal(error: Exception | None = None) -> None:
+            if error is None and journal is not None:
+                journal.discard()
+
+        content = self._editor.text
+        digest = content_hash(content) if self.modified else self._saved_hash
+        self._store_analysis(digest)
+        self._store_undo(digest)
+        if digest == self._saved_hash:
+            discard_journal()
+        elif not self._conflicted:
+            self._writer.submit(self.current_file, content, on_done=discard_journal)
+        # Text with unresolved conflicts stays in the journal, which holds it
+        # against the disk text, to be offered back on the next open.
 
     def action_show_help(self) -> None:
         self.app.push_screen(HelpScreen())
@@ -1,7 +1,15 @@
 """Utility functions for Prosaic."""
 
+import codecs
+import hashlib
+import io
+import os
+import uuid
+from collections.abc import Iterator
 from pathlib import Path
 
+READ_CHUNK_SIZE = 1 << 20
+
 
 def read_text(path: Path) -> str:
     """Read file with UTF-8 encoding.
@@ -15,6 +23,30 @@ def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
+def iter_text(path: Path, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+    """Read a UTF-8 file incrementally, yielding decoded chunks.
+
+    Multi-byte characters split across chunk boundaries are decoded
+    correctly, and newlines are translated as in read_text().
+
+    Args:
+        path: Path to the file.
+        chunk_size: Number of bytes to read at a time.
+
+    Yields:
+        Decoded text chunks which join to the file contents.
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(), translate=True
+    )
+    with path.open("rb") as f:
+        while chunk := f.read(chunk_size):
+            if text := decoder.decode(chunk):
+                yield text
+    if text := decoder.decode(b"", final=True):
+        yield text
+
+
 def write_text(path: Path, content: str) -> None:
     """Write file with UTF-8 encoding.
 
@@ -23,3 +55,67 @@ def write_text(path: Path, content: str) -> None:
         content: Content to write.
     """
     path.write_text(content, encoding="utf-8")
+
+
+def write_text_atomic(path: Path, content: str, fsync: bool = True) -> None:
+    """Write file with UTF-8 encoding, replacing it atomically.
+
+    The content goes to a temporary file in the same directory, which is
+    then renamed over the target, so readers see either the old or the new
+    file and never a partial write. An existing file keeps its permissions.
+
+    Args:
+        path: Path to the file.
+        content: Content to write.
+        fsync: Flush the data to disk before replacing the file.
+    """
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def file_signature(path: Path) -> tuple[int, int] | None:
+    """Get a file's modification time and size, to tell if it changed.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        ``(mtime_ns, size)``, or None if the file can't be read.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def content_hash(content: str) -> str:
+    """Hash document text, for detecting whether it differs from a saved copy.
+
+    Args:
+        content: Text to hash.
+
+    Returns:
+        Hex digest of the UTF-8 encoded text.
+    """
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
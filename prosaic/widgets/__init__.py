@@ -1,9 +1,10 @@
 """Widget exports."""
 
 from prosaic.widgets.file_tree import FileTree
+from prosaic.widgets.find_bar import FindBar
 from prosaic.widgets.key_panel import LowercaseKeyPanel
 from prosaic.widgets.outline import OutlinePanel
 from prosaic.widgets.statusbar import StatusBar
 from prosaic.widgets.spell_text_area import SpellCheckTextArea
 
-__all__ = ["FileTree", "LowercaseKeyPanel", "OutlinePanel", "StatusBar", "SpellCheckTextArea"]
+__all__ = ["FileTree", "FindBar", "LowercaseKeyPanel", "OutlinePanel", "StatusBar", "SpellCheckTextArea"]
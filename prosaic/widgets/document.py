@@ -0,0 +1,132 @@
+"""Document backend used by the editor."""
+
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate, islice
+
+from textual.document._document import Document, EditResult, Location
+from textual.document._syntax_aware_document import SyntaxAwareDocument
+
+
+class DocumentSnapshot:
+    """Read-only view of a document's text at one moment.
+
+    Shares the document's line list rather than copying it; the document
+    copies the list before its next edit instead, so taking a snapshot is
+    constant-time and the snapshot is safe to read from another thread.
+    """
+
+    __slots__ = ("lines", "newline", "version", "_text")
+
+    def __init__(
+        self,
+        lines: Sequence[str],
+        newline: str,
+        version: int,
+        text: str | None = None,
+    ) -> None:
+        self.lines = lines
+        self.newline = newline
+        self.version = version
+        self._text = text
+
+    @property
+    def line_count(self) -> int:
+        return len(self.lines)
+
+    def get_line(self, index: int) -> str:
+        return self.lines[index]
+
+    @property
+    def text(self) -> str:
+        """The full text, joined on first use."""
+        if self._text is None:
+            self._text = self.newline.join(self.lines)
+        return self._text
+
+
+class ProsaicDocument(Document):
+    """Document with cached text and copy-on-write snapshots.
+
+    Textual joins every line into a new string each time ``text`` is read;
+    here it is joined at most once per edit. Lines stay in one list, which
+    is what Textual's wrapping and navigation index into, and an edit in the
+    middle only moves the list's pointers.
+
+    The editor upgrades Textual's documents to this class in place, so state
+    is initialised lazily from the class defaults.
+    """
+
+    _version = 0
+    _text: str | None = None
+    _shared = False
+
+    @property
+    def version(self) -> int:
+        """Count of edits made, to tell snapshots of different text apart."""
+        return self._version
+
+    @property
+    def text(self) -> str:
+        text = self._text
+        if text is None:
+            text = self._text = self._newline.join(self._lines)
+        return text
+
+    def snapshot(self) -> DocumentSnapshot:
+        """Take a read-only view of the current text."""
+        self._shared = True
+        return DocumentSnapshot(self._lines, self._newline, self._version, self._text)
+
+    def replace_range(self, start: Location, end: Location, text: str) -> EditResult:
+        if self._shared:
+            self._lines = list(self._lines)
+            self._shared = False
+        self._text = None
+        self._version += 1
+        return super().replace_range(start, end, text)
+
+
+class ProsaicSyntaxAwareDocument(ProsaicDocument, SyntaxAwareDocument):
+    """Syntax-aware document with cached line byte lengths.
+
+    Tree-sitter edits need byte offsets, which Textual computes by encoding
+    every line above the edit, twice per keystroke. Here each line's UTF-8
+    length is kept in an array, with running totals recomputed only from
+    the first edited row onwards.
+    """
+
+    _line_bytes: array | None = None
+    _byte_totals: array | None = None
+    """Bytes before each row, excluding newlines; valid up to its length."""
+
+    def replace_range(self, start: Location, end: Location, text: str) -> EditResult:
+        (top_row, _), (bottom_row, _) = sorted((start, end))
+        result = super().replace_range(start, end, text)
+        line_bytes = self._line_bytes
+        if line_bytes is not None:
+            end_row = result.end_location[0]
+            line_bytes[top_row : bottom_row + 1] = array(
+                "I", [len(line.encode("utf-8")) for line in self._lines[top_row : end_row + 1]]
+            )
+            del self._byte_totals[top_row + 1 :]
+        return result
+
+    def _location_to_byte_offset(self, location: Location) -> int:
+        row, column = location
+        lines = self._lines
+        line_bytes = self._line_bytes
+        totals = self._byte_totals
+        if line_bytes is None or totals is None:
+            line_bytes = self._line_bytes = array(
+                "I", [len(line.encode("utf-8")) for line in lines]
+            )
+            totals = self._byte_totals = array("Q", [0])
+        row = min(row, len(lines))
+        if len(totals) <= row:
+            start = len(totals) - 1
+            totals.extend(islice(accumulate(line_bytes[start:row], initial=totals[start]), 1, None))
+        offset = totals[row] + row * len(self.newline)
+        if row < len(lines):
+            offset += len(lines[row][:column].encode("utf-8"))
+        return offset
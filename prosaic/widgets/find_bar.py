@@ -0,0 +1,222 @@
+"""Find and replace bar for the editor."""
+
+import re
+from bisect import bisect_left
+
+from textual import work
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Horizontal, Vertical
+from textual.widgets import Input, Static
+from textual.widgets.text_area import Selection
+from textual.worker import get_current_worker
+
+from prosaic.core.search import Match, SearchQuery, find_in_lines
+from prosaic.widgets.document import DocumentSnapshot
+from prosaic.widgets.spell_text_area import SpellCheckTextArea
+
+_INLINE_LINES = 5_000
+"""Documents with more lines than this are searched in a worker."""
+
+_BLOCK_ROWS = 20_000
+"""Rows a worker searches between checks for cancellation."""
+
+
+class FindBar(Vertical):
+    """Incremental find and replace for a SpellCheckTextArea.
+
+    Every match is highlighted as the query is typed. Large documents are
+    searched in a worker, the rows on screen first, so typing in the bar
+    doesn't wait for a full scan. Replace-all is applied as one edit, so a
+    single undo reverts it.
+    """
+
+    BINDINGS = [
+        Binding("alt+c", "toggle_case", "match case"),
+        Binding("alt+r", "toggle_regex", "regex"),
+    ]
+
+    def __init__(self, editor: SpellCheckTextArea, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.editor = editor
+        self.search_query = SearchQuery("")
+        self._matches: list[Match] = []
+        self._complete = True
+        self._error: str | None = None
+
+    def compose(self) -> ComposeResult:
+        with Horizontal():
+            yield Input(placeholder="find", id="find-query")
+            yield Static("", id="find-status")
+        with Horizontal(id="replace-row"):
+            yield Input(placeholder="replace all with", id="replace-query")
+            yield Static("enter replaces all", id="replace-hint")
+
+    @property
+    def matches(self) -> list[Match]:
+        """Matches found so far, in document order."""
+        return self._matches
+
+    def open(self, replace: bool = False) -> None:
+        """Show the bar, starting from the selected text if it is on one line."""
+        find_input = self.query_one("#find-query", Input)
+        selection = self.editor.selection
+        if (
+            not self.display
+            and selection.start != selection.end
+            and selection.start[0] == selection.end[0]
+        ):
+            text = self.editor.selected_text
+            find_input.value = re.escape(text) if self.search_query.regex else text
+        self.display = True
+        self.query_one("#replace-row").display = replace
+        if replace and find_input.value:
+            self.query_one("#replace-query", Input).focus()
+        else:
+            find_input.focus()
+        self.refresh_matches()
+
+    def close(self) -> None:
+        """Hide the bar and its highlights, and return to the editor."""
+        self.display = False
+        self.workers.cancel_group(self, "find")
+        self._matches = []
+        self.editor.set_find_matches([])
+        self.editor.focus()
+
+    def refresh_matches(self) -> None:
+        """Search the editor's document again, e.g. after the query or text changed."""
+        self.workers.cancel_group(self, "find")
+        self._error = None
+        pattern = self._compile()
+        if pattern is None:
+            self._show_matches(None, [], complete=True)
+            return
+        snapshot = self.editor.snapshot()
+        if snapshot.line_count <= _INLINE_LINES:
+            self._show_matches(None, find_in_lines(pattern, snapshot.lines), complete=True)
+        else:
+            self._complete = False
+            self._search(pattern, snapshot, self.editor.visible_rows(padded=False))
+
+    def find_next(self, backwards: bool = False) -> None:
+        """Select the next match after the selection, or the previous one before it."""
+        matches = self._matches
+        if not matches:
+            return
+        editor = self.editor
+        top, bottom = sorted(editor.selection)
+        if backwards:
+            index = bisect_left(matches, (*top, -1)) - 1
+        else:
+            index = bisect_left(matches, (*bottom, -1)) % len(matches)
+        row, start, end = matches[index]
+        editor.selection = Selection((row, start), (row, end))
+        editor.scroll_cursor_visible(center=True)
+        self._update_status()
+
+    def replace_all(self) -> None:
+        """Replace every match in the document as a single undoable edit."""
+        editor = self.editor
+        if self._compile() is None or editor.read_only:
+            return
+        replacement = self.query_one("#replace-query", Input).value
+        try:
+            count = editor.replace_all(self.search_query, replacement)
+        except re.error as error:
+            self.notify(f"Invalid replacement: {error}", severity="error")
+            return
+        if count:
+            self.notify(f"Replaced {count:,} {'match' if count == 1 else 'matches'}")
+        else:
+            self.notify("No matches to replace")
+
+    def _compile(self) -> re.Pattern[str] | None:
+        if not self.search_query.text:
+            return None
+        try:
+            return self.search_query.compile()
+        except re.error as error:
+            self._error = f"invalid pattern: {error.msg}"
+            return None
+
+    @work(thread=True, exclusive=True, group="find")
+    def _search(
+        self,
+        pattern: re.Pattern[str],
+        snapshot: DocumentSnapshot,
+        visible: tuple[int, int],
+    ) -> None:
+        """Search the rows on screen, then the whole document, off the UI thread."""
+        worker = get_current_worker()
+        lines = snapshot.lines
+        first, last = visible
+        matches = find_in_lines(pattern, lines, first, last)
+        if worker.is_cancelled:
+            return
+        self.app.call_from_thread(self._show_matches, snapshot.version, matches, False)
+
+        matches = []
+        for start in range(0, len(lines), _BLOCK_ROWS):
+            if worker.is_cancelled:
+                return
+            matches.extend(find_in_lines(pattern, lines, start, start + _BLOCK_ROWS))
+        if not worker.is_cancelled:
+            self.app.call_from_thread(self._show_matches, snapshot.version, matches, True)
+
+    def _show_matches(self, version: int | None, matches: list[Match], complete: bool) -> None:
+        """Highlight matches found in a given document version, if it is current."""
+        if version is not None and version != self.editor.document.version:
+            return
+        self._matches = matches
+        self._complete = complete
+        self.editor.set_find_matches(matches)
+        self._update_status()
+
+    def _update_status(self) -> None:
+        if self._error:
+            status = self._error
+        elif not self.search_query.text:
+            status = ""
+        elif not self._matches:
+            status = "searching…" if not self._complete else "no matches"
+        else:
+            top, bottom = sorted(self.editor.selection)
+            current = (top[0], top[1], bottom[1])
+            count = len(self._matches)
+            index = bisect_left(self._matches, current)
+            total = f"{count:,}" if self._complete else f"{count:,}+"
+            if index < count and self._matches[index] == current:
+                status = f"{index + 1:,} of {total}"
+            else:
+                status = f"{total} {'match' if count == 1 else 'matches'}"
+        parts = [status]
+        if not self.search_query.ignore_case:
+            parts.append("match case")
+        if self.search_query.regex:
+            parts.append("regex")
+        self.query_one("#find-status", Static).update(" · ".join(part for part in parts if part))
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "find-query":
+            self.search_query = SearchQuery(
+                event.value, self.search_query.ignore_case, self.search_query.regex
+            )
+            self.refresh_matches()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        event.stop()
+        if event.input.id == "replace-query":
+            self.replace_all()
+        else:
+            self.find_next()
+
+    def action_toggle_case(self) -> None:
+        options = self.search_query
+        self.search_query = SearchQuery(options.text, not options.ignore_case, options.regex)
+        self.refresh_matches()
+
+    def action_toggle_regex(self) -> None:
+        options = self.search_query
+        self.search_query = SearchQuery(options.text, options.ignore_case, not options.regex)
+        self.refresh_matches()
@@ -1,11 +1,25 @@
 """Outline panel showing document headings."""
 
+from difflib import SequenceMatcher
+
+from rich.segment import Segment
+from textual import events
 from textual.binding import Binding
 from textual.containers import Vertical
+from textual.geometry import Region, Size
 from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 from textual.widgets import Label, ListItem, ListView, Static
 
-from prosaic.core.markdown import Heading, extract_headings
+from prosaic.core.markdown import (
+    Heading,
+    HeadingArray,
+    extract_heading_array,
+)
+
+VIRTUALIZE_THRESHOLD = 200
 
 
 class OutlineListView(ListView, inherit_bindings=False):
@@ -30,6 +44,103 @@ class OutlineItem(ListItem):
         yield Label(self.heading.text)
 
 
+class VirtualOutline(ScrollView, can_focus=True, inherit_bindings=False):
+    """Outline list that renders only the visible rows of a HeadingArray."""
+
+    COMPONENT_CLASSES = {
+        "virtual-outline--cursor",
+        "virtual-outline--h1",
+        "virtual-outline--h2",
+        "virtual-outline--h3",
+    }
+
+    BINDINGS = [
+        Binding("enter", "select_cursor", "go to"),
+        Binding("up", "cursor_up", "up", show=False),
+        Binding("down", "cursor_down", "down", show=False),
+        Binding("pageup", "page_up", "page up", show=False),
+        Binding("pagedown", "page_down", "page down", show=False),
+        Binding("home", "first", "first", show=False),
+        Binding("end", "last", "last", show=False),
+    ]
+
+    cursor: reactive[int] = reactive(0, repaint=False)
+
+    class Selected(Message):
+        def __init__(self, heading: Heading) -> None:
+            self.heading = heading
+            super().__init__()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._headings = HeadingArray()
+
+    def set_headings(self, headings: HeadingArray) -> None:
+        self._headings = headings
+        self.virtual_size = Size(0, len(headings))
+        self.cursor = min(self.cursor, max(0, len(headings) - 1))
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        width = self.scrollable_content_region.width
+        index = self.scroll_offset.y + y
+        headings = self._headings
+        if index >= len(headings):
+            return Strip.blank(width, self.rich_style)
+
+        level = min(headings.levels[index], 3)
+        style = self.rich_style + self.get_component_rich_style(
+            f"virtual-outline--h{level}"
+        )
+        if index == self.cursor:
+            style += self.get_component_rich_style("virtual-outline--cursor")
+        label = " " * (1 + 2 * (level - 1)) + headings.texts[index]
+        return Strip([Segment(label, style)]).adjust_cell_length(width, style)
+
+    def watch_cursor(self, old: int, new: int) -> None:
+        self.refresh_line(old)
+        self.refresh_line(new)
+        self.scroll_to_region(
+            Region(0, new, 1, 1), animate=False, force=True, immediate=True
+        )
+
+    def _move(self, delta: int) -> None:
+        if len(self._headings):
+            self.cursor = max(0, min(len(self._headings) - 1, self.cursor + delta))
+
+    def action_cursor_up(self) -> None:
+        self._move(-1)
+
+    def action_cursor_down(self) -> None:
+        self._move(1)
+
+    def action_page_up(self) -> None:
+        self._move(-max(1, self.size.height - 1))
+
+    def action_page_down(self) -> None:
+        self._move(max(1, self.size.height - 1))
+
+    def action_first(self) -> None:
+        self._move(-self.cursor)
+
+    def action_last(self) -> None:
+        self._move(len(self._headings))
+
+    def action_select_cursor(self) -> None:
+        if self.cursor < len(self._headings):
+            self.post_message(self.Selected(self._headings[self.cursor]))
+
+    def on_click(self, event: events.Click) -> None:
+        # Rows are numbered from the content area, inside the padding.
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return
+        index = self.scroll_offset.y + offset.y
+        if index < len(self._headings):
+            self.cursor = index
+            self.action_select_cursor()
+
+
 class OutlinePanel(Vertical):
     """Outline panel showing document structure."""
 
@@ -45,14 +156,95 @@ class OutlinePanel(Vertical):
     def compose(self):
         yield Static("outline", id="outline-title", classes="panel-title")
         yield OutlineListView(id="outline-list")
+        virtual = VirtualOutline(id="outline-virtual")
+        virtual.display = False
+        yield virtual
 
     def update_headings(self, content: str) -> None:
-        self._headings = extract_headings(content)
+        """Refresh the outline from document content."""
+        self.show_headings(extract_heading_array(content))
+
+    def show_headings(self, headings: HeadingArray) -> None:
+        """Show already extracted headings.
+
+        Up to VIRTUALIZE_THRESHOLD headings are shown as list items, patched
+        in place; longer outlines switch to a VirtualOutline.
+        """
         outline_list = self.query_one("#outline-list", OutlineListView)
-        outline_list.clear()
-        for heading in self._headings:
-            outline_list.append(OutlineItem(heading, classes="outline-item"))
+        virtual = self.query_one("#outline-virtual", VirtualOutline)
+        if len(headings) > VIRTUALIZE_THRESHOLD:
+            if not virtual.display:
+                had_focus = outline_list.has_focus
+                outline_list.clear()
+                self._headings = []
+                outline_list.display = False
+                virtual.display = True
+                if had_focus:
+                    virtual.focus()
+            virtual.set_headings(headings)
+            return
+
+        if virtual.display:
+            had_focus = virtual.has_focus
+            virtual.set_headings(HeadingArray())
+            virtual.display = False
+            outline_list.display = True
+            if had_focus:
+                outline_list.focus()
+        self._patch_list([headings[i] for i in range(len(headings))])
+
+    def _patch_list(self, new_headings: list[Heading]) -> None:
+        """Diff the new headings against the current ones and patch the list.
+
+        Items for unchanged headings are kept and only get their line numbers
+        updated; items are mounted or removed only for headings that were
+        added or removed.
+        """
+        old_headings = self._headings
+        self._headings = new_headings
+        outline_list = self.query_one("#outline-list", OutlineListView)
+        old_items = list(outline_list.query(OutlineItem))
+        if len(old_items) != len(old_headings):
+            outline_list.clear()
+            old_items, old_headings = [], []
+
+        matcher = SequenceMatcher(
+            a=[(h.level, h.text) for h in old_headings],
+            b=[(h.level, h.text) for h in new_headings],
+            autojunk=False,
+        )
+        removed: list[int] = []
+        inserts: list[tuple[OutlineItem | None, list[OutlineItem]]] = []
+        last_kept: OutlineItem | None = None
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                for item, heading in zip(old_items[i1:i2], new_headings[j1:j2]):
+                    item.heading = heading
+                last_kept = old_items[i2 - 1]
+                continue
+            removed.extend(range(i1, i2))
+            if j2 > j1:
+                new_items = [
+                    OutlineItem(heading, classes="outline-item")
+                    for heading in new_headings[j1:j2]
+                ]
+                inserts.append((last_kept, new_items))
+
+        if removed:
+            outline_list.remove_items(removed)
+        removed_set = set(removed)
+        kept = [item for i, item in enumerate(old_items) if i not in removed_set]
+        for after, new_items in inserts:
+            if after is not None:
+                outline_list.mount(*new_items, after=after)
+            elif kept:
+                outline_list.mount(*new_items, before=kept[0])
+            else:
+                outline_list.extend(new_items)
 
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         if isinstance(event.item, OutlineItem):
             self.post_message(self.HeadingSelected(event.item.heading.line))
+
+    def on_virtual_outline_selected(self, event: VirtualOutline.Selected) -> None:
+        self.post_message(self.HeadingSelected(event.heading.line))
@@ -1,15 +1,45 @@
 """TextArea subclass with live spell-check underlines and markdown highlighting."""
 
+import dataclasses
 import re
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any
 
 from rich.style import Style
+from rich.text import Text
 from spellchecker import SpellChecker
 from textual.binding import Binding
+from textual.geometry import Offset
+from textual.reactive import reactive
+from textual.document._document import Document, DocumentBase, EditResult
+from textual.document._document_navigator import DocumentNavigator
+from textual.document._edit import Edit
+from textual.document._history import EditHistory
+from textual.document._syntax_aware_document import SyntaxAwareDocument
+from textual.document._wrapped_document import WrappedDocument
 from textual.widgets import TextArea
-from textual.widgets.text_area import TextAreaTheme
+from textual.widgets.text_area import Selection, TextAreaTheme
+
+from prosaic.core.analyzers import EditDelta
+from prosaic.core.merge import changed_rows
+from prosaic.core.search import SearchQuery, replace_in_lines
+from prosaic.core.spans import SpanStore, intern_style
+from prosaic.core.vocabulary import Vocabulary
+from prosaic.widgets.document import (
+    DocumentSnapshot,
+    ProsaicDocument,
+    ProsaicSyntaxAwareDocument,
+)
+from prosaic.widgets.wrapping import ProsaicDocumentNavigator, ProsaicWrappedDocument
+
+EditListener = Callable[[EditDelta], None]
 
 _LIGHT_MARKER = Style(color="#b8a090")
 _DARK_MARKER = Style(color="#6a5a4a")
+_SPELL_STYLE = Style(underline=True, color="#c24038")
 
 PROSAIC_LIGHT_TA = TextAreaTheme(
     name="prosaic_light",
@@ -36,6 +66,8 @@ PROSAIC_LIGHT_TA = TextAreaTheme(
         "inline_code": Style(color="#715e12", bgcolor="#f0ece0"),
         "code.marker": _LIGHT_MARKER,
         "list.marker": Style(color="#8a6d60"),
+        "spell.error": _SPELL_STYLE,
+        "find.match": Style(bgcolor="#f0dfa8"),
     },
 )
 
@@ -64,12 +96,13 @@ PROSAIC_DARK_TA = TextAreaTheme(
         "inline_code": Style(color="#c9a86c", bgcolor="#2a2520"),
         "code.marker": _DARK_MARKER,
         "list.marker": Style(color="#8a7a6a"),
+        "spell.error": _SPELL_STYLE,
+        "find.match": Style(bgcolor="#4d4020"),
     },
 )
 
 _SKIP_LINE = re.compile(r"^(#{1,6}\s|```|---|\s*[-*+]\s|\s*\d+\.\s|>\s|!\[)")
 _WORD = re.compile(r"\b([a-zA-Z']{3,})\b")
-_SPELL_STYLE = Style(underline=True, color="#c24038")
 
 _BOLD_ASTERISK = re.compile(r"(\*\*)([^*]+)(\*\*)")
 _BOLD_UNDERSCORE = re.compile(r"(__)([^_]+)(__)")
@@ -77,6 +110,40 @@ _ITALIC_ASTERISK = re.compile(r"(?<!\*)(\*)([^*]+)(\*)(?!\*)")
 _ITALIC_UNDERSCORE = re.compile(r"(?<!_)(_)([^_]+)(_)(?!_)")
 _INLINE_CODE = re.compile(r"(`)([^`]+)(`)")
 
+_HEADING_LINE = re.compile(r"^(#{1,6})(\s+.+)$")
+_WORD_JOINERS = "'’-"
+_FOLD_MARKER = Style(dim=True)
+
+_SPELL_ERROR = intern_style("spell.error")
+_HEADING_MARKER = intern_style("heading.marker")
+_HEADING_TEXT = intern_style("heading")
+_FIND_MATCH = intern_style("find.match")
+_INLINE_PATTERNS = [
+    (_INLINE_CODE, intern_style("code.marker"), intern_style("inline_code")),
+    (_BOLD_ASTERISK, intern_style("bold.marker"), intern_style("bold")),
+    (_BOLD_UNDERSCORE, intern_style("bold.marker"), intern_style("bold")),
+    (_ITALIC_ASTERISK, intern_style("italic.marker"), intern_style("italic")),
+    (_ITALIC_UNDERSCORE, intern_style("italic.marker"), intern_style("italic")),
+]
+
+
+
+@dataclass
+class EditorState:
+    """Everything a SpellCheckTextArea needs to resume editing a document."""
+
+    document: DocumentBase
+    wrapped_document: WrappedDocument
+    highlight_query: Any
+    language: str | None
+    large_file: bool
+    history: EditHistory
+    selection: Any
+    scroll: tuple[float, float]
+    highlights: SpanStore
+    misspelled: SpanStore
+    md_highlights: SpanStore
+    scanned_rows: tuple[int, int] | None
 
 
 class SpellCheckTextArea(TextArea, inherit_bindings=False):
@@ -85,6 +152,8 @@ class SpellCheckTextArea(TextArea, inherit_bindings=False):
     BINDINGS = [
         Binding("ctrl+a", "select_all", "select all"),
         Binding("ctrl+k", "toggle_comment", "comment", priority=True),
+        Binding("f7", "toggle_fold", "fold section"),
+        Binding("shift+f7", "fold_others", "fold other sections"),
         Binding("up", "cursor_up", "cursor up", show=False),
         Binding("down", "cursor_down", "cursor down", show=False),
         Binding("left", "cursor_left", "cursor left", show=False),
@@ -118,23 +187,204 @@ class SpellCheckTextArea(TextArea, inherit_bindings=False):
         Binding("ctrl+y", "redo", "redo", show=False),
     ]
 
+    large_file: reactive[bool] = reactive(False, init=False)
+    """Highlight only the rows around the viewport instead of the whole document."""
+
     def __init__(self, *args, **kwargs) -> None:
         self._spell: SpellChecker = SpellChecker()
-        self._misspelled: dict[int, list[tuple[int, int]]] = {}
-        self._md_highlights: dict[int, list[tuple[int, int, str]]] = {}
+        self._misspelled = SpanStore()
+        self._md_highlights = SpanStore()
+        self._scanned_rows: tuple[int, int] | None = None
+        self._visible_scan_pending = False
+        self._syntax_language: str | None = kwargs.get("language")
+        self._edit_listeners: list[EditListener] = []
+        self._preloaded_highlights: SpanStore | None = None
+        self._pending_scroll: tuple[float, float] | None = None
+        self._find_matches = SpanStore()
+        self.vocabulary: Vocabulary | None = None
         requested_theme = kwargs.pop("theme", "prosaic_light")
         super().__init__(*args, **kwargs)
         self.register_theme(PROSAIC_LIGHT_TA)
         self.register_theme(PROSAIC_DARK_TA)
         self.theme = requested_theme
 
-    def _scan_inline_markdown(self, text: str) -> None:
-        """Scan for inline markdown elements (bold, italic, code)."""
+    def load_text(self, text: str, highlights: SpanStore | None = None) -> None:
+        """Load text into the editor, clearing the edit history.
+
+        Args:
+            text: The text to load.
+            highlights: Highlights already computed for exactly this text,
+                e.g. from the analysis cache, used instead of scanning it.
+        """
+        self._preloaded_highlights = highlights
+        self._pending_scroll = None
+        try:
+            super().load_text(text)
+        finally:
+            self._preloaded_highlights = None
+
+    def restore_view(self, selection: Selection, scroll: tuple[float, float]) -> None:
+        """Put back a saved cursor and scroll position.
+
+        Before the first layout the editor has no height to scroll within, so
+        the scroll position is applied once it is sized.
+        """
+        self.selection = selection
+        if self.size.height:
+            self.scroll_to(*scroll, animate=False, immediate=True)
+        else:
+            self._pending_scroll = scroll
+
+    def document_highlights(self) -> SpanStore | None:
+        """Get the highlights for the whole document, to cache for reopening.
+
+        Returns:
+            The highlights, or None for a large file, which only highlights
+            the rows around the viewport, or while sections are folded.
+        """
+        if self.large_file or self.wrapped_document.folds:
+            return None
+        return self._highlights
+
+    def detach_state(self) -> EditorState:
+        """Hand over the current document, undo history and highlights.
+
+        The editor keeps showing the document but gets a fresh history and
+        highlight stores, so loading another document cannot disturb the
+        detached state.
+        """
+        state = EditorState(
+            document=self.document,
+            wrapped_document=self.wrapped_document,
+            highlight_query=self._highlight_query,
+            language=self.language,
+            large_file=self.large_file,
+            history=self.history,
+            selection=self.selection,
+            scroll=(self.scroll_x, self.scroll_y),
+            highlights=self._highlights,
+            misspelled=self._misspelled,
+            md_highlights=self._md_highlights,
+            scanned_rows=self._scanned_rows,
+        )
+        self.history = dataclasses.replace(self.history)
+        self._highlights = SpanStore()
+        self._misspelled = SpanStore()
+        self._md_highlights = SpanStore()
+        return state
+
+    def restore_state(self, state: EditorState) -> None:
+        """Resume editing a detached document without re-reading or rescanning it."""
+        self.set_reactive(TextArea.language, state.language)
+        self.set_reactive(SpellCheckTextArea.large_file, state.large_file)
+        self.document = state.document
+        self.wrapped_document = state.wrapped_document
+        self.navigator = DocumentNavigator(self.wrapped_document)
+        self._highlight_query = state.highlight_query
+        self.history = state.history
+        self._highlights = state.highlights
+        self._misspelled = state.misspelled
+        self._md_highlights = state.md_highlights
+        self._scanned_rows = state.scanned_rows
+
+        # Sizing first may toggle the scrollbar back to how it was when the
+        # state was detached, so the cached wrapping usually still fits.
+        self._line_cache.clear()
+        self._refresh_size()
+        if self._wrap_is_stale():
+            self._rewrap_and_refresh_virtual_size()
+        self.selection = state.selection
+        self.scroll_to(*state.scroll, animate=False, immediate=True)
+        if self.large_file:
+            self._schedule_visible_scan()
+        self.refresh()
+
+    def _wrap_is_stale(self) -> bool:
+        wrapped = self.wrapped_document
+        return wrapped._width != self.wrap_width or wrapped._tab_width != self.indent_width
+
+    def _watch_show_vertical_scrollbar(self) -> None:
+        if self.wrap_width and self._wrap_is_stale():
+            self._rewrap_and_refresh_virtual_size()
+        self.scroll_cursor_visible()
+
+    def snapshot(self) -> DocumentSnapshot:
+        """Take a read-only view of the text for a background worker to read."""
+        return self.document.snapshot()
+
+    def add_edit_listener(self, listener: EditListener) -> None:
+        """Call listener with an EditDelta for every replacement made.
+
+        Listeners see edits, undos and redos in the order they are applied
+        to the document, but not whole-document loads.
+        """
+        self._edit_listeners.append(listener)
+
+    def edit(self, edit: Edit) -> EditResult:
+        result = super().edit(edit)
+        self._publish(EditDelta(edit.top, edit.bottom, edit.text))
+        return result
+
+    def _undo_batch(self, edits: Sequence[Edit]) -> None:
+        super()._undo_batch(edits)
+        for edit in reversed(edits):
+            if edit._edit_result is None:
+                continue
+            result = edit._edit_result
+            self._publish(EditDelta(edit.top, result.end_location, result.replaced_text))
+
+    def _redo_batch(self, edits: Sequence[Edit]) -> None:
+        super()._redo_batch(edits)
+        for edit in edits:
+            self._publish(EditDelta(edit.top, edit.bottom, edit.text))
+
+    def _publish(self, delta: EditDelta) -> None:
+        for listener in self._edit_listeners:
+            listener(delta)
+
+    @property
+    def document(self) -> DocumentBase:
+        return self._document
+
+    @document.setter
+    def document(self, document: DocumentBase) -> None:
+        # Upgrade the documents TextArea builds in place, keeping their lines.
+        if type(document) is Document:
+            document.__class__ = ProsaicDocument
+        elif type(document) is SyntaxAwareDocument:
+            document.__class__ = ProsaicSyntaxAwareDocument
+        self._document = document
+
+    @property
+    def navigator(self) -> ProsaicDocumentNavigator:
+        return self._navigator
+
+    @navigator.setter
+    def navigator(self, navigator: DocumentNavigator) -> None:
+        if type(navigator) is DocumentNavigator:
+            navigator.__class__ = ProsaicDocumentNavigator
+        self._navigator = navigator
+
+    @property
+    def wrapped_document(self) -> ProsaicWrappedDocument:
+        return self._wrapped_document
+
+    @wrapped_document.setter
+    def wrapped_document(self, wrapped: WrappedDocument) -> None:
+        # TextArea builds a plain WrappedDocument in _set_document; upgrade it
+        # in place rather than wrapping the whole document a second time.
+        if type(wrapped) is WrappedDocument:
+            wrapped.__class__ = ProsaicWrappedDocument
+        self._wrapped_document = wrapped
+
+    def _scan_inline_markdown(self, rows: Iterable[tuple[int, str]]) -> None:
+        """Scan ``(row, line)`` pairs for inline markdown (bold, italic, code)."""
         self._md_highlights.clear()
+        add = self._md_highlights.add
         in_frontmatter = False
         in_code_block = False
 
-        for row, line in enumerate(text.split("\n")):
+        for row, line in rows:
             stripped = line.strip()
 
             if row == 0 and stripped == "---":
@@ -151,42 +401,19 @@ class SpellCheckTextArea(TextArea, inherit_bindings=False):
             if in_code_block:
                 continue
 
-            highlights: list[tuple[int, int, str]] = []
-
-            for m in _INLINE_CODE.finditer(line):
-                highlights.append((m.start(1), m.end(1), "code.marker"))
-                highlights.append((m.start(2), m.end(2), "inline_code"))
-                highlights.append((m.start(3), m.end(3), "code.marker"))
-
-            for m in _BOLD_ASTERISK.finditer(line):
-                highlights.append((m.start(1), m.end(1), "bold.marker"))
-                highlights.append((m.start(2), m.end(2), "bold"))
-                highlights.append((m.start(3), m.end(3), "bold.marker"))
-
-            for m in _BOLD_UNDERSCORE.finditer(line):
-                highlights.append((m.start(1), m.end(1), "bold.marker"))
-                highlights.append((m.start(2), m.end(2), "bold"))
-                highlights.append((m.start(3), m.end(3), "bold.marker"))
-
-            for m in _ITALIC_ASTERISK.finditer(line):
-                highlights.append((m.start(1), m.end(1), "italic.marker"))
-                highlights.append((m.start(2), m.end(2), "italic"))
-                highlights.append((m.start(3), m.end(3), "italic.marker"))
-
-            for m in _ITALIC_UNDERSCORE.finditer(line):
-                highlights.append((m.start(1), m.end(1), "italic.marker"))
-                highlights.append((m.start(2), m.end(2), "italic"))
-                highlights.append((m.start(3), m.end(3), "italic.marker"))
+            for pattern, marker, style in _INLINE_PATTERNS:
+                for m in pattern.finditer(line):
+                    add(row, m.start(1), m.end(1), marker)
+                    add(row, m.start(2), m.end(2), style)
+                    add(row, m.start(3), m.end(3), marker)
 
-            if highlights:
-                self._md_highlights[row] = highlights
-
-    def _scan_spelling(self, text: str) -> None:
+    def _scan_spelling(self, rows: Iterable[tuple[int, str]]) -> None:
+        """Scan ``(row, line)`` pairs for misspelled words."""
         self._misspelled.clear()
         in_frontmatter = False
         in_code_block = False
 
-        for row, line in enumerate(text.split("\n")):
+        for row, line in rows:
             stripped = line.strip()
 
             if row == 0 and stripped == "---":
@@ -206,36 +433,380 @@ class SpellCheckTextArea(TextArea, inherit_bindings=False):
             if not stripped or _SKIP_LINE.match(stripped):
                 continue
 
-            spans: list[tuple[int, int]] = []
             for m in _WORD.finditer(line):
                 word = m.group(1).strip("'")
                 if self._spell.unknown([word]):
-                    spans.append((m.start(), m.end()))
-            if spans:
-                self._misspelled[row] = spans
+                    self._misspelled.add(row, m.start(), m.end(), _SPELL_ERROR)
 
     def _build_highlight_map(self) -> None:
+        if not isinstance(self._highlights, SpanStore):
+            self._highlights = SpanStore()
+        if self.large_file:
+            self._build_visible_highlight_map()
+            return
+        self._scanned_rows = None
+        if self._preloaded_highlights is not None:
+            self._line_cache.clear()
+            self._highlights = self._preloaded_highlights
+            self._misspelled.clear()
+            self._md_highlights.clear()
+            return
+        folds = self.wrapped_document.folds
+        if not folds:
+            rows = list(enumerate(self.document.lines))
+            self._scan_spelling(rows)
+            self._scan_inline_markdown(rows)
+            super()._build_highlight_map()
+        else:
+            # Folded rows are scanned when they are unfolded.
+            self._line_cache.clear()
+            self._highlights.clear()
+            segments = self.wrapped_document.visible_segments(0, self.document.line_count)
+            rows = list(self._iter_rows(segments))
+            self._scan_spelling(rows)
+            self._scan_inline_markdown(rows)
+            for first, last in segments:
+                self._add_syntax_highlights(first, last)
+        self._highlights.merge(self._misspelled)
+        self._highlights.merge(self._md_highlights)
+
+    def _iter_rows(self, segments: list[tuple[int, int]]) -> Iterator[tuple[int, str]]:
+        """Yield ``(row, line)`` for every row in the given row ranges."""
+        lines = self.document.lines
+        for first, last in segments:
+            yield from enumerate(lines[first:last], first)
+
+    def _build_visible_highlight_map(self) -> None:
+        """Highlight only the rows in and around the viewport.
+
+        Code fences and frontmatter that start above the scanned rows are not
+        tracked, so highlighting inside them may be approximate.
+        """
+        self._line_cache.clear()
+        self._highlights.clear()
+        first, last = self.visible_rows()
+        self._scanned_rows = (first, last)
+        segments = self.wrapped_document.visible_segments(first, last)
+        rows = list(self._iter_rows(segments))
+        self._scan_spelling(rows)
+        self._scan_inline_markdown(rows)
+        for first, last in segments:
+            self._add_syntax_highlights(first, last)
+        self._highlights.merge(self._misspelled)
+        self._highlights.merge(self._md_highlights)
+
+    def _add_syntax_highlights(self, first: int, last: int) -> None:
+        """Highlight the syntax of the rows from first up to last.
+
+        Without a syntax tree, only headings are recognised.
+        """
+        add = self._highlights.add
+        if self._highlight_query:
+            captures = self.document.query_syntax_tree(
+                self._highlight_query, (first, 0), (last, 0)
+            )
+            for name, nodes in captures.items():
+                style_id = intern_style(name)
+                for node in nodes:
+                    start_row, start_column = node.start_point
+                    end_row, end_column = node.end_point
+                    if start_row == end_row:
+                        add(start_row, start_column, end_column, style_id)
+                        continue
+                    add(start_row, start_column, None, style_id)
+                    for row in range(max(start_row + 1, first), min(end_row, last)):
+                        add(row, 0, None, style_id)
+                    add(end_row, 0, end_column, style_id)
+        else:
+            get_line = self.document.get_line
+            for row in range(first, last):
+                match = _HEADING_LINE.match(get_line(row))
+                if match:
+                    add(row, 0, match.end(1), _HEADING_MARKER)
+                    add(row, match.end(1), match.end(2), _HEADING_TEXT)
+
+    def visible_rows(self, padded: bool = True) -> tuple[int, int]:
+        """Document rows in the viewport, optionally padded by a screen each way."""
+        line_count = self.document.line_count
+        height = max(self.size.height, 1)
+        padding = height if padded else 0
+        top, bottom = self._visible_line_indices
         try:
-            if self._theme is not None:
-                self._theme.syntax_styles["spell.error"] = _SPELL_STYLE
-        except Exception:
-            pass
-
-        self._scan_spelling(self.text)
-        self._scan_inline_markdown(self.text)
-        super()._build_highlight_map()
-
-        for row, spans in self._misspelled.items():
-            if row not in self._highlights:
-                self._highlights[row] = []
-            for col_s, col_e in spans:
-                self._highlights[row].append((col_s, col_e, "spell.error"))
-
-        for row, highlights in self._md_highlights.items():
-            if row not in self._highlights:
-                self._highlights[row] = []
-            for col_s, col_e, style in highlights:
-                self._highlights[row].append((col_s, col_e, style))
+            first = self.wrapped_document.offset_to_location(Offset(0, top))[0]
+            last = self.wrapped_document.offset_to_location(Offset(0, bottom))[0]
+        except (IndexError, ValueError):
+            first, last = 0, height
+        return max(0, first - padding), min(line_count, last + padding + 1)
+
+    def _schedule_visible_scan(self) -> None:
+        if not self._visible_scan_pending:
+            self._visible_scan_pending = True
+            self.call_after_refresh(self._rescan_visible)
+
+    def _rescan_visible(self) -> None:
+        self._visible_scan_pending = False
+        if not self.large_file or self._scanned_rows is None:
+            return
+        first, last = self.visible_rows(padded=False)
+        scanned_first, scanned_last = self._scanned_rows
+        if first < scanned_first or last > scanned_last:
+            self._build_highlight_map()
+            self.refresh()
+
+    def watch_large_file(self, large: bool) -> None:
+        """Drop tree-sitter parsing for large files and restore it afterwards."""
+        language = None if large else self._syntax_language
+        if language != self.language:
+            selection = self.selection
+            self.language = language
+            self.selection = selection
+        else:
+            self._build_highlight_map()
+        self.refresh()
+
+    def _watch_scroll_y(self) -> None:
+        super()._watch_scroll_y()
+        if self.large_file:
+            self._schedule_visible_scan()
+
+    def _on_resize(self) -> None:
+        super()._on_resize()
+        if self._pending_scroll is not None and self.size.height:
+            scroll, self._pending_scroll = self._pending_scroll, None
+            self.scroll_to(*scroll, animate=False, immediate=True)
+        if self.large_file:
+            self._schedule_visible_scan()
+
+    def set_find_matches(self, matches: Iterable[tuple[int, int, int]]) -> None:
+        """Highlight find matches, given as ``(row, start, end)``, instead of the last ones.
+
+        Matches are styled as lines are rendered rather than merged into the
+        highlights, so changing them doesn't rescan the document.
+        """
+        store = SpanStore()
+        for row, start, end in matches:
+            store.add(row, start, end, _FIND_MATCH)
+        if store or self._find_matches:
+            self._find_matches = store
+            self._line_cache.clear()
+            self.refresh()
+
+    def replace_all(self, query: SearchQuery, replacement: str) -> int:
+        """Replace every match of a query as a single undoable edit.
+
+        Returns:
+            The number of matches replaced.
+
+        Raises:
+            re.error: If the query or the replacement is invalid.
+        """
+        lines = self.document.lines
+        result = replace_in_lines(query, query.compile(), lines, replacement)
+        if result is None:
+            return 0
+        end = (result.last_row, len(lines[result.last_row]))
+        self.history.checkpoint()
+        self.replace("\n".join(result.lines), (result.first_row, 0), end)
+        self.history.checkpoint()
+        return result.count
+
+    def update_text(self, text: str) -> bool:
+        """Change the text to the given text as one undoable edit.
+
+        Only the rows that differ are replaced, so highlights, folds and
+        the cursor elsewhere in the document are kept.
+
+        Returns:
+            Whether the text changed.
+        """
+        lines = self.document.lines
+        new_lines = text.split("\n")
+        change = changed_rows(lines, new_lines)
+        if change is None:
+            return False
+        first, old_end, new_end = change
+        end = self.document.end
+        if old_end < len(lines):
+            # Replace whole rows, line breaks included, up to an unchanged row.
+            start, end = (first, 0), (old_end, 0)
+            insert = "".join(line + "\n" for line in new_lines[first:new_end])
+        elif first < len(lines) and first < len(new_lines):
+            start = (first, 0)
+            insert = "\n".join(new_lines[first:])
+        elif first == len(lines):
+            start = end
+            insert = "\n" + "\n".join(new_lines[first:])
+        else:
+            start = (first - 1, len(lines[first - 1]))
+            insert = ""
+        self.history.checkpoint()
+        self.replace(insert, start, end)
+        self.history.checkpoint()
+        return True
+
+    def get_line(self, line_index: int) -> Text:
+        line = super().get_line(line_index)
+        style = self._theme.syntax_styles.get("find.match") if self._theme else None
+        if style is not None and line_index in self._find_matches:
+            for start, end, _ in self._find_matches.spans(line_index):
+                line.stylize(style, start, end)
+        folds = self.wrapped_document.folds
+        if folds:
+            index = bisect_left(folds, (line_index, -1))
+            if index < len(folds) and folds[index][0] == line_index:
+                hidden = folds[index][1] - line_index
+                line.append(f" … {hidden} {'line' if hidden == 1 else 'lines'}", _FOLD_MARKER)
+        return line
+
+    def update_suggestion(self) -> None:
+        """Suggest the rest of the word before the cursor from the vocabulary.
+
+        Right arrow accepts the suggestion. Nothing is suggested with a
+        selection or in the middle of a word.
+        """
+        self.suggestion = self._completion()
+
+    def _completion(self) -> str:
+        vocabulary = self.vocabulary
+        selection = self.selection
+        if vocabulary is None or self.read_only or not selection.is_empty:
+            return ""
+        row, column = selection.end
+        line = self.document[row]
+        if column < len(line) and line[column].isalnum():
+            return ""
+        start = column
+        while start > 0 and (line[start - 1].isalpha() or line[start - 1] in _WORD_JOINERS):
+            start -= 1
+        prefix = line[start:column].lstrip(_WORD_JOINERS)
+        completion = vocabulary.complete(prefix)
+        return completion[len(prefix) :] if completion else ""
+
+    def _watch_selection(self, previous_selection: Selection, selection: Selection) -> None:
+        # A suggestion only applies where it was made; edits make a new one.
+        self.suggestion = ""
+        # Moving the cursor into a folded section, e.g. from the outline or
+        # past the end of the heading, opens it.
+        wrapped = self.wrapped_document
+        if wrapped.folds:
+            fold = wrapped.fold_containing(selection.end[0])
+            if fold is not None:
+                self._set_folds([f for f in wrapped.folds if f != fold])
+        super()._watch_selection(previous_selection, selection)
+
+    def section_range(self, row: int) -> tuple[int, int] | None:
+        """Get the section a row belongs to, as ``(heading_row, last_row)``.
+
+        A section runs from a heading to the row before the next heading of
+        the same or a higher level. Headings inside code fences don't count.
+
+        Returns:
+            The section, or None if the row is above the first heading.
+        """
+        lines = self.document.lines
+        heading_row = None
+        level = 0
+        for candidate in range(min(row, len(lines) - 1), -1, -1):
+            match = _HEADING_LINE.match(lines[candidate])
+            if match:
+                heading_row, level = candidate, len(match.group(1))
+                break
+        if heading_row is None:
+            return None
+
+        in_code_block = False
+        for candidate in range(heading_row + 1, len(lines)):
+            line = lines[candidate]
+            if line.lstrip().startswith("```"):
+                in_code_block = not in_code_block
+                continue
+            if in_code_block:
+                continue
+            match = _HEADING_LINE.match(line)
+            if match and len(match.group(1)) <= level:
+                return heading_row, candidate - 1
+        return heading_row, len(lines) - 1
+
+    def fold_section(self, row: int) -> bool:
+        """Fold the section containing a row, leaving its heading visible.
+
+        Returns:
+            True if anything was folded.
+        """
+        section = self.section_range(row)
+        if section is None or section[1] <= section[0]:
+            return False
+        self.move_cursor((section[0], len(self.document.get_line(section[0]))))
+        self._set_folds([*self.wrapped_document.folds, section])
+        return True
+
+    def unfold_section(self, heading_row: int) -> bool:
+        """Unfold the section under a folded heading.
+
+        Returns:
+            True if the heading was folded.
+        """
+        folds = self.wrapped_document.folds
+        remaining = [fold for fold in folds if fold[0] != heading_row]
+        if len(remaining) == len(folds):
+            return False
+        self._set_folds(remaining)
+        return True
+
+    def fold_others(self) -> None:
+        """Fold every chapter-level section except the one containing the cursor.
+
+        Chapters are the highest heading level used more than once, so a
+        single title heading above them is left alone.
+        """
+        lines = self.document.lines
+        headings = []
+        in_code_block = False
+        for row, line in enumerate(lines):
+            if line.lstrip().startswith("```"):
+                in_code_block = not in_code_block
+            elif not in_code_block and (match := _HEADING_LINE.match(line)):
+                headings.append((row, len(match.group(1))))
+        if not headings:
+            return
+        levels = Counter(level for _, level in headings)
+        chapter_level = min(
+            (level for level, count in levels.items() if count > 1), default=min(levels)
+        )
+        starts = [row for row, level in headings if level == chapter_level]
+        cursor_row = self.cursor_location[0]
+        folds = []
+        for heading_row in starts:
+            section = self.section_range(heading_row)
+            if section is not None and not section[0] <= cursor_row <= section[1]:
+                folds.append(section)
+        self._set_folds(folds)
+
+    def unfold_all(self) -> None:
+        """Unfold every section."""
+        self._set_folds([])
+
+    def _set_folds(self, folds: list[tuple[int, int]]) -> None:
+        """Apply new folds, then rescan the rows that became visible."""
+        self.wrapped_document.set_folds(folds)
+        self._line_cache.clear()
+        self._refresh_size()
+        self._build_highlight_map()
+        self.scroll_cursor_visible()
+        self.refresh()
+
+    def action_toggle_fold(self) -> None:
+        """Fold the section at the cursor, or unfold it if it is folded."""
+        row = self.cursor_location[0]
+        if not self.unfold_section(row):
+            self.fold_section(row)
+
+    def action_fold_others(self) -> None:
+        """Fold every other top-level section, or unfold everything if folded."""
+        if self.wrapped_document.folds:
+            self.unfold_all()
+        else:
+            self.fold_others()
 
     def action_toggle_comment(self) -> None:
         """Toggle markdown comment on current line."""
@@ -61,12 +61,14 @@ class StatusBar(Horizontal):
     characters: reactive[int] = reactive(0)
     modified: reactive[bool] = reactive(False)
     git_status: reactive[str] = reactive("")
+    large_file: reactive[bool] = reactive(False)
 
     def compose(self):
         yield Static("○", id="autosave")
         yield Static("untitled", id="filename")
         yield Static("", id="modified")
         yield Static("", id="git")
+        yield Static("", id="mode")
         yield Static("", classes="spacer")
         yield Static("0 words", id="word-count")
         yield Static("·", classes="sep")
@@ -84,6 +86,9 @@ class StatusBar(Horizontal):
             self.query_one("#git", Static).update(
                 f"  {self.git_status}" if self.git_status else ""
             )
+            self.query_one("#mode", Static).update(
+                "  large file" if self.large_file else ""
+            )
             self.query_one("#word-count", Static).update(f"{self.words:,} words")
             self.query_one("#char-count", Static).update(f"{self.characters:,} chars")
         except Exception:
@@ -107,6 +112,12 @@ class StatusBar(Horizontal):
         except Exception:
             pass
 
+    def watch_large_file(self, large: bool) -> None:
+        try:
+            self.query_one("#mode", Static).update("  large file" if large else "")
+        except Exception:
+            pass
+
     def watch_words(self, words: int) -> None:
         try:
             self.query_one("#word-count", Static).update(f"{words:,} words")
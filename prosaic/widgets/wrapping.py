@@ -0,0 +1,294 @@
+"""Wrapped document used by the editor."""
+
+from bisect import bisect_left, bisect_right
+
+from textual._cells import cell_width_to_column_index
+from textual._wrap import compute_wrap_offsets, re_chunk
+from textual.document._document import Location
+from textual.document._document_navigator import DocumentNavigator
+from textual.document._wrapped_document import WrappedDocument
+from textual.geometry import Offset
+
+
+class ProsaicWrappedDocument(WrappedDocument):
+    """WrappedDocument with a constant-time height and folded rows.
+
+    Textual recomputes the height by summing every line's wrap offsets, and
+    the TextArea asks for it for each rendered line. The offset-to-line table
+    already has exactly one entry per wrapped line, so its length is the height.
+
+    A fold hides the rows after a heading row, up to and including its last
+    row. Hidden rows keep their wrap offsets but get no entries in the
+    offset-to-line table, so nothing renders them and vertical navigation
+    passes over them. Each maps back to the last visual line of its heading.
+    An edit touching a fold, its heading included, removes the fold.
+
+    Textual rewraps every line an edit touches from its first character, so
+    each key typed into a long paragraph costs a pass over the whole
+    paragraph. An edit within one line instead keeps the wrap offsets before
+    the edit, rewraps from there, and stops once the new breaks line up with
+    the old ones again.
+
+    The editor upgrades Textual's wrapped documents to this class in place,
+    so state is initialised lazily from the class defaults.
+    """
+
+    _folds: tuple[tuple[int, int], ...] = ()
+    """Sorted, non-overlapping ``(heading_row, last_row)`` pairs."""
+
+    @property
+    def height(self) -> int:
+        return len(self._offset_to_line_info)
+
+    @property
+    def folds(self) -> tuple[tuple[int, int], ...]:
+        """The folded ranges, as ``(heading_row, last_row)`` pairs."""
+        return self._folds
+
+    def set_folds(self, folds: list[tuple[int, int]]) -> None:
+        """Replace the folded ranges.
+
+        Nested and overlapping ranges are merged into the outermost one.
+        """
+        merged: list[tuple[int, int]] = []
+        for heading_row, last_row in sorted(folds):
+            if last_row <= heading_row:
+                continue
+            if merged and heading_row <= merged[-1][1]:
+                previous_heading, previous_last = merged[-1]
+                merged[-1] = (previous_heading, max(previous_last, last_row))
+            else:
+                merged.append((heading_row, last_row))
+        self._folds = tuple(merged)
+        self._rebuild_offsets()
+
+    def fold_containing(self, row: int) -> tuple[int, int] | None:
+        """Get the fold that hides a row, if any."""
+        folds = self._folds
+        index = bisect_right(folds, (row, -1)) - 1
+        if index >= 0:
+            heading_row, last_row = folds[index]
+            if heading_row < row <= last_row:
+                return folds[index]
+        return None
+
+    def visible_segments(self, first: int, last: int) -> list[tuple[int, int]]:
+        """Split the rows from first up to last into runs of unfolded rows."""
+        segments = []
+        start = first
+        for heading_row, last_row in self._folds:
+            if last_row < start:
+                continue
+            if heading_row >= last:
+                break
+            if heading_row + 1 > start:
+                segments.append((start, heading_row + 1))
+            start = last_row + 1
+        if start < last:
+            segments.append((start, last))
+        return segments
+
+    def wrap(self, width: int, tab_width: int | None = None) -> None:
+        if self._folds and len(self._wrap_offsets) != self.document.line_count:
+            # Rewrapping after edits the folds weren't moved for.
+            self._folds = ()
+        super().wrap(width, tab_width)
+        if self._folds:
+            self._rebuild_offsets()
+
+    def wrap_range(self, start: Location, old_end: Location, new_end: Location) -> None:
+        row = start[0]
+        (_, column), (_, old_column) = sorted((start, old_end))
+        if (
+            self._width
+            and row == old_end[0] == new_end[0]
+            and row < min(len(self._wrap_offsets), self.document.line_count)
+            and not any(heading <= row <= last for heading, last in self._folds)
+            and self._rewrap_line(row, column, old_column, new_end[1])
+        ):
+            return
+        if not self._folds:
+            super().wrap_range(start, old_end, new_end)
+            return
+
+        top_row, old_bottom_row = sorted((start[0], old_end[0]))
+        line_shift = max(start[0], new_end[0]) - old_bottom_row
+        above = []
+        below = []
+        for fold in self._folds:
+            heading_row, last_row = fold
+            if last_row < top_row:
+                above.append(fold)
+            elif heading_row > old_bottom_row:
+                below.append(fold)
+        if len(above) + len(below) < len(self._folds):
+            # Unfold what the edit touched before rewrapping around it.
+            self._folds = (*above, *below)
+            self._rebuild_offsets()
+
+        super().wrap_range(start, old_end, new_end)
+        if line_shift:
+            below = [(heading + line_shift, last + line_shift) for heading, last in below]
+            self._folds = (*above, *below)
+
+    def _rewrap_line(self, row: int, column: int, old_end: int, new_end: int) -> bool:
+        """Rewrap one edited line around the edit, reusing its cached offsets.
+
+        Returns False, leaving everything untouched, for lines with tabs,
+        whose widths depend on everything before them.
+        """
+        line = self.document[row]
+        if "\t" in line:
+            return False
+        width = self._width
+        old_offsets = self._wrap_offsets[row]
+        shift = new_end - old_end
+
+        # A break stands while the chunk at it ends before the edit.
+        index = bisect_left(old_offsets, column)
+        while index and re_chunk.match(line, old_offsets[index - 1]).end() >= column:
+            index -= 1
+        offsets = old_offsets[:index]
+        restart = offsets[-1] if offsets else 0
+
+        length = len(line)
+        window = new_end - restart + 4 * width
+        while True:
+            stop = restart + window
+            piece = line[restart:stop]
+            found = compute_wrap_offsets(piece, width, self._tab_width)
+            if stop >= length:
+                offsets.extend(restart + offset for offset in found)
+                break
+            # The window may cut its last chunk short, so breaks there may move.
+            kept = piece.rstrip()
+            last_chunk = len(kept) - len(kept.rsplit(None, 1)[-1]) if kept else 0
+            settled = [restart + offset for offset in found if offset < last_chunk]
+            if not settled:
+                window *= 2
+                continue
+            for offset in settled:
+                offsets.append(offset)
+                if offset >= new_end:
+                    old_index = bisect_left(old_offsets, offset - shift)
+                    if old_index < len(old_offsets) and old_offsets[old_index] == offset - shift:
+                        # Back in step: the rest is the old breaks, shifted.
+                        offsets.extend(old + shift for old in old_offsets[old_index + 1 :])
+                        break
+            else:
+                restart = settled[-1]
+                window = 16 * width
+                continue
+            break
+
+        self._wrap_offsets[row] = offsets
+        grow = len(offsets) - len(old_offsets)
+        if grow:
+            line_index_to_offsets = self._line_index_to_offsets
+            y = line_index_to_offsets[row][0]
+            sections = len(offsets) + 1
+            self._offset_to_line_info[y : y + sections - grow] = [
+                (row, section) for section in range(sections)
+            ]
+            line_index_to_offsets[row] = list(range(y, y + sections))
+            for index in range(row + 1, len(line_index_to_offsets)):
+                line_index_to_offsets[index] = [
+                    offset + grow for offset in line_index_to_offsets[index]
+                ]
+        return True
+
+    def offset_to_location(self, offset: Offset) -> Location:
+        if self._width or not self._folds:
+            return super().offset_to_location(offset)
+        # Unwrapped, Textual maps y straight to a row, which ignores folds.
+        x, y = offset
+        line_info = self._offset_to_line_info
+        row, _ = line_info[min(max(0, y), len(line_info) - 1)]
+        line = self.document.get_line(row)
+        return row, cell_width_to_column_index(line, max(0, x), self._tab_width)
+
+    def location_to_offset(self, location: Location) -> Offset:
+        fold = self.fold_containing(location[0]) if self._folds else None
+        if fold is not None:
+            heading_row = fold[0]
+            location = (heading_row, len(self.document.get_line(heading_row)))
+        return super().location_to_offset(location)
+
+    def _rebuild_offsets(self) -> None:
+        """Rebuild the offset tables from the wrap offsets, leaving out folded rows."""
+        offset_to_line_info = []
+        line_index_to_offsets = []
+        append_info = offset_to_line_info.append
+        append_offsets = line_index_to_offsets.append
+        folds = iter(self._folds)
+        next_fold = next(folds, None)
+        y = 0
+        row = 0
+        wrap_offsets = self._wrap_offsets
+        line_count = len(wrap_offsets)
+        while row < line_count:
+            stop = next_fold[0] + 1 if next_fold is not None else line_count
+            for row in range(row, min(stop, line_count)):
+                sections = len(wrap_offsets[row]) + 1
+                append_offsets(list(range(y, y + sections)))
+                for section in range(sections):
+                    append_info((row, section))
+                y += sections
+            row = min(stop, line_count)
+            if next_fold is not None and row < line_count:
+                last_row = min(next_fold[1], line_count - 1)
+                line_index_to_offsets.extend([y - 1] for _ in range(row, last_row + 1))
+                row = last_row + 1
+                next_fold = next(folds, None)
+        self._offset_to_line_info = offset_to_line_info
+        self._line_index_to_offsets = line_index_to_offsets
+
+
+class ProsaicDocumentNavigator(DocumentNavigator):
+    """DocumentNavigator that steps over folded rows.
+
+    Textual moves to the neighbouring row when leaving a line; when that row
+    is folded, the cursor goes to the far side of the fold instead.
+    """
+
+    _wrapped_document: ProsaicWrappedDocument
+
+    def get_location_left(self, location: Location) -> Location:
+        return self._before_fold(super().get_location_left(location))
+
+    def get_location_right(self, location: Location) -> Location:
+        return self._after_fold(super().get_location_right(location), location)
+
+    def get_location_above(self, location: Location) -> Location:
+        target = super().get_location_above(location)
+        fold = self._wrapped_document.fold_containing(target[0])
+        if fold is None:
+            return target
+        return fold[0], self._column_in(fold[0], location, -1)
+
+    def get_location_below(self, location: Location) -> Location:
+        return self._after_fold(super().get_location_below(location), location, keep_x=True)
+
+    def _before_fold(self, target: Location) -> Location:
+        """Move a location in a fold to the end of the fold's heading."""
+        fold = self._wrapped_document.fold_containing(target[0])
+        if fold is None:
+            return target
+        heading_row = fold[0]
+        return heading_row, len(self._document[heading_row])
+
+    def _after_fold(self, target: Location, origin: Location, keep_x: bool = False) -> Location:
+        """Move a location in a fold to the first row after it."""
+        fold = self._wrapped_document.fold_containing(target[0])
+        if fold is None:
+            return target
+        heading_row, last_row = fold
+        row = last_row + 1
+        if row >= self._document.line_count:
+            return heading_row, len(self._document[heading_row])
+        return row, self._column_in(row, origin, 0) if keep_x else 0
+
+    def _column_in(self, row: int, origin: Location, section: int) -> int:
+        """Column in a section of row that lines up with origin on screen."""
+        x = max(self._wrapped_document.location_to_offset(origin).x, self.last_x_offset)
+        return self._wrapped_document.get_target_document_column(row, x, section)
@@ -63,3 +63,18 @@ def write_config(tmp_config_dir):
         config_path.write_text(json.dumps(config_data, indent=2))
         return config_path
     return _write
+
+
+@pytest.fixture
+def editor_workspace(tmp_path, monkeypatch, v2_config, write_config):
+    """Point the default profile at a fresh workspace, for running the app."""
+    from prosaic import config
+
+    workspace = tmp_path / "workspace"
+    v2_config["profiles"]["default"]["archive_dir"] = str(workspace)
+    v2_config["profiles"]["default"]["init_git"] = False
+    write_config(v2_config)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(config, "_active_profile", "default")
+    config.ensure_workspace()
+    return workspace
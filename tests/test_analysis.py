@@ -0,0 +1,71 @@
+"""Tests for prosaic.core.analysis module."""
+
+import os
+from pathlib import Path
+
+from prosaic.core.analysis import Analysis, AnalysisCache
+from prosaic.core.markdown import extract_heading_array
+from prosaic.core.spans import SpanStore, intern_style
+from prosaic.core.writer import SaveQueue
+
+
+def make_cache(tmp_path, max_bytes=1024 * 1024):
+    return AnalysisCache(tmp_path / "analysis", SaveQueue(fsync=False), max_bytes)
+
+
+class TestAnalysisCache:
+    """Tests for AnalysisCache."""
+
+    def test_roundtrip(self, tmp_path):
+        """A stored analysis reads back for the same content."""
+        cache = make_cache(tmp_path)
+        highlights = SpanStore()
+        highlights.add(2, 6, 11, intern_style("spell.error"))
+        cache.put(
+            Path("a.md"),
+            Analysis(
+                content_hash="abc",
+                cursor=((4, 1), (4, 3)),
+                scroll=(0.0, 12.0),
+                highlights=highlights,
+                headings=extract_heading_array("# A\n\n## B\n"),
+                counts=(3, 9),
+            ),
+        )
+        cache._writer.flush(timeout=5)
+
+        analysis = cache.get(Path("a.md"), "abc")
+        assert analysis.cursor == ((4, 1), (4, 3))
+        assert analysis.scroll == (0.0, 12.0)
+        assert list(analysis.highlights[2]) == [(6, 11, "spell.error")]
+        assert analysis.headings.texts == ["A", "B"]
+        assert analysis.counts == (3, 9)
+
+    def test_changed_content_misses(self, tmp_path):
+        """An entry is ignored once the file's content hash differs."""
+        cache = make_cache(tmp_path)
+        cache.put(Path("a.md"), Analysis(content_hash="abc"))
+        cache._writer.flush(timeout=5)
+        assert cache.get(Path("a.md"), "def") is None
+        assert cache.get(Path("b.md"), "abc") is None
+
+    def test_corrupt_entry_misses(self, tmp_path):
+        """A damaged entry reads as no entry."""
+        cache = make_cache(tmp_path)
+        path = cache.entry_path(Path("a.md"))
+        path.parent.mkdir(parents=True)
+        path.write_text('{"version": 1, "hash": "abc", "cursor": [1]}')
+        assert cache.get(Path("a.md"), "abc") is None
+
+    def test_prune_deletes_oldest(self, tmp_path):
+        """Pruning removes the least recently written entries first."""
+        cache = make_cache(tmp_path, max_bytes=500)
+        for i, name in enumerate(["old.md", "mid.md", "new.md"]):
+            cache.put(Path(name), Analysis(content_hash="x" * 150))
+            cache._writer.flush(timeout=5)
+            entry = cache.entry_path(Path(name))
+            os.utime(entry, ns=(i * 10**9, i * 10**9))
+
+        assert cache.prune() == 1
+        assert not cache.entry_path(Path("old.md")).exists()
+        assert cache.entry_path(Path("new.md")).exists()
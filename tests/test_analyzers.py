@@ -0,0 +1,170 @@
+"""Tests for prosaic.core.analyzers module."""
+
+import random
+
+import pytest
+from textual.document._document import Document
+
+from prosaic.core.analyzers import (
+    Analyzer,
+    ChangedRows,
+    CountAnalyzer,
+    EditBus,
+    EditDelta,
+    HeadingAnalyzer,
+)
+from prosaic.core.markdown import count_characters, count_words, extract_heading_array
+
+TEXT = "\n".join(
+    [
+        "---",
+        "title: Draft words",
+        "---",
+        "# Book",
+        "",
+        "Opening **line** of prose.",
+        "## One",
+        "```",
+        "code that isn't counted",
+        "```",
+        "More _prose_ here.",
+        "## Two",
+        "The end.",
+    ]
+)
+
+FRAGMENTS = ["word ", "\n", "\n## New\n", "```\n", "---", "# ", "more words", ""]
+
+
+def edit(document, bus, start, end, text):
+    document.replace_range(start, end, text)
+    bus.publish(EditDelta(start, end, text))
+
+
+def random_location(document, rng):
+    row = rng.randrange(document.line_count)
+    return row, rng.randint(0, len(document[row]))
+
+
+class TestEditDelta:
+    """Tests for EditDelta."""
+
+    def test_new_end_and_shift(self):
+        """The inserted text's end and the rows added follow from the text."""
+        delta = EditDelta((2, 4), (5, 1), "ab\ncd")
+        assert delta.new_end == (3, 2)
+        assert delta.line_shift == -2
+        assert EditDelta((1, 3), (1, 3), "xy").new_end == (1, 5)
+
+
+class TestChangedRows:
+    """Tests for merging edits into changed rows."""
+
+    def test_merged_rows_cover_every_edit(self):
+        """Rows outside a merged change are the same before and after the edits."""
+        rng = random.Random(3)
+        for _ in range(200):
+            document = Document(TEXT)
+            before = list(document.lines)
+            change = None
+            for _ in range(rng.randint(1, 4)):
+                start = random_location(document, rng)
+                end = max(start, random_location(document, rng))
+                text = rng.choice(FRAGMENTS)
+                document.replace_range(start, end, text)
+                delta = EditDelta(start, end, text)
+                change = ChangedRows.of(delta) if change is None else change.then(delta)
+            after = document.lines
+            assert before[: change.first] == after[: change.first]
+            assert before[change.old_end :] == after[change.new_end :]
+
+
+class TestAnalyzers:
+    """Tests for HeadingAnalyzer and CountAnalyzer."""
+
+    def test_incomplete_analyzer_cannot_be_made(self):
+        """A subclass missing update() fails when made, not when first synced."""
+
+        class Partial(Analyzer):
+            def rebuild(self, lines):
+                pass
+
+        with pytest.raises(TypeError):
+            Partial()
+
+    def test_start_stale(self):
+        """Analyzers ignore edits until first synced, then rebuild."""
+        bus = EditBus()
+        headings = bus.subscribe(HeadingAnalyzer())
+        document = Document(TEXT)
+        edit(document, bus, (0, 0), (0, 0), "# Top\n")
+        assert headings.stale
+        headings.sync(document.lines)
+        assert not headings.stale
+        assert headings.headings.texts == ["Top", "Book", "One", "Two"]
+
+    def test_incremental_matches_rebuild(self):
+        """Updating from deltas gives the same results as analyzing from scratch."""
+        rng = random.Random(7)
+        document = Document(TEXT)
+        bus = EditBus()
+        headings = bus.subscribe(HeadingAnalyzer())
+        counts = bus.subscribe(CountAnalyzer())
+        headings.sync(document.lines)
+        counts.sync(document.lines)
+        for step in range(300):
+            start = random_location(document, rng)
+            end = max(start, random_location(document, rng)) if step % 3 else start
+            edit(document, bus, start, end, rng.choice(FRAGMENTS))
+            if step % 4:
+                continue
+            headings.sync(document.lines)
+            counts.sync(document.lines)
+            fresh = CountAnalyzer()
+            fresh.sync(document.lines)
+            assert (counts.words, counts.characters) == (fresh.words, fresh.characters)
+            expected = extract_heading_array(document.text)
+            assert headings.headings.to_dict() == expected.to_dict()
+
+    def test_counts_skip_code_and_frontmatter(self):
+        """Counts agree with count_words() and count_characters() for plain documents."""
+        counts = CountAnalyzer()
+        counts.sync(TEXT.split("\n"))
+        assert counts.words == count_words(TEXT)
+        assert counts.characters == count_characters(TEXT)
+
+    def test_unclosed_frontmatter_is_counted(self):
+        """A rule on the first row only starts frontmatter once it is closed."""
+        document = Document("Some prose here.\n")
+        bus = EditBus()
+        counts = bus.subscribe(CountAnalyzer())
+        counts.sync(document.lines)
+        edit(document, bus, (0, 0), (0, 0), "---\ntitle: Draft\n")
+        counts.sync(document.lines)
+        assert counts.words == count_words(document.text) == 5
+        edit(document, bus, (2, 0), (2, 0), "---\n")
+        counts.sync(document.lines)
+        assert counts.words == count_words(document.text) == 3
+
+    def test_unclosed_fence_is_counted(self):
+        """An opening fence only starts a code block once it is closed."""
+        prose = "\n".join(f"Line {row} of the story." for row in range(100))
+        document = Document("Chapter one text here.\n```\n" + prose)
+        bus = EditBus()
+        counts = bus.subscribe(CountAnalyzer())
+        counts.sync(document.lines)
+        assert counts.words == count_words(document.text)
+        edit(document, bus, (5, 0), (5, 0), "```\n")
+        counts.sync(document.lines)
+        assert counts.words == count_words(document.text) < 500
+
+    def test_unchanged_headings_are_kept(self):
+        """Typing outside headings keeps the same heading array."""
+        document = Document(TEXT)
+        bus = EditBus()
+        headings = bus.subscribe(HeadingAnalyzer())
+        headings.sync(document.lines)
+        before = headings.headings
+        edit(document, bus, (12, 3), (12, 3), " very")
+        headings.sync(document.lines)
+        assert headings.headings is before
@@ -0,0 +1,76 @@
+"""Tests for prosaic.core.autosave module."""
+
+from prosaic.core.autosave import AutosaveScheduler
+
+
+class FakeTimer:
+    def __init__(self, delay, callback):
+        self.delay = delay
+        self.callback = callback
+        self.stopped = False
+        self.resets = 0
+
+    def stop(self):
+        self.stopped = True
+
+    def reset(self):
+        self.resets += 1
+
+
+class FakeScheduler:
+    """Collects timers so tests can fire them by hand."""
+
+    def __init__(self):
+        self.timers = []
+
+    def set_timer(self, delay, callback):
+        timer = FakeTimer(delay, callback)
+        self.timers.append(timer)
+        return timer
+
+    def live(self):
+        return [timer for timer in self.timers if not timer.stopped]
+
+
+class TestAutosaveScheduler:
+    """Tests for AutosaveScheduler."""
+
+    def test_idle_without_changes(self):
+        """Nothing is scheduled until a change is noted."""
+        scheduler = FakeScheduler()
+        autosave = AutosaveScheduler(scheduler, lambda: None)
+        assert not autosave.pending
+        assert scheduler.timers == []
+
+    def test_touch_restarts_idle_timer(self):
+        """Each change resets the one idle timer and keeps one deadline."""
+        scheduler = FakeScheduler()
+        autosave = AutosaveScheduler(scheduler, lambda: None, 2.0, 10.0)
+        autosave.touch()
+        autosave.touch()
+        autosave.touch()
+        assert sorted(timer.delay for timer in scheduler.timers) == [2.0, 10.0]
+        idle, deadline = scheduler.timers
+        assert (idle.resets, deadline.resets) == (2, 0)
+        assert not idle.stopped
+
+    def test_fire_saves_and_clears(self):
+        """Firing either timer saves once and stops the other."""
+        scheduler = FakeScheduler()
+        saves = []
+        autosave = AutosaveScheduler(scheduler, lambda: saves.append(1), 2.0, 10.0)
+        autosave.touch()
+        deadline = next(t for t in scheduler.live() if t.delay == 10.0)
+        deadline.callback()
+        assert saves == [1]
+        assert scheduler.live() == []
+        assert not autosave.pending
+
+    def test_cancel(self):
+        """Cancelling stops all timers."""
+        scheduler = FakeScheduler()
+        autosave = AutosaveScheduler(scheduler, lambda: None)
+        autosave.touch()
+        autosave.cancel()
+        assert scheduler.live() == []
+        assert not autosave.pending
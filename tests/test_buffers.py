@@ -0,0 +1,50 @@
+"""Tests for prosaic.core.buffers module."""
+
+from pathlib import Path
+
+from prosaic.core.buffers import Buffer, BufferCache
+
+
+def make_buffer(name, size=10):
+    return Buffer(Path(name), object(), "hash", (0, size), size)
+
+
+class TestBufferCache:
+    """Tests for BufferCache."""
+
+    def test_take_removes(self):
+        """take() returns a cached buffer and forgets it."""
+        cache = BufferCache()
+        buffer = make_buffer("a.md")
+        cache.put(buffer)
+        assert cache.take(Path("a.md")) is buffer
+        assert Path("a.md") not in cache
+        assert cache.total_bytes == 0
+
+    def test_evicts_least_recently_used_by_count(self):
+        """The oldest buffer goes first when there are too many."""
+        cache = BufferCache(max_buffers=2)
+        cache.put(make_buffer("a.md"))
+        cache.put(make_buffer("b.md"))
+        cache.put(cache.take(Path("a.md")))
+        evicted = cache.put(make_buffer("c.md"))
+        assert [b.path for b in evicted] == [Path("b.md")]
+        assert Path("a.md") in cache and Path("c.md") in cache
+
+    def test_evicts_to_memory_cap(self):
+        """Buffers are evicted until the total size fits."""
+        cache = BufferCache(max_bytes=100)
+        cache.put(make_buffer("a.md", 40))
+        cache.put(make_buffer("b.md", 40))
+        evicted = cache.put(make_buffer("c.md", 50))
+        assert [b.path for b in evicted] == [Path("a.md")]
+        assert cache.total_bytes == 90
+
+    def test_oversized_buffer_not_kept(self):
+        """A buffer larger than the cap is not cached at all."""
+        cache = BufferCache(max_bytes=100)
+        cache.put(make_buffer("a.md", 40))
+        evicted = cache.put(make_buffer("big.md", 500))
+        assert {b.path for b in evicted} == {Path("a.md"), Path("big.md")}
+        assert len(cache) == 0
+        assert cache.total_bytes == 0
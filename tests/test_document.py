@@ -0,0 +1,56 @@
+"""Tests for prosaic.widgets.document module."""
+
+from textual._tree_sitter import get_language
+from textual.document._document import Document
+from textual.document._syntax_aware_document import SyntaxAwareDocument
+
+from prosaic.widgets.document import ProsaicDocument, ProsaicSyntaxAwareDocument
+
+TEXT = "# Title\n\nCafé au lait\nsecond line\n\n## Naïve\n"
+
+
+def upgrade(document, cls):
+    document.__class__ = cls
+    return document
+
+
+class TestProsaicDocument:
+    """Tests for ProsaicDocument."""
+
+    def test_text_tracks_edits(self):
+        """Cached text is replaced after each edit."""
+        document = upgrade(Document(TEXT), ProsaicDocument)
+        assert document.text == TEXT
+        document.replace_range((2, 0), (2, 4), "Tea")
+        assert document.text == TEXT.replace("Café", "Tea")
+        assert document.version == 1
+
+    def test_snapshot_unaffected_by_later_edits(self):
+        """A snapshot keeps the text it was taken from."""
+        document = upgrade(Document(TEXT), ProsaicDocument)
+        snapshot = document.snapshot()
+        document.replace_range((1, 0), (1, 0), "new\n")
+        assert snapshot.text == TEXT
+        assert snapshot.line_count == TEXT.count("\n") + 1
+        assert document.text.startswith("# Title\nnew\n")
+
+
+class TestProsaicSyntaxAwareDocument:
+    """Tests for ProsaicSyntaxAwareDocument."""
+
+    def test_byte_offsets_match_textual(self):
+        """Byte offsets agree with Textual's through multi-line and non-ASCII edits."""
+        language = get_language("markdown")
+        expected = SyntaxAwareDocument(TEXT, language)
+        document = upgrade(SyntaxAwareDocument(TEXT, language), ProsaicSyntaxAwareDocument)
+        edits = [((2, 3), (2, 4), "é\nü"), ((0, 0), (1, 0), ""), ((4, 2), (5, 1), "ñ")]
+        for start, end, text in edits:
+            for row in range(expected.line_count + 1):
+                location = (row, 2)
+                assert document._location_to_byte_offset(location) == (
+                    expected._location_to_byte_offset(location)
+                )
+            expected.replace_range(start, end, text)
+            document.replace_range(start, end, text)
+        assert document.text == expected.text
+        assert str(document._syntax_tree.root_node) == str(expected._syntax_tree.root_node)
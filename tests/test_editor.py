@@ -0,0 +1,35 @@
+"""Tests for prosaic.screens.editor module."""
+
+import asyncio
+
+from prosaic.__main__ import ProsaicApp
+from prosaic.core.search import FileMatches, SearchQuery, WorkspaceReplace, find_in_lines
+
+
+class TestWorkspaceReplace:
+    """Tests for applying a workspace replace in the editor."""
+
+    def test_open_file_only(self, editor_workspace):
+        """Matches only in the open document are replaced in place and saved."""
+        draft = editor_workspace / "draft.md"
+        draft.write_text("Anna met anna.\n")
+
+        async def main() -> list[str]:
+            app = ProsaicApp(light_mode=True, initial_file=draft)
+            async with app.run_test() as pilot:
+                await pilot.pause(0.5)
+                screen = app.screen
+                query = SearchQuery("anna")
+                text = screen.query_one("#editor").text
+                found = FileMatches(
+                    draft, text, find_in_lines(query.compile(), text.split("\n"))
+                )
+                screen._replace_in_workspace(WorkspaceReplace(query, "Hannah", [found]))
+                await pilot.pause(0.5)
+                screen._writer.flush()
+                assert screen.query_one("#editor").text == "Hannah met Hannah.\n"
+                return [notification.message for notification in app._notifications]
+
+        messages = asyncio.run(main())
+        assert "Replaced 2 matches in 1 file" in messages
+        assert draft.read_text() == "Hannah met Hannah.\n"
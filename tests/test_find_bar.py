@@ -0,0 +1,86 @@
+"""Tests for prosaic.widgets.find_bar module."""
+
+import asyncio
+
+from textual.widgets.text_area import Selection
+
+from prosaic.__main__ import ProsaicApp
+from prosaic.widgets import FindBar
+
+
+def _run_editor(path, steps) -> None:
+    async def main() -> None:
+        app = ProsaicApp(light_mode=True, initial_file=path)
+        async with app.run_test() as pilot:
+            await pilot.pause(0.5)
+            screen = app.screen
+            await steps(screen, screen.query_one("#find-bar", FindBar), pilot)
+
+    asyncio.run(main())
+
+
+class TestFindBar:
+    """Tests for finding and replacing in the open document."""
+
+    def test_find_next_replace_and_undo(self, editor_workspace):
+        """F3 cycles through matches, replace-all is one undo, escape closes the bar."""
+        draft = editor_workspace / "draft.md"
+        draft.write_text("cat one\nCat two\ncat three\n")
+
+        async def steps(screen, bar: FindBar, pilot) -> None:
+            editor = screen.query_one("#editor")
+            editor.move_cursor((0, 0))
+            await pilot.press("ctrl+g", "c", "a", "t")
+            await pilot.pause()
+            assert bar.display
+            assert bar.matches == [(0, 0, 3), (1, 0, 3), (2, 0, 3)]
+
+            await pilot.press("f3", "f3", "f3")
+            assert editor.selection == Selection((2, 0), (2, 3))
+            await pilot.press("f3")
+            assert editor.selection == Selection((0, 0), (0, 3))
+            await pilot.press("shift+f3")
+            assert editor.selection == Selection((2, 0), (2, 3))
+
+            await pilot.press("ctrl+r", "d", "o", "g", "enter")
+            await pilot.pause()
+            assert editor.text == "dog one\ndog two\ndog three\n"
+
+            editor.focus()
+            await pilot.press("ctrl+z")
+            assert editor.text == "cat one\nCat two\ncat three\n"
+
+            await pilot.press("escape")
+            await pilot.pause()
+            assert not bar.display
+            assert editor.has_focus
+            assert bar.matches == []
+
+        _run_editor(draft, steps)
+
+    def test_large_document_searched_in_worker(self, editor_workspace):
+        """Documents over 5,000 lines are searched off the UI thread, ignoring stale results."""
+        draft = editor_workspace / "long.md"
+        draft.write_text(
+            "".join(f"needle {row}\n" if row % 1000 == 0 else f"hay {row}\n" for row in range(6000))
+        )
+
+        async def steps(screen, bar: FindBar, pilot) -> None:
+            editor = screen.query_one("#editor")
+            await pilot.press("ctrl+g", *"needle")
+            for _ in range(50):
+                await pilot.pause(0.05)
+                if bar._complete:
+                    break
+            assert [row for row, _, _ in bar.matches] == [0, 1000, 2000, 3000, 4000, 5000]
+
+            await pilot.press("f3", "f3")
+            assert editor.selection == Selection((1000, 0), (1000, 6))
+
+            # Results from a search of an older version are dropped.
+            version = editor.document.version
+            editor.insert("x", (0, 0))
+            bar._show_matches(version, [(9, 0, 1)], True)
+            assert (9, 0, 1) not in bar.matches
+
+        _run_editor(draft, steps)
@@ -0,0 +1,58 @@
+"""Tests for prosaic.core.fuzzy module."""
+
+from prosaic.core.fuzzy import HeadingIndex, fuzzy_match
+from prosaic.core.markdown import HeadingArray
+
+
+def _headings(*texts: str) -> HeadingArray:
+    headings = HeadingArray()
+    for row, text in enumerate(texts):
+        headings.append(2, text, row * 3 + 1)
+    return headings
+
+
+class TestFuzzyMatch:
+    """Tests for fuzzy_match()."""
+
+    def test_characters_in_order(self):
+        """Query characters must appear in order, not necessarily together."""
+        assert fuzzy_match("cpt", "chapter") == (0, 3, 4)
+        assert fuzzy_match("tpc", "chapter") is None
+
+    def test_prefers_a_run(self):
+        """A run of the query found together beats a scattered match."""
+        assert fuzzy_match("bc", "abxbc") == (3, 4)
+
+
+class TestHeadingIndex:
+    """Tests for HeadingIndex."""
+
+    def test_ignores_case(self):
+        """Queries match headings whatever their case."""
+        index = HeadingIndex(_headings("The Harbour", "Lisbon"))
+        [match] = index.search("LISB")
+        assert match.heading.text == "Lisbon"
+        assert match.heading.line == 4
+        assert match.positions == (0, 1, 2, 3)
+
+    def test_ranks_word_starts_and_runs_first(self):
+        """Matches at word starts and in runs come before scattered ones."""
+        index = HeadingIndex(_headings("Lantern Hill", "Melinda", "The Lighthouse"))
+        assert [m.heading.text for m in index.search("li")] == [
+            "The Lighthouse",
+            "Melinda",
+            "Lantern Hill",
+        ]
+
+    def test_narrowing_and_widening(self):
+        """Extending a query narrows the results; shortening it widens them again."""
+        index = HeadingIndex(_headings("Harbour", "Harvest", "Orchid"))
+        assert len(index.search("ha")) == 2
+        assert [m.heading.text for m in index.search("hav")] == ["Harvest"]
+        assert len(index.search("h")) == 3
+        assert [m.heading.text for m in index.search("rch")] == ["Orchid"]
+
+    def test_empty_query_lists_in_order(self):
+        """An empty query lists headings in document order, up to the limit."""
+        index = HeadingIndex(_headings("One", "Two", "Three"))
+        assert [m.heading.text for m in index.search("", limit=2)] == ["One", "Two"]
@@ -0,0 +1,113 @@
+"""Tests for prosaic.core.journal module."""
+
+from prosaic.core.journal import (
+    EditJournal,
+    journal_path,
+    read_journal,
+    recoverable,
+    replay,
+    set_aside,
+)
+from prosaic.utils import content_hash
+
+
+class TestReplay:
+    """Tests for replay()."""
+
+    def test_applies_edits_in_order(self):
+        """Inserts, deletions and multi-line replacements apply in sequence."""
+        edits = [
+            ((0, 5), (0, 5), " there"),
+            ((1, 0), (1, 0), "new line\n"),
+            ((0, 0), (0, 5), "Hi"),
+        ]
+        assert replay("Hello\nworld", edits) == "Hi there\nnew line\nworld"
+
+
+class TestEditJournal:
+    """Tests for EditJournal."""
+
+    def test_round_trip(self, tmp_path):
+        """Recorded edits read back and replay onto the base text."""
+        source = tmp_path / "draft.md"
+        journal = EditJournal(journal_path(tmp_path / "journal", source), source)
+        journal.start(content_hash("# Draft\n"))
+        journal.record((1, 0), (1, 0), "café 🎉 ")
+        journal.record((0, 2), (0, 7), "Title")
+        journal.close()
+
+        contents = read_journal(journal.path)
+        assert contents.source == source
+        assert contents.base_hash == content_hash("# Draft\n")
+        assert replay("# Draft\n", contents.edits) == "# Title\ncafé 🎉 "
+
+    def test_untitled_keeps_base_text(self, tmp_path):
+        """An untitled buffer's journal carries its base text."""
+        journal = EditJournal(journal_path(tmp_path, None), None)
+        journal.start(content_hash("start"), "start")
+        journal.record((0, 5), (0, 5), "ed")
+        journal.close()
+
+        contents = read_journal(journal.path)
+        assert contents.source is None
+        assert replay(contents.base_text, contents.edits) == "started"
+
+    def test_ignores_truncated_last_line(self, tmp_path):
+        """A partial final line from a crash is dropped."""
+        journal = EditJournal(tmp_path / "j.jsonl", None)
+        journal.start(content_hash(""), "")
+        journal.record((0, 0), (0, 0), "kept")
+        journal.close()
+        with journal.path.open("a", encoding="utf-8") as f:
+            f.write('[0, 4, 0, 4, "lo')
+
+        assert read_journal(journal.path).edits == [((0, 0), (0, 0), "kept")]
+
+    def test_compact_keeps_later_edits(self, tmp_path):
+        """Compacting drops saved edits but keeps those recorded since the mark."""
+        source = tmp_path / "draft.md"
+        journal = EditJournal(tmp_path / "j.jsonl", source)
+        journal.start(content_hash("a"))
+        journal.record((0, 1), (0, 1), "b")
+        mark = journal.mark()
+        journal.record((0, 2), (0, 2), "c")
+        journal.compact(content_hash("ab"), mark)
+        journal.record((0, 3), (0, 3), "d")
+        journal.close()
+
+        contents = read_journal(journal.path)
+        assert contents.base_hash == content_hash("ab")
+        assert replay("ab", contents.edits) == "abcd"
+
+    def test_discard_removes_file(self, tmp_path):
+        """Discarding deletes the journal."""
+        journal = EditJournal(tmp_path / "j.jsonl", None)
+        journal.start(content_hash(""), "")
+        journal.discard()
+        assert not journal.path.exists()
+        assert read_journal(journal.path) is None
+
+    def test_recoverable_needs_matching_edits(self, tmp_path):
+        """Only a journal with edits against the given text is recoverable."""
+        journal = EditJournal(tmp_path / "j.jsonl", tmp_path / "notes.md")
+        journal.start(content_hash("notes"))
+        assert recoverable(journal.path, content_hash("notes")) is None
+        journal.record((0, 5), (0, 5), "!")
+        journal.close()
+        assert recoverable(journal.path, content_hash("notes")).edits
+        assert recoverable(journal.path, content_hash("notes\n## Today")) is None
+
+    def test_set_aside_keeps_edits(self, tmp_path):
+        """A journal set aside keeps its edits, and a new one starts empty."""
+        source = tmp_path / "notes.md"
+        journal = EditJournal(tmp_path / "j.jsonl", source)
+        journal.start(content_hash("notes"))
+        journal.record((0, 5), (0, 5), "!")
+        journal.close()
+
+        kept = set_aside(journal.path)
+        journal.start(content_hash("changed"))
+        journal.close()
+        assert kept.name.endswith(".stale.jsonl")
+        assert read_journal(kept).edits == [((0, 5), (0, 5), "!")]
+        assert read_journal(journal.path).edits == []
@@ -0,0 +1,29 @@
+"""Tests for prosaic.core.limits module."""
+
+from prosaic.core.limits import LargeFileLimits
+
+
+class TestLargeFileLimits:
+    """Tests for LargeFileLimits.is_large."""
+
+    def test_small_document(self):
+        """Documents under both limits are not large."""
+        limits = LargeFileLimits(max_chars=1000, max_lines=100)
+        assert not limits.is_large(500, 50)
+
+    def test_chars_limit(self):
+        """Exceeding the character limit alone is enough."""
+        limits = LargeFileLimits(max_chars=1000, max_lines=100)
+        assert limits.is_large(1001, 1)
+
+    def test_lines_limit(self):
+        """Exceeding the line limit alone is enough."""
+        limits = LargeFileLimits(max_chars=1000, max_lines=100)
+        assert limits.is_large(10, 101)
+
+    def test_hysteresis_keeps_large(self):
+        """A large document stays large until it shrinks below the hysteresis band."""
+        limits = LargeFileLimits(max_chars=1000, max_lines=100, hysteresis=0.8)
+        assert limits.is_large(900, 1, currently_large=True)
+        assert not limits.is_large(900, 1, currently_large=False)
+        assert not limits.is_large(700, 1, currently_large=True)
@@ -0,0 +1,37 @@
+"""Tests for prosaic.core.markdown module."""
+
+from prosaic.core import markdown
+
+
+class TestExtractHeadingArray:
+    """Tests for extract_heading_array()."""
+
+    def test_matches_extract_headings(self):
+        """Produces the same headings as extract_headings()."""
+        content = "# Book\n\ntext\n\n## Chapter 1\n  ### Scene  \n#not a heading\n"
+        array = markdown.extract_heading_array(content)
+        assert [array[i] for i in range(len(array))] == markdown.extract_headings(content)
+
+    def test_parallel_arrays(self):
+        """Stores level, line and text in parallel arrays."""
+        array = markdown.extract_heading_array("## 2026-01-01 10:00\n\n## 2026-01-02 09:30\n")
+        assert list(array.levels) == [2, 2]
+        assert list(array.lines) == [1, 3]
+        assert array.texts == ["2026-01-01 10:00", "2026-01-02 09:30"]
+
+    def test_dict_roundtrip(self):
+        """Headings survive to_dict() and from_dict()."""
+        array = markdown.extract_heading_array("# Book\n\n## Chapter\n")
+        restored = markdown.HeadingArray.from_dict(array.to_dict())
+        assert [restored[i] for i in range(len(restored))] == [array[i] for i in range(len(array))]
+
+
+class TestCountLine:
+    """Tests for count_line()."""
+
+    def test_matches_document_counts(self):
+        """Summing line counts gives the document counts for line-local markdown."""
+        content = "# Title\n\nSome **bold** and _soft_ words.\n- a [link](http://x.y)\n`code` here"
+        lines = [markdown.count_line(line) for line in content.split("\n")]
+        assert sum(words for words, _ in lines) == markdown.count_words(content)
+        assert sum(chars for _, chars in lines) == markdown.count_characters(content)
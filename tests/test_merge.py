@@ -0,0 +1,65 @@
+"""Tests for prosaic.core.merge module."""
+
+from prosaic.core.merge import (
+    CONFLICT_END,
+    CONFLICT_SEPARATOR,
+    CONFLICT_START,
+    changed_rows,
+    merge3,
+)
+
+BASE = ["# Book", "", "one", "two", "three", "four", "five"]
+
+
+def edited(**rows):
+    lines = list(BASE)
+    for name, text in rows.items():
+        lines[BASE.index(name)] = text
+    return lines
+
+
+class TestChangedRows:
+    """Tests for changed_rows()."""
+
+    def test_common_head_and_tail(self):
+        """Rows shared at both ends are left out of the change."""
+        assert changed_rows(BASE, BASE) is None
+        assert changed_rows(BASE, edited(two="2", three="3")) == (3, 5, 5)
+        assert changed_rows(BASE, BASE[:4] + ["new"] + BASE[4:]) == (4, 4, 5)
+        assert changed_rows(BASE, BASE[:-1]) == (6, 7, 6)
+
+
+class TestMerge3:
+    """Tests for merge3()."""
+
+    def test_takes_changes_from_both_sides(self):
+        """Edits to different rows are all kept."""
+        ours = edited(one="ONE")
+        theirs = edited(four="FOUR") + ["six"]
+        result = merge3(BASE, ours, theirs)
+        assert result.lines == edited(one="ONE", four="FOUR") + ["six"]
+        assert result.conflicts == []
+
+    def test_same_change_on_both_sides(self):
+        """Identical edits on both sides are not a conflict."""
+        both = edited(three="3")
+        assert merge3(BASE, both, both).lines == both
+
+    def test_conflicting_changes_are_marked(self):
+        """Different edits to the same rows are kept between markers."""
+        result = merge3(BASE, edited(three="ours"), edited(three="theirs"))
+        assert result.conflicts == [4]
+        assert result.lines[4:9] == [
+            CONFLICT_START,
+            "ours",
+            CONFLICT_SEPARATOR,
+            "theirs",
+            CONFLICT_END,
+        ]
+        assert result.lines[9:] == ["four", "five"]
+
+    def test_deletion_against_unchanged(self):
+        """Deleting rows on one side removes them from the merge."""
+        ours = [line for line in BASE if line != "two"]
+        result = merge3(BASE, ours, edited(five="5"))
+        assert result.lines == [line for line in edited(five="5") if line != "two"]
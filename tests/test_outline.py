@@ -0,0 +1,104 @@
+"""Tests for prosaic.widgets.outline module."""
+
+import asyncio
+
+from textual.app import App, ComposeResult
+
+from prosaic.widgets.outline import (
+    VIRTUALIZE_THRESHOLD,
+    OutlineItem,
+    OutlinePanel,
+    VirtualOutline,
+)
+
+
+class _OutlineApp(App):
+    # The themes pad the virtual outline; clicks must allow for it.
+    CSS = "#outline-virtual { padding: 1; height: 1fr; }"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.selected: list[int] = []
+
+    def compose(self) -> ComposeResult:
+        yield OutlinePanel(id="outline")
+
+    def on_outline_panel_heading_selected(self, event: OutlinePanel.HeadingSelected) -> None:
+        self.selected.append(event.line)
+
+
+def _run(steps) -> None:
+    async def main() -> None:
+        app = _OutlineApp()
+        async with app.run_test() as pilot:
+            await steps(app.query_one(OutlinePanel), pilot)
+
+    asyncio.run(main())
+
+
+def _items(panel: OutlinePanel) -> list[OutlineItem]:
+    return list(panel.query(OutlineItem))
+
+
+class TestOutlinePanel:
+    """Tests for patching the outline list in place."""
+
+    def test_edits_keep_unchanged_items(self):
+        """Unchanged headings keep their items; only changed ones are replaced."""
+
+        async def steps(panel: OutlinePanel, pilot) -> None:
+            panel.update_headings("# One\n\n## Two\n\n## Three\n")
+            await pilot.pause()
+            one, two, three = _items(panel)
+
+            # Insert a heading above Two and rename Three.
+            panel.update_headings("# One\n\n## New\n\ntext\n\n## Two\n\n## Third\n")
+            await pilot.pause()
+            items = _items(panel)
+            assert [item.heading.text for item in items] == ["One", "New", "Two", "Third"]
+            assert items[0] is one and items[2] is two
+            assert three not in items
+            assert [item.heading.line for item in items] == [1, 3, 7, 9]
+
+            # Remove the first heading; later items move up.
+            panel.update_headings("\n## New\n\ntext\n\n## Two\n\n## Third\n")
+            await pilot.pause()
+            after = _items(panel)
+            assert after == items[1:]
+            assert [item.heading.line for item in after] == [2, 6, 8]
+
+        _run(steps)
+
+    def test_level_change_replaces_item(self):
+        """A heading whose level changes gets a new item with the new style."""
+
+        async def steps(panel: OutlinePanel, pilot) -> None:
+            panel.update_headings("# One\n## Two\n")
+            await pilot.pause()
+            one, two = _items(panel)
+            panel.update_headings("# One\n### Two\n")
+            await pilot.pause()
+            items = _items(panel)
+            assert items[0] is one and items[1] is not two
+            assert items[1].has_class("outline-item--h3")
+
+        _run(steps)
+
+    def test_click_selects_the_row_under_the_mouse(self):
+        """Clicking a row of the virtual outline selects that heading, not a neighbour."""
+        async def steps(panel: OutlinePanel, pilot) -> None:
+            count = VIRTUALIZE_THRESHOLD + 1
+            panel.update_headings("".join(f"## H{i}\n" for i in range(count)))
+            await pilot.pause()
+            virtual = panel.query_one(VirtualOutline)
+            assert virtual.display
+            # Row 2 of the content, below one row of padding.
+            await pilot.click(virtual, offset=(3, 3))
+            await pilot.pause()
+            assert virtual.cursor == 2
+            # The padding row above the first heading selects nothing.
+            await pilot.click(virtual, offset=(3, 0))
+            await pilot.pause()
+            assert panel.app.selected == [3]
+
+        _run(steps)
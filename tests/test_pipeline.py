@@ -0,0 +1,131 @@
+"""Tests for prosaic.core.pipeline module."""
+
+from prosaic.core.pipeline import ChangePipeline
+
+
+class FakeTimer:
+    def __init__(self, delay, callback):
+        self.delay = delay
+        self.callback = callback
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+class FakeScheduler:
+    """Collects scheduled callbacks so tests can fire them by hand."""
+
+    def __init__(self):
+        self.after_refresh = []
+        self.timers = []
+
+    def call_after_refresh(self, callback):
+        self.after_refresh.append(callback)
+        return True
+
+    def set_timer(self, delay, callback):
+        timer = FakeTimer(delay, callback)
+        self.timers.append(timer)
+        return timer
+
+    def refresh(self):
+        callbacks, self.after_refresh = self.after_refresh, []
+        for callback in callbacks:
+            callback()
+
+
+def make_pipeline(text="# Title"):
+    scheduler = FakeScheduler()
+    reads = []
+
+    def get_text():
+        reads.append(1)
+        return text
+
+    return scheduler, ChangePipeline(scheduler, get_text), reads
+
+
+class TestChangePipeline:
+    """Tests for ChangePipeline."""
+
+    def test_coalesces_changes_in_one_frame(self):
+        """Several notifications before a refresh produce one run and one text read."""
+        scheduler, pipeline, reads = make_pipeline()
+        calls = []
+        pipeline.add_consumer("outline", calls.append)
+        pipeline.add_consumer("stats", calls.append)
+
+        for _ in range(5):
+            pipeline.notify()
+        assert len(scheduler.after_refresh) == 1
+
+        scheduler.refresh()
+        assert calls == ["# Title", "# Title"]
+        assert len(reads) == 1
+
+    def test_interval_defers_to_trailing_timer(self):
+        """A consumer inside its interval is deferred to a single timer."""
+        scheduler, pipeline, _ = make_pipeline()
+        calls = []
+        pipeline.add_consumer("stats", calls.append, interval=60)
+
+        pipeline.notify()
+        scheduler.refresh()
+        pipeline.notify()
+        scheduler.refresh()
+        pipeline.notify()
+        scheduler.refresh()
+
+        assert len(calls) == 1
+        assert len(scheduler.timers) == 1
+
+    def test_inactive_consumer_waits_for_wake(self):
+        """Hidden consumers stay dirty and run once when woken."""
+        scheduler, pipeline, _ = make_pipeline()
+        visible = False
+        calls = []
+        pipeline.add_consumer("outline", calls.append, is_active=lambda: visible)
+
+        pipeline.notify()
+        scheduler.refresh()
+        assert calls == []
+
+        visible = True
+        pipeline.wake("outline")
+        pipeline.wake("outline")
+        assert calls == ["# Title"]
+
+    def test_reset_ignores_intervals(self):
+        """reset() runs every active consumer immediately."""
+        scheduler, pipeline, _ = make_pipeline()
+        calls = []
+        pipeline.add_consumer("stats", calls.append, interval=60)
+
+        pipeline.notify()
+        scheduler.refresh()
+        pipeline.reset()
+        assert len(calls) == 2
+
+    def test_reset_skips_clean_consumers(self):
+        """Consumers named as clean are not run by reset()."""
+        _, pipeline, _ = make_pipeline()
+        outline, stats = [], []
+        pipeline.add_consumer("outline", outline.append)
+        pipeline.add_consumer("stats", stats.append)
+
+        pipeline.reset(clean={"outline"})
+        assert outline == []
+        assert len(stats) == 1
+        assert not pipeline.is_dirty("outline")
+
+    def test_consumers_without_text_skip_reading_it(self):
+        """The text is not read when only consumers that don't need it run."""
+        scheduler, pipeline, reads = make_pipeline()
+        calls = []
+        pipeline.add_consumer("outline", lambda: calls.append("outline"), needs_text=False)
+
+        pipeline.notify()
+        scheduler.refresh()
+        assert calls == ["outline"]
+        assert reads == []
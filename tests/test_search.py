@@ -0,0 +1,126 @@
+"""Tests for prosaic.core.search module."""
+
+import re
+
+import pytest
+
+from prosaic.core.search import (
+    SearchQuery,
+    find_in_lines,
+    replace_in_lines,
+    replace_in_text,
+    scan_files,
+    workspace_files,
+)
+
+LINES = ["The cat sat.", "A Cat and a dog.", "", "concatenate cats"]
+
+
+class TestSearchQuery:
+    """Tests for SearchQuery."""
+
+    def test_literal_escapes_special_characters(self):
+        """Literal queries match regex metacharacters as text."""
+        pattern = SearchQuery("a.b(").compile()
+        assert pattern.search("xa.b(y")
+        assert not pattern.search("axb(")
+
+    def test_invalid_regex_raises(self):
+        """An invalid regular expression raises re.error."""
+        with pytest.raises(re.error):
+            SearchQuery("(", regex=True).compile()
+
+    def test_expand_only_for_regex(self):
+        """Group references are expanded for regex queries only."""
+        match = re.search("(c)at", "cat")
+        assert SearchQuery("cat", regex=True).expand(match, r"\1ot") == "cot"
+        assert SearchQuery("cat").expand(match, r"\1ot") == r"\1ot"
+
+
+class TestFindInLines:
+    """Tests for find_in_lines()."""
+
+    def test_case_insensitive_by_default(self):
+        """Matches are found on every row, ignoring case unless asked."""
+        pattern = SearchQuery("cat").compile()
+        assert find_in_lines(pattern, LINES) == [
+            (0, 4, 7),
+            (1, 2, 5),
+            (3, 3, 6),
+            (3, 12, 15),
+        ]
+        strict = SearchQuery("cat", ignore_case=False).compile()
+        assert len(find_in_lines(strict, LINES)) == 3
+
+    def test_row_range(self):
+        """Only rows from first up to last are searched."""
+        pattern = SearchQuery("cat").compile()
+        assert find_in_lines(pattern, LINES, 1, 3) == [(1, 2, 5)]
+
+    def test_empty_matches_are_skipped(self):
+        """Regexes that can match nothing only report real matches."""
+        pattern = SearchQuery("x*", regex=True).compile()
+        assert find_in_lines(pattern, ["axxb", ""]) == [(0, 1, 3)]
+
+
+class TestReplaceInLines:
+    """Tests for replace_in_lines()."""
+
+    def test_replaces_between_first_and_last_match(self):
+        """The result covers the rows from the first match to the last."""
+        query = SearchQuery("cat")
+        result = replace_in_lines(query, query.compile(), LINES, "dog")
+        assert (result.first_row, result.last_row, result.count) == (0, 3, 4)
+        assert result.lines == ["The dog sat.", "A dog and a dog.", "", "condogenate dogs"]
+
+    def test_regex_groups(self):
+        """Regex replacements can refer to groups."""
+        query = SearchQuery(r"(\w+) dog", regex=True)
+        result = replace_in_lines(query, query.compile(), LINES, r"dog \1")
+        assert (result.first_row, result.last_row) == (1, 1)
+        assert result.lines == ["A Cat and dog a."]
+
+    def test_no_match(self):
+        """Nothing to replace returns None."""
+        query = SearchQuery("bird")
+        assert replace_in_lines(query, query.compile(), LINES, "x") is None
+
+
+class TestWorkspace:
+    """Tests for searching and replacing across workspace files."""
+
+    def test_workspace_files_skip_hidden(self, tmp_path):
+        """Dot names and hidden names are skipped at any depth."""
+        (tmp_path / "books").mkdir()
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "__pycache__").mkdir()
+        for path in [
+            "a.md",
+            "books/b.md",
+            "books/.draft.md",
+            ".git/c.md",
+            "__pycache__/d.md",
+            "notes.txt",
+        ]:
+            (tmp_path / path).write_text("Anna")
+        files = workspace_files(tmp_path, {"__pycache__"})
+        assert files == [tmp_path / "a.md", tmp_path / "books" / "b.md"]
+
+    def test_scan_files_prefers_open_text(self, tmp_path):
+        """Open documents are searched as edited, not as saved."""
+        first = tmp_path / "first.md"
+        second = tmp_path / "second.md"
+        first.write_text("Anna\nand Anna")
+        second.write_text("nobody")
+        pattern = SearchQuery("anna").compile()
+        found = scan_files(pattern, [first, second], {second: "Anna, unsaved"})
+        assert [(f.path, f.matches) for f in found] == [
+            (first, [(0, 0, 4), (1, 4, 8)]),
+            (second, [(0, 0, 4)]),
+        ]
+
+    def test_replace_in_text(self):
+        """Text outside the matched rows is kept as it was."""
+        query = SearchQuery("anna")
+        text, count = replace_in_text(query, query.compile(), "# A\nAnna\n\nanna\n", "Hannah")
+        assert (text, count) == ("# A\nHannah\n\nHannah\n", 2)
@@ -0,0 +1,247 @@
+"""Tests for prosaic.core.undo module."""
+
+import os
+
+import pytest
+from textual.document._document import Document
+from textual.document._edit import Edit
+from textual.widgets.text_area import Selection
+
+from prosaic.core.undo import (
+    SpillingEditHistory,
+    UndoStore,
+    decode_batch,
+    encode_batch,
+    remove_stale_spills,
+)
+from prosaic.core.writer import SaveQueue
+
+
+class FakeTextArea:
+    """Just enough of a TextArea for Edit.do and Edit.undo."""
+
+    def __init__(self, text: str) -> None:
+        self.document = Document(text)
+        self.selection = Selection.cursor((0, 0))
+
+
+def type_lines(text_area, history, count):
+    """Type one line per batch, like pressing enter after each."""
+    for i in range(count):
+        row = text_area.document.line_count - 1
+        edit = Edit(f"line {i} {'x' * 200}\n", (row, 0), (row, 0), False)
+        edit.do(text_area)
+        history.record(edit)
+
+
+def undo(text_area, history):
+    batch = history._pop_undo()
+    for edit in reversed(batch or []):
+        edit.undo(text_area)
+    return batch
+
+
+def redo(text_area, history):
+    batch = history._pop_redo()
+    for edit in batch or []:
+        edit.do(text_area, record_selection=False)
+    return batch
+
+
+def make_history(tmp_path, **kwargs):
+    options = dict(
+        max_checkpoints=1000,
+        checkpoint_timer=2.0,
+        checkpoint_max_characters=100,
+        max_bytes=8 * 1024,
+        spill_dir=tmp_path,
+    )
+    options.update(kwargs)
+    return SpillingEditHistory(**options)
+
+
+class TestBatchEncoding:
+    """Tests for encode_batch and decode_batch."""
+
+    def test_round_trip(self):
+        """A decoded batch undoes the same way as the original."""
+        text_area = FakeTextArea("Café\nau lait\n")
+        text_area.selection = Selection((0, 1), (1, 2))
+        edit = Edit("Tea", (0, 0), (1, 2), True)
+        edit.do(text_area)
+        [decoded] = decode_batch(encode_batch([edit]))
+        assert (decoded.text, decoded.from_location, decoded.to_location) == (
+            edit.text,
+            edit.from_location,
+            edit.to_location,
+        )
+        assert decoded.maintain_selection_offset
+        assert decoded._original_selection == edit._original_selection
+        assert decoded._edit_result == edit._edit_result
+
+        decoded.undo(text_area)
+        assert text_area.document.text == "Café\nau lait\n"
+        assert decoded._updated_selection == Selection((0, 1), (1, 2))
+
+    def test_invalid_line_raises(self):
+        """Malformed input raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_batch('[["text", 0]]')
+        with pytest.raises(ValueError):
+            decode_batch("not json")
+
+
+class TestSpillingEditHistory:
+    """Tests for SpillingEditHistory."""
+
+    def test_memory_stays_within_budget(self, tmp_path):
+        """Old batches are spilled once the budget is exceeded."""
+        text_area = FakeTextArea("")
+        history = make_history(tmp_path)
+        type_lines(text_area, history, 200)
+        assert history.memory_bytes <= history.max_bytes
+        assert history.spilled > 0
+        assert len(history.undo_stack) + history.spilled == 200
+        assert list(tmp_path.glob("*.spill"))
+
+    def test_undo_pages_spilled_batches_back(self, tmp_path):
+        """Undoing everything restores the original text, then redo reapplies it."""
+        text_area = FakeTextArea("start")
+        history = make_history(tmp_path)
+        type_lines(text_area, history, 200)
+        typed = text_area.document.text
+
+        undone = 0
+        while undo(text_area, history):
+            undone += 1
+        assert undone == 200
+        assert text_area.document.text == "start"
+        assert history.spilled == 0
+        assert not list(tmp_path.glob("*.spill"))
+
+        while redo(text_area, history):
+            pass
+        assert text_area.document.text == typed
+
+    def test_new_edit_after_undo_discards_redo(self, tmp_path):
+        """Memory for undone batches is released when they can't be redone."""
+        text_area = FakeTextArea("")
+        history = make_history(tmp_path)
+        type_lines(text_area, history, 10)
+        before = history.memory_bytes
+        undo(text_area, history)
+        assert history.memory_bytes == before
+        type_lines(text_area, history, 1)
+        assert history.memory_bytes == before
+        assert not history.redo_stack
+
+    def test_without_spill_dir_drops_old_batches(self, tmp_path):
+        """With nowhere to spill, the oldest batches are discarded."""
+        text_area = FakeTextArea("")
+        history = make_history(tmp_path, spill_dir=None)
+        type_lines(text_area, history, 200)
+        assert history.memory_bytes <= history.max_bytes
+        assert history.spilled == 0
+        assert len(history.undo_stack) < 200
+
+    def test_max_checkpoints_bounds_depth(self, tmp_path):
+        """Total depth, spilled included, never exceeds max_checkpoints."""
+        text_area = FakeTextArea("")
+        history = make_history(tmp_path, max_checkpoints=50)
+        type_lines(text_area, history, 200)
+        assert len(history.undo_stack) + history.spilled == 50
+
+    def test_clear_removes_spill_file(self, tmp_path):
+        """Clearing the history deletes its spill file."""
+        text_area = FakeTextArea("")
+        history = make_history(tmp_path)
+        type_lines(text_area, history, 200)
+        history.clear()
+        assert history.memory_bytes == 0
+        assert history.spilled == 0
+        assert not list(tmp_path.glob("*.spill"))
+
+    def test_older_history_loads_on_first_undo_past_session(self, tmp_path):
+        """Exported history attached to a new session is undone after newer edits."""
+        first_area = FakeTextArea("start")
+        first = make_history(tmp_path)
+        type_lines(first_area, first, 100)
+        saved = first.export()
+        assert not first.changed
+
+        text_area = FakeTextArea(first_area.document.text)
+        history = make_history(tmp_path)
+        calls = []
+        history.set_older(lambda: calls.append(1) or saved.split("\n")[:-1])
+        type_lines(text_area, history, 3)
+        undo(text_area, history)
+        assert not calls
+
+        while undo(text_area, history):
+            pass
+        assert calls == [1]
+        assert text_area.document.text == "start"
+
+    def test_export_includes_unloaded_older_history(self, tmp_path):
+        """Exporting before the older history is needed keeps it."""
+        first_area = FakeTextArea("start")
+        first = make_history(tmp_path)
+        type_lines(first_area, first, 100)
+        older = first.export().split("\n")[:-1]
+
+        text_area = FakeTextArea(first_area.document.text)
+        history = make_history(tmp_path)
+        history.set_older(lambda: older)
+        type_lines(text_area, history, 5)
+        assert history.changed
+        lines = history.export().split("\n")[:-1]
+        assert len(lines) == 105
+        assert lines[:100] == older
+
+    def test_remove_stale_spills(self, tmp_path):
+        """Only spill files untouched for longer than max_age are deleted."""
+        stale = tmp_path / "old.spill"
+        stale.write_text("[]\n")
+        os.utime(stale, (0, 0))
+        fresh = tmp_path / "new.spill"
+        fresh.write_text("[]\n")
+        assert remove_stale_spills(tmp_path) == 1
+        assert not stale.exists()
+        assert fresh.exists()
+
+
+class TestUndoStore:
+    """Tests for UndoStore."""
+
+    def test_round_trip_and_hash_check(self, tmp_path):
+        """A stored log is returned only for the content it was saved with."""
+        writer = SaveQueue(fsync=False)
+        store = UndoStore(tmp_path / "undo", writer)
+        source = tmp_path / "piece.md"
+        text_area = FakeTextArea("")
+        history = make_history(tmp_path)
+        type_lines(text_area, history, 3)
+
+        store.put(source, "abc", history.export())
+        writer.flush()
+        lines = store.read(source, "abc")
+        assert [decode_batch(line)[0].text for line in lines] == [
+            f"line {i} {'x' * 200}\n" for i in range(3)
+        ]
+        assert store.read(source, "other") is None
+        assert store.read(tmp_path / "missing.md", "abc") is None
+
+    def test_prune_deletes_oldest(self, tmp_path):
+        """Pruning removes the least recently written logs first."""
+        writer = SaveQueue(fsync=False)
+        store = UndoStore(tmp_path, writer, max_bytes=300)
+        old = tmp_path / "old.md"
+        new = tmp_path / "new.md"
+        store.put(old, "a", "x" * 100 + "\n")
+        writer.flush()
+        os.utime(store.entry_path(old), (0, 0))
+        store.put(new, "b", "y" * 100 + "\n")
+        writer.flush()
+        assert store.prune() == 1
+        assert store.read(old, "a") is None
+        assert store.read(new, "b") == ["y" * 100]
@@ -30,6 +30,38 @@ class TestReadText:
         assert result == content
 
 
+class TestIterText:
+    """Tests for iter_text()."""
+
+    def test_joins_to_file_contents(self, tmp_path):
+        """Chunks join to the same text read_text() returns."""
+        test_file = tmp_path / "chunks.md"
+        content = "# Título\n\n¡Hola mundo! 🌍\n" * 50
+        test_file.write_text(content, encoding="utf-8")
+        assert "".join(utils.iter_text(test_file, chunk_size=7)) == content
+
+    def test_splits_multibyte_characters(self, tmp_path):
+        """Characters split across chunk boundaries decode intact."""
+        test_file = tmp_path / "emoji.txt"
+        test_file.write_text("🎉" * 10, encoding="utf-8")
+        chunks = list(utils.iter_text(test_file, chunk_size=3))
+        assert "".join(chunks) == "🎉" * 10
+        assert len(chunks) > 1
+
+    def test_translates_newlines(self, tmp_path):
+        """Windows newlines are translated, including across chunk boundaries."""
+        test_file = tmp_path / "crlf.md"
+        test_file.write_bytes(b"one\r\ntwo\r\nthree")
+        assert "".join(utils.iter_text(test_file, chunk_size=4)) == "one\ntwo\nthree"
+        assert "".join(utils.iter_text(test_file)) == utils.read_text(test_file)
+
+    def test_empty_file(self, tmp_path):
+        """An empty file yields nothing."""
+        test_file = tmp_path / "empty.md"
+        test_file.write_text("", encoding="utf-8")
+        assert list(utils.iter_text(test_file)) == []
+
+
 class TestWriteText:
     """Tests for write_text()."""
 
@@ -63,3 +95,57 @@ class TestWriteText:
         utils.write_text(test_file, content)
         result = utils.read_text(test_file)
         assert result == content
+
+
+class TestWriteTextAtomic:
+    """Tests for write_text_atomic()."""
+
+    def test_writes_new_file(self, tmp_path):
+        """Creates the file with the given content."""
+        test_file = tmp_path / "new.md"
+        utils.write_text_atomic(test_file, "# Título 🎉\n")
+        assert utils.read_text(test_file) == "# Título 🎉\n"
+
+    def test_replaces_existing_file(self, tmp_path):
+        """Replaces content and leaves no temporary files behind."""
+        test_file = tmp_path / "draft.md"
+        test_file.write_text("old", encoding="utf-8")
+        utils.write_text_atomic(test_file, "new", fsync=False)
+        assert utils.read_text(test_file) == "new"
+        assert [p.name for p in tmp_path.iterdir()] == ["draft.md"]
+
+    def test_keeps_permissions(self, tmp_path):
+        """An existing file keeps its mode."""
+        test_file = tmp_path / "private.md"
+        test_file.write_text("old", encoding="utf-8")
+        test_file.chmod(0o600)
+        utils.write_text_atomic(test_file, "new")
+        assert test_file.stat().st_mode & 0o777 == 0o600
+
+
+class TestFileSignature:
+    """Tests for file_signature()."""
+
+    def test_changes_with_content(self, tmp_path):
+        """Rewriting a file with different content changes its signature."""
+        test_file = tmp_path / "draft.md"
+        test_file.write_text("one", encoding="utf-8")
+        before = utils.file_signature(test_file)
+        test_file.write_text("three", encoding="utf-8")
+        assert utils.file_signature(test_file) != before
+
+    def test_missing_file(self, tmp_path):
+        """A missing file has no signature."""
+        assert utils.file_signature(tmp_path / "missing.md") is None
+
+
+class TestContentHash:
+    """Tests for content_hash()."""
+
+    def test_same_content_same_hash(self):
+        """Equal text hashes equally."""
+        assert utils.content_hash("# Draft\n\ncafé") == utils.content_hash("# Draft\n\ncafé")
+
+    def test_different_content_different_hash(self):
+        """A one-character change changes the hash."""
+        assert utils.content_hash("# Draft\n") != utils.content_hash("# Draft \n")
@@ -0,0 +1,87 @@
+"""Tests for prosaic.core.vocabulary module."""
+
+from textual.document._document import Document
+
+from prosaic.core.analyzers import EditBus, EditDelta
+from prosaic.core.vocabulary import (
+    Vocabulary,
+    VocabularyAnalyzer,
+    build_vocabulary,
+    word_counts,
+)
+
+
+class TestVocabulary:
+    """Tests for Vocabulary."""
+
+    def test_completes_most_frequent_word(self):
+        """The most frequent word with the prefix is offered."""
+        vocabulary = Vocabulary()
+        vocabulary.add("Elizabeth", 3)
+        vocabulary.add("Elinor", 5)
+        assert vocabulary.complete("Eli") == "Elinor"
+        assert vocabulary.complete("Eliz") == "Elizabeth"
+        assert vocabulary.complete("eli") is None
+        assert vocabulary.complete("El") is None
+
+    def test_remove_recomputes_best(self):
+        """Removing occurrences hands the prefix to the next most frequent word."""
+        vocabulary = Vocabulary()
+        vocabulary.add("Elizabeth", 3)
+        vocabulary.add("Elinor", 5)
+        vocabulary.remove("Elinor", 4)
+        assert vocabulary.count("Elinor") == 1
+        assert vocabulary.complete("Eli") == "Elizabeth"
+        vocabulary.update({"Elizabeth": -3, "Elinor": -1})
+        assert vocabulary.complete("Eli") is None
+
+    def test_prefix_that_is_a_word(self):
+        """A prefix that is itself the commonest word completes to a longer one."""
+        vocabulary = Vocabulary()
+        vocabulary.add("harbour", 9)
+        vocabulary.add("harbourmaster", 2)
+        assert vocabulary.complete("harbour") == "harbourmaster"
+        assert vocabulary.complete("harb") == "harbour"
+
+
+class TestWordCounts:
+    """Tests for word_counts() and build_vocabulary()."""
+
+    def test_only_long_words(self):
+        """Short words, digits and punctuation are left out."""
+        counts = word_counts("The **harbour** master's half-elven 2026 daughter's harbour")
+        assert counts == {"harbour": 2, "master's": 1, "half-elven": 1, "daughter's": 1}
+
+    def test_build_from_files(self, tmp_path):
+        """Counts are summed across files; missing ones are skipped."""
+        (tmp_path / "a.md").write_text("Anastasia smiled")
+        (tmp_path / "b.md").write_text("Anastasia left")
+        vocabulary = build_vocabulary(
+            [tmp_path / "a.md", tmp_path / "b.md", tmp_path / "gone.md"]
+        )
+        assert vocabulary.count("Anastasia") == 2
+        assert vocabulary.count("smiled") == 1
+
+
+class TestVocabularyAnalyzer:
+    """Tests for VocabularyAnalyzer."""
+
+    def test_edits_update_counts(self):
+        """Words typed and deleted change the vocabulary; the loaded text doesn't."""
+        vocabulary = Vocabulary()
+        bus = EditBus()
+        analyzer = bus.subscribe(VocabularyAnalyzer(vocabulary))
+        document = Document("# Harbour\n\nPenelope waited.")
+        analyzer.sync(document.lines)
+        assert vocabulary.count("Penelope") == 0
+
+        for start, end, text in [
+            ((2, 0), (2, 8), "Cordelia"),
+            ((2, 16), (2, 16), "\nCordelia returned."),
+        ]:
+            document.replace_range(start, end, text)
+            bus.publish(EditDelta(start, end, text))
+        analyzer.sync(document.lines)
+        assert vocabulary.count("Cordelia") == 2
+        assert vocabulary.count("Penelope") == 0
+        assert vocabulary.count("returned") == 1
@@ -0,0 +1,174 @@
+"""Tests for prosaic.widgets.wrapping module."""
+
+from textual.document._document import Document
+from textual.geometry import Offset
+
+from prosaic.widgets import SpellCheckTextArea
+from prosaic.widgets.wrapping import ProsaicDocumentNavigator, ProsaicWrappedDocument
+
+TEXT = "\n".join(
+    [
+        "# One",  # 0
+        "alpha",
+        "beta",
+        "# Two",  # 3
+        "gamma",
+        "delta",
+        "# Three",  # 6
+        "epsilon",
+    ]
+)
+
+
+def make_wrapped(text: str = TEXT, width: int = 40) -> ProsaicWrappedDocument:
+    return ProsaicWrappedDocument(Document(text), width=width)
+
+
+def apply_edit(wrapped, start, end, text):
+    result = wrapped.document.replace_range(start, end, text)
+    wrapped.wrap_range(start, end, result.end_location)
+
+
+class TestProsaicWrappedDocument:
+    """Tests for folding in ProsaicWrappedDocument."""
+
+    def test_folded_rows_are_not_displayed(self):
+        """Folded rows have no visual lines and map back to their heading."""
+        wrapped = make_wrapped()
+        wrapped.set_folds([(0, 2)])
+        assert wrapped.height == 6
+        assert wrapped.offset_to_location(Offset(0, 1)) == (3, 0)
+        assert wrapped.location_to_offset((2, 1)) == Offset(5, 0)
+        assert wrapped.fold_containing(2) == (0, 2)
+        assert wrapped.fold_containing(0) is None
+
+    def test_folds_without_wrapping(self):
+        """Folds also apply when lines aren't wrapped."""
+        wrapped = make_wrapped(width=0)
+        wrapped.set_folds([(3, 5)])
+        assert wrapped.height == 6
+        assert wrapped.offset_to_location(Offset(2, 4)) == (6, 2)
+
+    def test_nested_folds_merge(self):
+        """A fold inside another is merged into it."""
+        wrapped = make_wrapped()
+        wrapped.set_folds([(3, 4), (0, 7)])
+        assert wrapped.folds == ((0, 7),)
+        assert wrapped.height == 1
+
+    def test_visible_segments(self):
+        """Segments cover unfolded rows, headings included."""
+        wrapped = make_wrapped()
+        wrapped.set_folds([(0, 2), (3, 5)])
+        assert wrapped.visible_segments(0, 8) == [(0, 1), (3, 4), (6, 8)]
+        assert wrapped.visible_segments(1, 5) == [(3, 4)]
+
+    def test_edit_above_shifts_folds(self):
+        """Inserting lines above a fold moves it down."""
+        wrapped = make_wrapped()
+        wrapped.set_folds([(3, 5)])
+        apply_edit(wrapped, (1, 0), (1, 0), "new\nlines\n")
+        assert wrapped.folds == ((5, 7),)
+        assert wrapped.height == 8
+        assert wrapped.offset_to_location(Offset(0, 6)) == (8, 0)
+
+    def test_edit_inside_unfolds(self):
+        """Editing a folded section or its heading removes the fold."""
+        wrapped = make_wrapped()
+        wrapped.set_folds([(0, 2), (3, 5)])
+        apply_edit(wrapped, (4, 0), (5, 5), "")
+        assert wrapped.folds == ((0, 2),)
+        assert wrapped.height == 5
+        assert wrapped.offset_to_location(Offset(0, 2)) == (4, 0)
+
+        apply_edit(wrapped, (0, 5), (0, 5), "!")
+        assert wrapped.folds == ()
+        assert wrapped.height == 7
+
+    def test_rewrap_keeps_folds(self):
+        """Rewrapping at a new width keeps the folds."""
+        wrapped = make_wrapped()
+        wrapped.set_folds([(3, 5)])
+        wrapped.wrap(4)
+        assert wrapped.folds == ((3, 5),)
+        assert wrapped.offset_to_location(Offset(0, wrapped.height - 1))[0] == 7
+
+
+class TestRewrapLine:
+    """Tests for rewrapping a long line around an edit."""
+
+    PARAGRAPH = " ".join(f"word{i % 7} {'x' * (i % 11)}" for i in range(400))
+
+    def assert_matches_full_wrap(self, wrapped):
+        fresh = ProsaicWrappedDocument(Document(wrapped.document.text), width=wrapped._width)
+        assert wrapped._wrap_offsets == fresh._wrap_offsets
+        assert wrapped._offset_to_line_info == fresh._offset_to_line_info
+        assert wrapped._line_index_to_offsets == fresh._line_index_to_offsets
+
+    def test_edits_match_full_wrap(self):
+        """Typing and deleting inside a long line wraps it as a full rewrap would."""
+        wrapped = make_wrapped(f"title\n{self.PARAGRAPH}\nend", width=30)
+        middle = len(self.PARAGRAPH) // 2
+        for column in range(middle, middle + 40, 3):
+            apply_edit(wrapped, (1, column), (1, column), "abc ")
+            self.assert_matches_full_wrap(wrapped)
+        apply_edit(wrapped, (1, 10), (1, 400), "")
+        self.assert_matches_full_wrap(wrapped)
+        apply_edit(wrapped, (1, 5), (1, 5), "y" * 100)
+        self.assert_matches_full_wrap(wrapped)
+
+    def test_typing_at_end(self):
+        """Appending to a long line adds visual lines below it."""
+        wrapped = make_wrapped(f"{self.PARAGRAPH}\nafter", width=30)
+        height = wrapped.height
+        for _ in range(31):
+            end = len(wrapped.document[0])
+            apply_edit(wrapped, (0, end), (0, end), "z")
+        self.assert_matches_full_wrap(wrapped)
+        assert wrapped.height > height
+        assert wrapped.offset_to_location(Offset(0, wrapped.height - 1)) == (1, 0)
+
+    def test_lines_with_tabs(self):
+        """Lines with tabs are still wrapped correctly."""
+        wrapped = make_wrapped("\t".join(["tabbed text"] * 20), width=30)
+        apply_edit(wrapped, (0, 40), (0, 40), "more ")
+        self.assert_matches_full_wrap(wrapped)
+
+
+class TestProsaicDocumentNavigator:
+    """Tests for moving the cursor past folds."""
+
+    def test_steps_over_folds(self):
+        """Moving out of a folded heading skips the rows it hides."""
+        wrapped = make_wrapped()
+        wrapped.set_folds([(3, 5)])
+        navigator = ProsaicDocumentNavigator(wrapped)
+        assert navigator.get_location_below((3, 2)) == (6, 2)
+        assert navigator.get_location_right((3, 5)) == (6, 0)
+        assert navigator.get_location_above((6, 2)) == (3, 2)
+        assert navigator.get_location_left((6, 0)) == (3, 5)
+
+    def test_fold_at_end_of_document(self):
+        """Moving down from a heading folded to the end stays on the heading."""
+        wrapped = make_wrapped()
+        wrapped.set_folds([(6, 7)])
+        navigator = ProsaicDocumentNavigator(wrapped)
+        assert navigator.get_location_below((6, 0)) == (6, 7)
+
+
+class TestSections:
+    """Tests for finding heading sections in SpellCheckTextArea."""
+
+    def test_section_range(self):
+        """A section ends before the next heading of the same or higher level."""
+        area = SpellCheckTextArea(
+            "# Book\nintro\n## One\ntext\n```\n# not a heading\n```\n## Two\nend"
+        )
+        assert area.section_range(1) == (0, 8)
+        assert area.section_range(3) == (2, 6)
+        assert area.section_range(8) == (7, 8)
+
+    def test_no_heading_above(self):
+        """Rows before the first heading belong to no section."""
+        area = SpellCheckTextArea("preamble\n# One\ntext")
+        assert area.section_range(0) is None
@@ -0,0 +1,91 @@
+"""Tests for prosaic.core.writer module."""
+
+import threading
+
+from prosaic.core import writer
+from prosaic.core.writer import SaveQueue, get_save_queue
+
+
+class TestSaveQueue:
+    """Tests for SaveQueue."""
+
+    def test_writes_file(self, tmp_path):
+        """Submitted content is on disk after flush."""
+        queue = SaveQueue(fsync=False)
+        path = tmp_path / "draft.md"
+        queue.submit(path, "# Draft\n")
+        assert queue.flush(timeout=5)
+        assert path.read_text(encoding="utf-8") == "# Draft\n"
+
+    def test_coalesces_pending_saves(self, tmp_path, monkeypatch):
+        """Saves queued for the same path collapse into one write of the latest content."""
+        written = []
+        release = threading.Event()
+
+        def fake_write(path, content, fsync=True):
+            if path.name == "slow.md":
+                release.wait(5)
+            written.append((path.name, content))
+
+        monkeypatch.setattr(writer, "write_text_atomic", fake_write)
+        queue = SaveQueue()
+        done = []
+        queue.submit(tmp_path / "slow.md", "slow")
+        queue.submit(tmp_path / "a.md", "one", on_done=done.append)
+        queue.submit(tmp_path / "a.md", "two", on_done=done.append)
+        queue.submit(tmp_path / "a.md", "three", on_done=done.append)
+        release.set()
+        assert queue.flush(timeout=5)
+        assert written == [("slow.md", "slow"), ("a.md", "three")]
+        assert done == [None, None, None]
+
+    def test_reports_errors(self, tmp_path):
+        """A failed write passes the error to its callback."""
+        queue = SaveQueue(fsync=False)
+        errors = []
+        queue.submit(tmp_path / "missing" / "draft.md", "text", on_done=errors.append)
+        assert queue.flush(timeout=5)
+        assert len(errors) == 1
+        assert isinstance(errors[0], OSError)
+
+    def test_unencodable_text_does_not_stop_the_queue(self, tmp_path):
+        """A write that fails to encode is reported, and later writes still happen."""
+        queue = SaveQueue(fsync=False)
+        errors = []
+        queue.submit(tmp_path / "a.md", "bad \ud800 text", on_done=errors.append)
+        queue.submit(tmp_path / "b.md", "fine", on_done=errors.append)
+        assert queue.flush(timeout=5)
+        assert isinstance(errors[0], UnicodeEncodeError)
+        assert errors[1] is None
+        assert (tmp_path / "b.md").read_text(encoding="utf-8") == "fine"
+        assert not (tmp_path / "a.md").exists()
+
+    def test_batch_reports_once(self, tmp_path):
+        """A batch calls back once, after every file, with the failures by path."""
+        queue = SaveQueue(fsync=False)
+        good = tmp_path / "good.md"
+        bad = tmp_path / "missing" / "bad.md"
+        results = []
+        queue.submit_batch({good: "one", bad: "two"}, on_done=results.append)
+        assert queue.flush(timeout=5)
+        assert good.read_text(encoding="utf-8") == "one"
+        assert len(results) == 1
+        assert list(results[0]) == [bad]
+
+
+class TestGetSaveQueue:
+    """Tests for get_save_queue()."""
+
+    def test_one_queue_per_workspace(self, tmp_path):
+        """The same workspace always gets the same queue."""
+        first = tmp_path / "one"
+        second = tmp_path / "two"
+        assert get_save_queue(first) is get_save_queue(first)
+        assert get_save_queue(first) is not get_save_queue(second)
+
+    def test_updates_fsync(self, tmp_path):
+        """Passing fsync reconfigures the existing queue."""
+        queue = get_save_queue(tmp_path, fsync=False)
+        assert not queue.fsync
+        get_save_queue(tmp_path, fsync=True)
+        assert queue.fsync